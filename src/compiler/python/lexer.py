@@ -5,10 +5,18 @@ via the ebnf module. Literal parsing (numbers, strings, f-strings) is
 hand-coded for robustness, with the grammar's @literals serving as the spec.
 """
 
+import re
+
 from .ebnf import get_grammar_info
 from .lexer_literals import read_char, read_fstring, read_number, read_string
 from .tokens import ANNOTATIONS, KEYWORDS, OPERATORS, Token, TokenType
 
+# Runs of characters consumed as one slice by the hot paths below. ``\w`` is
+# exactly ``str.isalnum()`` plus underscore, matching the per-character checks
+# it replaces.
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]+")
+_WORD_RE = re.compile(r"\w*")
+
 
 class LexerError(Exception):
     def __init__(self, message: str, line: int, col: int):
@@ -81,6 +89,16 @@ class Lexer:
             self.col += 1
         return ch
 
+    def _advance_to(self, end: int):
+        """Move to ``end`` in one step, updating line/col as ``_advance`` would."""
+        newlines = self.source.count('\n', self.pos, end)
+        if newlines:
+            self.line += newlines
+            self.col = end - self.source.rfind('\n', self.pos, end)
+        else:
+            self.col += end - self.pos
+        self.pos = end
+
     def _at_line_start(self) -> bool:
         i = self.pos - 1
         while i >= 0 and self.source[i] in (' ', '\t'):
@@ -93,10 +111,11 @@ class Lexer:
     # --- Whitespace and comments ---
 
     def _skip_whitespace_and_comments(self):
-        while self.pos < len(self.source):
-            ch = self._peek()
-            if ch in (' ', '\t', '\n', '\r'):
-                self._advance()
+        source = self.source
+        while self.pos < len(source):
+            ch = source[self.pos]
+            if ch in ' \t\n\r':
+                self._advance_to(_WHITESPACE_RE.match(source, self.pos).end())
             elif ch == '/' and self._peek(1) == '/':
                 self._skip_line_comment()
             elif ch == '/' and self._peek(1) == '*':
@@ -105,37 +124,25 @@ class Lexer:
                 break
 
     def _skip_line_comment(self):
-        self._advance()  # /
-        self._advance()  # /
-        while self.pos < len(self.source) and self._peek() != '\n':
-            self._advance()
+        end = self.source.find('\n', self.pos + 2)
+        self._advance_to(len(self.source) if end < 0 else end)
 
     def _skip_block_comment(self):
-        start_line = self.line
-        start_col = self.col
-        self._advance()  # /
-        self._advance()  # *
-        while self.pos < len(self.source):
-            if self._peek() == '*' and self._peek(1) == '/':
-                self._advance()
-                self._advance()
-                return
-            self._advance()
-        raise LexerError("Unterminated block comment", start_line, start_col)
+        end = self.source.find('*/', self.pos + 2)
+        if end < 0:
+            raise LexerError("Unterminated block comment", self.line, self.col)
+        self._advance_to(end + 2)
 
     # --- Preprocessor ---
 
     def _read_preprocessor(self):
         line, col = self.line, self.col
         start = self.pos
-        while self.pos < len(self.source):
-            if self._peek() == '\\' and self._peek(1) == '\n':
-                self._advance()
-                self._advance()
-            elif self._peek() == '\n':
-                break
-            else:
-                self._advance()
+        # A newline directly after a backslash continues the directive
+        end = self.source.find('\n', start)
+        while end > 0 and self.source[end - 1] == '\\':
+            end = self.source.find('\n', end + 1)
+        self._advance_to(len(self.source) if end < 0 else end)
         value = self.source[start:self.pos]
         self._emit(TokenType.PREPROCESSOR, value, line, col)
 
@@ -145,8 +152,7 @@ class Lexer:
         line, col = self.line, self.col
         self._advance()  # skip @
         start = self.pos
-        while self.pos < len(self.source) and (self._peek().isalnum() or self._peek() == '_'):
-            self._advance()
+        self._advance_to(_WORD_RE.match(self.source, start).end())
         name = self.source[start:self.pos]
         token_type = ANNOTATIONS.get(name)
         if token_type is not None:
@@ -170,9 +176,10 @@ class Lexer:
     def _read_identifier(self):
         line, col = self.line, self.col
         start = self.pos
-        while self.pos < len(self.source) and (self._peek().isalnum() or self._peek() == '_'):
-            self._advance()
-        value = self.source[start:self.pos]
+        end = _WORD_RE.match(self.source, start).end()
+        self.pos = end
+        self.col += end - start
+        value = self.source[start:end]
 
         # Check for f-string: identifier 'f' followed immediately by '"'
         if value == "f" and self.pos < len(self.source) and self._peek() == '"':
@@ -204,8 +211,9 @@ class Lexer:
 
         if best_match is not None:
             value = self.source[self.pos:self.pos + best_len]
-            for _ in range(best_len):
-                self._advance()
+            # Operators never contain newlines
+            self.pos += best_len
+            self.col += best_len
             self._emit(best_match, value, line, col)
             return
 
@@ -141,8 +141,10 @@ class TokenType(Enum):
     EOF = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
+    # slots: the lexer builds one Token per lexeme, so skipping the
+    # per-instance __dict__ makes construction cheaper and tokens smaller.
     type: TokenType
     value: str
     line: int
@@ -1,402 +1,215 @@
-"""Single source of truth for built-in type members in the btrc language.
+"""Built-in type members of the btrc language, for the LSP.
 
-Auto-generated from stdlib .btrc files by src/language/ast/gen_builtins.py.
-DO NOT EDIT BY HAND — edit the stdlib source or the generator instead.
+The member rows are generated from the stdlib .btrc files into
+builtins_data.py by src/language/ast/gen_builtins.py; this module turns them
+into the shared tables and lookups.
 
 Used by completion, hover, and signature help providers to avoid
 maintaining separate (and inevitably divergent) copies of the same data.
 """
 
-from __future__ import annotations
+import re
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
 
-from dataclasses import dataclass, field
-from typing import Optional
+from src.devex.lsp.builtins_data import _RAW, _RAW_STDLIB, _STDLIB_NAMES, _TYPE_NAMES, BUILTIN_FUNCTION_SIGNATURES
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BuiltinMember:
     """One member (field or method) of a built-in type."""
 
     name: str
     return_type: str
     kind: str  # "field" or "method"
-    params: list[tuple[str, str]] = field(default_factory=list)  # [(type, name)]
+    params: tuple[tuple[str, str], ...] = ()  # ((type, name), ...)
     doc: str = ""
+    # return_type pre-split as (base, (type args...)), e.g. ("Map", ("K", "V")); None if not generic
+    parsed_return: tuple[str, tuple[str, ...]] | None = None
 
 
 # ---------------------------------------------------------------------------
-# Built-in type member tables
+# Member tables (built from _RAW, one BuiltinMember per row)
 # ---------------------------------------------------------------------------
 
-# String methods are language intrinsics (not defined in any .btrc file)
-STRING_MEMBERS: list[BuiltinMember] = [
-    BuiltinMember("len", "int", "field", [], "Length of the string (bytes)"),
-    BuiltinMember("charAt", "char", "method", [("int", "index")], "Character at index"),
-    BuiltinMember("trim", "string", "method", [], "Remove leading/trailing whitespace"),
-    BuiltinMember("lstrip", "string", "method", [], "Remove leading whitespace"),
-    BuiltinMember("rstrip", "string", "method", [], "Remove trailing whitespace"),
-    BuiltinMember("toUpper", "string", "method", [], "Convert to uppercase"),
-    BuiltinMember("toLower", "string", "method", [], "Convert to lowercase"),
-    BuiltinMember("contains", "bool", "method", [("string", "sub")], "Check if contains substring"),
-    BuiltinMember("startsWith", "bool", "method", [("string", "prefix")], "Check prefix"),
-    BuiltinMember("endsWith", "bool", "method", [("string", "suffix")], "Check suffix"),
-    BuiltinMember("indexOf", "int", "method", [("string", "sub")], "Index of first occurrence"),
-    BuiltinMember("lastIndexOf", "int", "method", [("string", "sub")], "Index of last occurrence"),
-    BuiltinMember("substring", "string", "method", [("int", "start"), ("int", "end")], "Extract substring"),
-    BuiltinMember("equals", "bool", "method", [("string", "other")], "Compare strings"),
-    BuiltinMember("split", "Vector<string>", "method", [("string", "delim")], "Split into list"),
-    BuiltinMember("replace", "string", "method", [("string", "old"), ("string", "replacement")], "Replace occurrences"),
-    BuiltinMember("repeat", "string", "method", [("int", "count")], "Repeat N times"),
-    BuiltinMember("count", "int", "method", [("string", "sub")], "Count non-overlapping occurrences"),
-    BuiltinMember("find", "int", "method", [("string", "sub"), ("int", "start")], "Find from start index"),
-    BuiltinMember("capitalize", "string", "method", [], "Uppercase first char"),
-    BuiltinMember("title", "string", "method", [], "Capitalize each word"),
-    BuiltinMember("swapCase", "string", "method", [], "Swap upper/lower case"),
-    BuiltinMember("padLeft", "string", "method", [("int", "width"), ("char", "fill")], "Left-pad"),
-    BuiltinMember("padRight", "string", "method", [("int", "width"), ("char", "fill")], "Right-pad"),
-    BuiltinMember("center", "string", "method", [("int", "width"), ("char", "fill")], "Center with padding"),
-    BuiltinMember("charLen", "int", "method", [], "UTF-8 character count"),
-    BuiltinMember("byteLen", "int", "method", [], "Byte length"),
-    BuiltinMember("isDigitStr", "bool", "method", [], "All chars are digits"),
-    BuiltinMember("isAlphaStr", "bool", "method", [], "All chars are alphabetic"),
-    BuiltinMember("isBlank", "bool", "method", [], "Empty or all whitespace"),
-    BuiltinMember("isAlnum", "bool", "method", [], "All chars are alphanumeric"),
-    BuiltinMember("isUpper", "bool", "method", [], "All chars are uppercase"),
-    BuiltinMember("isLower", "bool", "method", [], "All chars are lowercase"),
-    BuiltinMember("reverse", "string", "method", [], "Reverse the string"),
-    BuiltinMember("isEmpty", "bool", "method", [], "True if string is empty"),
-    BuiltinMember("removePrefix", "string", "method", [("string", "prefix")], "Remove prefix if present"),
-    BuiltinMember("removeSuffix", "string", "method", [("string", "suffix")], "Remove suffix if present"),
-    BuiltinMember("toInt", "int", "method", [], "Parse as integer"),
-    BuiltinMember("toFloat", "float", "method", [], "Parse as float"),
-    BuiltinMember("toDouble", "double", "method", [], "Parse as double"),
-    BuiltinMember("toLong", "long", "method", [], "Parse as long"),
-    BuiltinMember("toBool", "bool", "method", [], "Parse as bool (false for empty, \"false\", \"0\")"),
-    BuiltinMember("zfill", "string", "method", [("int", "width")], "Left-pad with zeros (preserves sign)"),
-]
-
-# Generated from src/stdlib/array.btrc
-ARRAY_MEMBERS: list[BuiltinMember] = [
-    BuiltinMember("len", "int", "field", doc="len"),
-    BuiltinMember("get", "T", "method", [("int", "i")], "get"),
-    BuiltinMember("set", "void", "method", [("int", "i"), ("T", "val")], "set"),
-    BuiltinMember("fill", "void", "method", [("T", "val")], "fill"),
-    BuiltinMember("contains", "bool", "method", [("T", "val")], "contains"),
-    BuiltinMember("indexOf", "int", "method", [("T", "val")], "indexOf"),
-    BuiltinMember("swap", "void", "method", [("int", "i"), ("int", "j")], "swap"),
-    BuiltinMember("reverse", "void", "method", [], "reverse"),
-    BuiltinMember("size", "int", "method", [], "size"),
-    BuiltinMember("isEmpty", "bool", "method", [], "isEmpty"),
-    BuiltinMember("free", "void", "method", [], "free"),
-    BuiltinMember("iterLen", "int", "method", [], "iterLen"),
-    BuiltinMember("iterGet", "T", "method", [("int", "i")], "iterGet"),
-]
-
-# Generated from src/stdlib/list.btrc
-LIST_MEMBERS: list[BuiltinMember] = [
-    BuiltinMember("head", "ListNode<T>", "field", doc="head"),
-    BuiltinMember("tail", "ListNode<T>", "field", doc="tail"),
-    BuiltinMember("len", "int", "field", doc="len"),
-    BuiltinMember("pushBack", "void", "method", [("T", "val")], "pushBack"),
-    BuiltinMember("pushFront", "void", "method", [("T", "val")], "pushFront"),
-    BuiltinMember("push", "void", "method", [("T", "val")], "push"),
-    BuiltinMember("popBack", "T", "method", [], "popBack"),
-    BuiltinMember("popFront", "T", "method", [], "popFront"),
-    BuiltinMember("pop", "T", "method", [], "pop"),
-    BuiltinMember("front", "T", "method", [], "front"),
-    BuiltinMember("back", "T", "method", [], "back"),
-    BuiltinMember("get", "T", "method", [("int", "idx")], "get"),
-    BuiltinMember("set", "void", "method", [("int", "idx"), ("T", "val")], "set"),
-    BuiltinMember("size", "int", "method", [], "size"),
-    BuiltinMember("isEmpty", "bool", "method", [], "isEmpty"),
-    BuiltinMember("contains", "bool", "method", [("T", "val")], "contains"),
-    BuiltinMember("indexOf", "int", "method", [("T", "val")], "indexOf"),
-    BuiltinMember("insert", "void", "method", [("int", "idx"), ("T", "val")], "insert"),
-    BuiltinMember("remove", "void", "method", [("int", "idx")], "remove"),
-    BuiltinMember("reverse", "void", "method", [], "reverse"),
-    BuiltinMember("clear", "void", "method", [], "clear"),
-    BuiltinMember("free", "void", "method", [], "free"),
-    BuiltinMember("toVector", "Vector<T>", "method", [], "toVector"),
-    BuiltinMember("iterLen", "int", "method", [], "iterLen"),
-    BuiltinMember("iterGet", "T", "method", [("int", "n")], "iterGet"),
-]
-
-# Generated from src/stdlib/map.btrc
-MAP_MEMBERS: list[BuiltinMember] = [
-    BuiltinMember("len", "int", "field", doc="len"),
-    BuiltinMember("put", "void", "method", [("K", "key"), ("V", "value")], "put"),
-    BuiltinMember("get", "V", "method", [("K", "key")], "get"),
-    BuiltinMember("getOrDefault", "V", "method", [("K", "key"), ("V", "fallback")], "getOrDefault"),
-    BuiltinMember("has", "bool", "method", [("K", "key")], "has"),
-    BuiltinMember("contains", "bool", "method", [("K", "key")], "contains"),
-    BuiltinMember("putIfAbsent", "void", "method", [("K", "key"), ("V", "value")], "putIfAbsent"),
-    BuiltinMember("free", "void", "method", [], "free"),
-    BuiltinMember("remove", "void", "method", [("K", "key")], "remove"),
-    BuiltinMember("clear", "void", "method", [], "clear"),
-    BuiltinMember("size", "int", "method", [], "size"),
-    BuiltinMember("isEmpty", "bool", "method", [], "isEmpty"),
-    BuiltinMember("keys", "Vector<K>", "method", [], "keys"),
-    BuiltinMember("values", "Vector<V>", "method", [], "values"),
-    BuiltinMember("containsValue", "bool", "method", [("V", "value")], "containsValue"),
-    BuiltinMember("set", "void", "method", [("K", "key"), ("V", "value")], "set"),
-    BuiltinMember("merge", "void", "method", [("Map<K, V>", "other")], "merge"),
-    BuiltinMember("iterLen", "int", "method", [], "iterLen"),
-    BuiltinMember("iterGet", "K", "method", [("int", "n")], "iterGet"),
-    BuiltinMember("iterValueAt", "V", "method", [("int", "n")], "iterValueAt"),
-    BuiltinMember("forEach", "void", "method", [("fn", "callback")], "Call fn(key, value) for each entry"),
-]
-
-# Generated from src/stdlib/result.btrc
-RESULT_MEMBERS: list[BuiltinMember] = [
-    BuiltinMember("isOk", "bool", "method", [], "isOk"),
-    BuiltinMember("isErr", "bool", "method", [], "isErr"),
-    BuiltinMember("unwrap", "T", "method", [], "unwrap"),
-    BuiltinMember("unwrapErr", "E", "method", [], "unwrapErr"),
-]
-
-# Generated from src/stdlib/set.btrc
-SET_MEMBERS: list[BuiltinMember] = [
-    BuiltinMember("len", "int", "field", doc="len"),
-    BuiltinMember("add", "void", "method", [("T", "key")], "add"),
-    BuiltinMember("contains", "bool", "method", [("T", "key")], "contains"),
-    BuiltinMember("has", "bool", "method", [("T", "key")], "has"),
-    BuiltinMember("remove", "void", "method", [("T", "key")], "remove"),
-    BuiltinMember("free", "void", "method", [], "free"),
-    BuiltinMember("clear", "void", "method", [], "clear"),
-    BuiltinMember("size", "int", "method", [], "size"),
-    BuiltinMember("isEmpty", "bool", "method", [], "isEmpty"),
-    BuiltinMember("unite", "Set<T>", "method", [("Set<T>", "other")], "unite"),
-    BuiltinMember("intersect", "Set<T>", "method", [("Set<T>", "other")], "intersect"),
-    BuiltinMember("subtract", "Set<T>", "method", [("Set<T>", "other")], "subtract"),
-    BuiltinMember("isSubsetOf", "bool", "method", [("Set<T>", "other")], "isSubsetOf"),
-    BuiltinMember("isSupersetOf", "bool", "method", [("Set<T>", "other")], "isSupersetOf"),
-    BuiltinMember("symmetricDifference", "Set<T>", "method", [("Set<T>", "other")], "symmetricDifference"),
-    BuiltinMember("toVector", "Vector<T>", "method", [], "toVector"),
-    BuiltinMember("copy", "Set<T>", "method", [], "copy"),
-    BuiltinMember("filter", "Set<T>", "method", [("__fn_ptr<bool, T>", "pred")], "filter"),
-    BuiltinMember("any", "bool", "method", [("__fn_ptr<bool, T>", "pred")], "any"),
-    BuiltinMember("all", "bool", "method", [("__fn_ptr<bool, T>", "pred")], "all"),
-    BuiltinMember("forEach", "void", "method", [("__fn_ptr<void, T>", "fn")], "forEach"),
-    BuiltinMember("iterLen", "int", "method", [], "iterLen"),
-    BuiltinMember("iterGet", "T", "method", [("int", "n")], "iterGet"),
-]
-
-# Generated from src/stdlib/vector.btrc
-VECTOR_MEMBERS: list[BuiltinMember] = [
-    BuiltinMember("len", "int", "field", doc="len"),
-    BuiltinMember("push", "void", "method", [("T", "val")], "push"),
-    BuiltinMember("pop", "T", "method", [], "pop"),
-    BuiltinMember("get", "T", "method", [("int", "i")], "get"),
-    BuiltinMember("set", "void", "method", [("int", "i"), ("T", "val")], "set"),
-    BuiltinMember("free", "void", "method", [], "free"),
-    BuiltinMember("remove", "void", "method", [("int", "idx")], "remove"),
-    BuiltinMember("reverse", "void", "method", [], "reverse"),
-    BuiltinMember("reversed", "Vector<T>", "method", [], "reversed"),
-    BuiltinMember("swap", "void", "method", [("int", "i"), ("int", "j")], "swap"),
-    BuiltinMember("clear", "void", "method", [], "clear"),
-    BuiltinMember("fill", "void", "method", [("T", "val")], "fill"),
-    BuiltinMember("size", "int", "method", [], "size"),
-    BuiltinMember("isEmpty", "bool", "method", [], "isEmpty"),
-    BuiltinMember("first", "T", "method", [], "first"),
-    BuiltinMember("last", "T", "method", [], "last"),
-    BuiltinMember("slice", "Vector<T>", "method", [("int", "start"), ("int", "end")], "slice"),
-    BuiltinMember("take", "Vector<T>", "method", [("int", "n")], "take"),
-    BuiltinMember("drop", "Vector<T>", "method", [("int", "n")], "drop"),
-    BuiltinMember("extend", "void", "method", [("Vector<T>", "other")], "extend"),
-    BuiltinMember("insert", "void", "method", [("int", "idx"), ("T", "val")], "insert"),
-    BuiltinMember("contains", "bool", "method", [("T", "val")], "contains"),
-    BuiltinMember("indexOf", "int", "method", [("T", "val")], "indexOf"),
-    BuiltinMember("lastIndexOf", "int", "method", [("T", "val")], "lastIndexOf"),
-    BuiltinMember("count", "int", "method", [("T", "val")], "count"),
-    BuiltinMember("removeAll", "void", "method", [("T", "val")], "removeAll"),
-    BuiltinMember("distinct", "Vector<T>", "method", [], "distinct"),
-    BuiltinMember("sort", "void", "method", [], "sort"),
-    BuiltinMember("sorted", "Vector<T>", "method", [], "sorted"),
-    BuiltinMember("min", "T", "method", [], "min"),
-    BuiltinMember("max", "T", "method", [], "max"),
-    BuiltinMember("sum", "T", "method", [], "sum"),
-    BuiltinMember("join", "string", "method", [("string", "sep")], "join"),
-    BuiltinMember("joinToString", "string", "method", [("string", "sep")], "joinToString"),
-    BuiltinMember("filter", "Vector<T>", "method", [("__fn_ptr<bool, T>", "pred")], "filter"),
-    BuiltinMember("findIndex", "int", "method", [("__fn_ptr<bool, T>", "pred")], "findIndex"),
-    BuiltinMember("forEach", "void", "method", [("__fn_ptr<void, T>", "fn")], "forEach"),
-    BuiltinMember("map", "Vector<T>", "method", [("__fn_ptr<T, T>", "fn")], "map"),
-    BuiltinMember("any", "bool", "method", [("__fn_ptr<bool, T>", "pred")], "any"),
-    BuiltinMember("all", "bool", "method", [("__fn_ptr<bool, T>", "pred")], "all"),
-    BuiltinMember("reduce", "T", "method", [("T", "init"), ("__fn_ptr<T, T, T>", "fn")], "reduce"),
-    BuiltinMember("copy", "Vector<T>", "method", [], "copy"),
-    BuiltinMember("removeAt", "void", "method", [("int", "idx")], "removeAt"),
-    BuiltinMember("iterLen", "int", "method", [], "iterLen"),
-    BuiltinMember("iterGet", "T", "method", [("int", "i")], "iterGet"),
-]
-
-_MEMBER_TABLES: dict[str, list[BuiltinMember]] = {
-    "string": STRING_MEMBERS,
-    "Array": ARRAY_MEMBERS,
-    "List": LIST_MEMBERS,
-    "Map": MAP_MEMBERS,
-    "Result": RESULT_MEMBERS,
-    "Set": SET_MEMBERS,
-    "Vector": VECTOR_MEMBERS,
-}
+
+_GENERIC_RE = re.compile(r"^(\w+)<([^>]+)>$")
+
+
+def _parse_generic(type_str: str) -> tuple[str, tuple[str, ...]] | None:
+    """Split "Map<K, V>" into ("Map", ("K", "V")); None for non-generic types."""
+    match = _GENERIC_RE.match(type_str)
+    if match is None:
+        return None
+    args = tuple(sys.intern(a.strip()) for a in match.group(2).split(","))
+    return sys.intern(match.group(1)), args
+
+
+def _make_member(
+    name: str, ret: str, kind: str, params: tuple[tuple[str, str], ...], doc: str
+) -> BuiltinMember:
+    # Intern every string so the tables share one copy of each repeated
+    # type/param/doc string and name comparisons can short-circuit on identity.
+    return BuiltinMember(
+        sys.intern(name),
+        sys.intern(ret),
+        sys.intern(kind),
+        # zero-arg rows keep the literal's shared () as-is
+        tuple((sys.intern(t), sys.intern(n)) for t, n in params) if params else params,
+        sys.intern(doc),
+        _parse_generic(ret),
+    )
+
+
+def _build_tables(
+    raw: tuple[tuple[str, str, str, str, tuple[tuple[str, str], ...], str], ...],
+    namespaces: tuple[str, ...],
+) -> dict[str, tuple[BuiltinMember, ...]]:
+    """Group raw rows by namespace into read-only member tuples."""
+    tables: dict[str, list[BuiltinMember]] = {ns: [] for ns in namespaces}
+    for ns, *row in raw:
+        tables[ns].append(_make_member(*row))
+    return {ns: tuple(ms) for ns, ms in tables.items()}
+
+
+# Tuples rather than lists: the tables are shared by every caller, so
+# they are handed out as-is and can never be mutated underneath them.
+# Invariant: each table is sorted by member name (the generator emits
+# _RAW rows in name order), so consumers never need to sort them.
+_MEMBER_TABLES: dict[str, tuple[BuiltinMember, ...]] = _build_tables(_RAW, _TYPE_NAMES)
 
 
 # ---------------------------------------------------------------------------
-# Stdlib static method tables
+# Lookup indexes
 # ---------------------------------------------------------------------------
 
-# Generated from stdlib .btrc files
-STDLIB_STATIC_METHODS: dict[str, list[BuiltinMember]] = {
-    "Console": [
-        BuiltinMember("log", "void", "method", [("string", "msg")], "log"),
-        BuiltinMember("error", "void", "method", [("string", "msg")], "error"),
-        BuiltinMember("write", "void", "method", [("string", "msg")], "write"),
-        BuiltinMember("writeLine", "void", "method", [("string", "msg")], "writeLine"),
-    ],
-    "Path": [
-        BuiltinMember("exists", "bool", "method", [("string", "path")], "exists"),
-        BuiltinMember("readAll", "string", "method", [("string", "path")], "readAll"),
-        BuiltinMember("writeAll", "void", "method", [("string", "path"), ("string", "content")], "writeAll"),
-    ],
-    "Math": [
-        BuiltinMember("PI", "float", "method", [], "PI"),
-        BuiltinMember("E", "float", "method", [], "E"),
-        BuiltinMember("TAU", "float", "method", [], "TAU"),
-        BuiltinMember("INF", "float", "method", [], "INF"),
-        BuiltinMember("abs", "int", "method", [("int", "x")], "abs"),
-        BuiltinMember("fabs", "float", "method", [("float", "x")], "fabs"),
-        BuiltinMember("max", "int", "method", [("int", "a"), ("int", "b")], "max"),
-        BuiltinMember("min", "int", "method", [("int", "a"), ("int", "b")], "min"),
-        BuiltinMember("fmax", "float", "method", [("float", "a"), ("float", "b")], "fmax"),
-        BuiltinMember("fmin", "float", "method", [("float", "a"), ("float", "b")], "fmin"),
-        BuiltinMember("clamp", "int", "method", [("int", "x"), ("int", "lo"), ("int", "hi")], "clamp"),
-        BuiltinMember("power", "float", "method", [("float", "base"), ("int", "exp")], "power"),
-        BuiltinMember("sqrt", "float", "method", [("float", "x")], "sqrt"),
-        BuiltinMember("factorial", "int", "method", [("int", "n")], "factorial"),
-        BuiltinMember("gcd", "int", "method", [("int", "a"), ("int", "b")], "gcd"),
-        BuiltinMember("lcm", "int", "method", [("int", "a"), ("int", "b")], "lcm"),
-        BuiltinMember("fibonacci", "int", "method", [("int", "n")], "fibonacci"),
-        BuiltinMember("isPrime", "bool", "method", [("int", "n")], "isPrime"),
-        BuiltinMember("isEven", "bool", "method", [("int", "n")], "isEven"),
-        BuiltinMember("isOdd", "bool", "method", [("int", "n")], "isOdd"),
-        BuiltinMember("sum", "int", "method", [("Vector<int>", "items")], "sum"),
-        BuiltinMember("fsum", "float", "method", [("Vector<float>", "items")], "fsum"),
-        BuiltinMember("sin", "float", "method", [("float", "x")], "sin"),
-        BuiltinMember("cos", "float", "method", [("float", "x")], "cos"),
-        BuiltinMember("tan", "float", "method", [("float", "x")], "tan"),
-        BuiltinMember("asin", "float", "method", [("float", "x")], "asin"),
-        BuiltinMember("acos", "float", "method", [("float", "x")], "acos"),
-        BuiltinMember("atan", "float", "method", [("float", "x")], "atan"),
-        BuiltinMember("atan2", "float", "method", [("float", "y"), ("float", "x")], "atan2"),
-        BuiltinMember("ceil", "float", "method", [("float", "x")], "ceil"),
-        BuiltinMember("floor", "float", "method", [("float", "x")], "floor"),
-        BuiltinMember("round", "int", "method", [("float", "x")], "round"),
-        BuiltinMember("truncate", "int", "method", [("float", "x")], "truncate"),
-        BuiltinMember("log", "float", "method", [("float", "x")], "log"),
-        BuiltinMember("log10", "float", "method", [("float", "x")], "log10"),
-        BuiltinMember("log2", "float", "method", [("float", "x")], "log2"),
-        BuiltinMember("exp", "float", "method", [("float", "x")], "exp"),
-        BuiltinMember("toRadians", "float", "method", [("float", "degrees")], "toRadians"),
-        BuiltinMember("toDegrees", "float", "method", [("float", "radians")], "toDegrees"),
-        BuiltinMember("fclamp", "float", "method", [("float", "val"), ("float", "lo"), ("float", "hi")], "fclamp"),
-        BuiltinMember("sign", "int", "method", [("int", "x")], "sign"),
-        BuiltinMember("fsign", "float", "method", [("float", "x")], "fsign"),
-    ],
-    "Strings": [
-        BuiltinMember("repeat", "string", "method", [("string", "s"), ("int", "count")], "repeat"),
-        BuiltinMember("join", "string", "method", [("Vector<string>", "items"), ("string", "sep")], "join"),
-        BuiltinMember("replace", "string", "method", [("string", "s"), ("string", "old"), ("string", "replacement")], "replace"),
-        BuiltinMember("isDigit", "bool", "method", [("char", "c")], "isDigit"),
-        BuiltinMember("isAlpha", "bool", "method", [("char", "c")], "isAlpha"),
-        BuiltinMember("isAlnum", "bool", "method", [("char", "c")], "isAlnum"),
-        BuiltinMember("isSpace", "bool", "method", [("char", "c")], "isSpace"),
-        BuiltinMember("toInt", "int", "method", [("string", "s")], "toInt"),
-        BuiltinMember("toFloat", "float", "method", [("string", "s")], "toFloat"),
-        BuiltinMember("count", "int", "method", [("string", "s"), ("string", "sub")], "count"),
-        BuiltinMember("find", "int", "method", [("string", "s"), ("string", "sub"), ("int", "start")], "find"),
-        BuiltinMember("rfind", "int", "method", [("string", "s"), ("string", "sub")], "rfind"),
-        BuiltinMember("capitalize", "string", "method", [("string", "s")], "capitalize"),
-        BuiltinMember("title", "string", "method", [("string", "s")], "title"),
-        BuiltinMember("swapCase", "string", "method", [("string", "s")], "swapCase"),
-        BuiltinMember("padLeft", "string", "method", [("string", "s"), ("int", "width"), ("char", "fill")], "padLeft"),
-        BuiltinMember("padRight", "string", "method", [("string", "s"), ("int", "width"), ("char", "fill")], "padRight"),
-        BuiltinMember("center", "string", "method", [("string", "s"), ("int", "width"), ("char", "fill")], "center"),
-        BuiltinMember("lstrip", "string", "method", [("string", "s")], "lstrip"),
-        BuiltinMember("rstrip", "string", "method", [("string", "s")], "rstrip"),
-        BuiltinMember("fromInt", "string", "method", [("int", "n")], "fromInt"),
-        BuiltinMember("fromFloat", "string", "method", [("float", "f")], "fromFloat"),
-        BuiltinMember("isDigitStr", "bool", "method", [("string", "s")], "isDigitStr"),
-        BuiltinMember("isAlphaStr", "bool", "method", [("string", "s")], "isAlphaStr"),
-        BuiltinMember("isBlank", "bool", "method", [("string", "s")], "isBlank"),
-    ],
+# built-in type -> member name -> BuiltinMember.  Free functions live in
+# _FUNCTIONS and stdlib classes in _STDLIB, so member lookups never answer
+# for them.
+_ALL: dict[str, dict[str, BuiltinMember]] = {}
+
+# type name -> member name -> params, with None for fields, so the
+# signature lookup is a plain dict read with no kind check.
+_SIG: dict[str, dict[str, tuple[tuple[str, str], ...] | None]] = {}
+
+
+def _index_namespace(ns: str, members: Sequence[BuiltinMember]) -> None:
+    """Register one built-in type's members in the lookup indexes."""
+    _ALL[ns] = {m.name: m for m in members}
+    _SIG[ns] = {m.name: None if m.kind == "field" else m.params for m in members}
+
+
+for _ns, _members in _MEMBER_TABLES.items():
+    _index_namespace(_ns, _members)
+del _ns, _members
+
+# free function name -> BuiltinMember, read only by get_builtin_function()
+_FUNCTIONS: dict[str, BuiltinMember] = {
+    name: _make_member(name, ret, "function", params, "")
+    for name, (ret, params) in BUILTIN_FUNCTION_SIGNATURES.items()
 }
 
-# Built-in free function signatures: name -> (return_type, [(param_type, param_name)])
-BUILTIN_FUNCTION_SIGNATURES: dict[str, tuple[str, list[tuple[str, str]]]] = {
-    "println": ("void", [("string", "message")]),
-    "print": ("void", [("string", "message")]),
-    "input": ("string", [("string", "prompt")]),
-    "toString": ("string", [("int", "value")]),
-    "toInt": ("int", [("string", "value")]),
-    "toFloat": ("float", [("string", "value")]),
-    "len": ("int", [("string", "s")]),
-    "range": ("Vector<int>", [("int", "n")]),
-    "exit": ("void", [("int", "code")]),
+
+def _format_hover(m: BuiltinMember) -> str:
+    if m.kind == "field":
+        return f"```btrc\n{m.return_type} {m.name}\n```\n{m.doc}"
+    params_str = ", ".join(f"{pt} {pn}" for pt, pn in m.params)
+    return f"```btrc\n{m.return_type} {m.name}({params_str})\n```\n{m.doc}"
+
+
+# type name -> member name -> hover markdown; the text is static, so it is
+# formatted once here instead of on every hover request.  Nested dicts keep
+# lookups to two string hashes with no key tuple allocated per call.
+_HOVER_CACHE: dict[str, dict[str, str]] = {
+    t: {m.name: _format_hover(m) for m in ms} for t, ms in _MEMBER_TABLES.items()
 }
 
 
+# ---------------------------------------------------------------------------
+# Stdlib static method tables (built on first use)
+# ---------------------------------------------------------------------------
+
+# Most sessions never touch Math/Strings/..., so their members are only
+# constructed when first needed: via the accessors below or, for the
+# STDLIB_STATIC_METHODS module attribute, via __getattr__ (PEP 562).
+_STDLIB_TABLES: dict[str, tuple[BuiltinMember, ...]] | None = None
+
+# stdlib class name -> method name -> BuiltinMember (filled by _load_stdlib)
+_STDLIB: dict[str, dict[str, BuiltinMember]] = {}
+
+
+def _load_stdlib() -> dict[str, tuple[BuiltinMember, ...]]:
+    """Build the stdlib static-method tables and their name index."""
+    global _STDLIB_TABLES
+    if _STDLIB_TABLES is None:
+        tables = _build_tables(_RAW_STDLIB, _STDLIB_NAMES)
+        for c, ms in tables.items():
+            _STDLIB[c] = {m.name: m for m in ms}
+        _STDLIB_TABLES = tables
+        # later attribute reads find the global and skip __getattr__
+        globals()["STDLIB_STATIC_METHODS"] = tables
+    return _STDLIB_TABLES
+
+
+def __getattr__(name: str):
+    if name == "STDLIB_STATIC_METHODS":
+        return _load_stdlib()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # ---------------------------------------------------------------------------
 # Accessor functions
 # ---------------------------------------------------------------------------
 
 
-def get_members_for_type(type_name: str) -> list[BuiltinMember]:
-    """Return the list of built-in members for a type, or empty list."""
-    return _MEMBER_TABLES.get(type_name, [])
+def get_members_for_type(type_name: str) -> Sequence[BuiltinMember]:
+    """Return the (shared, read-only) built-in members for a type, or ()."""
+    return _MEMBER_TABLES.get(type_name, ())
 
 
-def get_member(type_name: str, member_name: str) -> Optional[BuiltinMember]:
+def get_member(type_name: str, member_name: str) -> BuiltinMember | None:
     """Look up a specific member on a built-in type."""
-    for m in _MEMBER_TABLES.get(type_name, []):
-        if m.name == member_name:
-            return m
-    return None
+    members = _ALL.get(type_name)
+    if members is None:
+        return None
+    return members.get(member_name)
 
 
-def get_hover_markdown(type_name: str, member_name: str) -> Optional[str]:
-    """Generate a markdown hover string for a built-in type member."""
-    m = get_member(type_name, member_name)
-    if m is None:
+def get_hover_markdown(type_name: str, member_name: str) -> str | None:
+    """Return the markdown hover string for a built-in type member."""
+    members = _HOVER_CACHE.get(type_name)
+    if members is None:
         return None
-    if m.kind == "field":
-        return f"```btrc\n{m.return_type} {m.name}\n```\n{m.doc}"
-    params_str = ", ".join(f"{pt} {pn}" for pt, pn in m.params)
-    return f"```btrc\n{m.return_type} {m.name}({params_str})\n```\n{m.doc}"
+    return members.get(member_name)
 
 
 def get_signature_params(
     type_name: str, method_name: str
-) -> Optional[list[tuple[str, str]]]:
+) -> tuple[tuple[str, str], ...] | None:
     """Return the parameter list for a built-in type method, or None."""
-    m = get_member(type_name, method_name)
-    if m is None or m.kind == "field":
+    members = _SIG.get(type_name)
+    if members is None:
         return None
-    return m.params
+    return members.get(method_name)
 
 
-def get_stdlib_methods(class_name: str) -> Optional[list[BuiltinMember]]:
+def get_stdlib_methods(class_name: str) -> Sequence[BuiltinMember] | None:
     """Return the list of static methods for a stdlib class, or None."""
-    return STDLIB_STATIC_METHODS.get(class_name)
+    return _load_stdlib().get(class_name)
 
 
 def get_stdlib_signature(
     class_name: str, method_name: str
-) -> Optional[list[tuple[str, str]]]:
+) -> tuple[tuple[str, str], ...] | None:
     """Return the parameter list for a stdlib static method, or None."""
-    methods = STDLIB_STATIC_METHODS.get(class_name)
-    if methods is None:
+    if class_name not in _STDLIB_NAMES:
         return None
-    for m in methods:
-        if m.name == method_name:
-            return m.params
-    return None
+    _load_stdlib()
+    m = _STDLIB[class_name].get(method_name)
+    return m.params if m is not None else None
+
+
+def get_builtin_function(name: str) -> BuiltinMember | None:
+    """Look up a built-in free function (e.g. print), or None."""
+    return _FUNCTIONS.get(name)
@@ -0,0 +1,295 @@
+"""Built-in type member rows for the btrc LSP (see builtins.py).
+
+Auto-generated from stdlib .btrc files by src/language/ast/gen_builtins.py.
+DO NOT EDIT BY HAND — edit the stdlib source or the generator instead.
+"""
+
+from types import MappingProxyType
+
+# ---------------------------------------------------------------------------
+# Raw member data
+# ---------------------------------------------------------------------------
+
+# (namespace, name, return_type, kind, params, doc)
+_RAW: tuple[tuple[str, str, str, str, tuple[tuple[str, str], ...], str], ...] = (
+    # String methods are language intrinsics (not defined in any .btrc file)
+    ("string", "byteLen", "int", "method", (), "Byte length"),
+    ("string", "capitalize", "string", "method", (), "Uppercase first char"),
+    ("string", "center", "string", "method", (("int", "width"), ("char", "fill")), "Center with padding"),
+    ("string", "charAt", "char", "method", (("int", "index"),), "Character at index"),
+    ("string", "charLen", "int", "method", (), "UTF-8 character count"),
+    ("string", "contains", "bool", "method", (("string", "sub"),), "Check if contains substring"),
+    ("string", "count", "int", "method", (("string", "sub"),), "Count non-overlapping occurrences"),
+    ("string", "endsWith", "bool", "method", (("string", "suffix"),), "Check suffix"),
+    ("string", "equals", "bool", "method", (("string", "other"),), "Compare strings"),
+    ("string", "find", "int", "method", (("string", "sub"), ("int", "start")), "Find from start index"),
+    ("string", "indexOf", "int", "method", (("string", "sub"),), "Index of first occurrence"),
+    ("string", "isAlnum", "bool", "method", (), "All chars are alphanumeric"),
+    ("string", "isAlphaStr", "bool", "method", (), "All chars are alphabetic"),
+    ("string", "isBlank", "bool", "method", (), "Empty or all whitespace"),
+    ("string", "isDigitStr", "bool", "method", (), "All chars are digits"),
+    ("string", "isEmpty", "bool", "method", (), "True if string is empty"),
+    ("string", "isLower", "bool", "method", (), "All chars are lowercase"),
+    ("string", "isUpper", "bool", "method", (), "All chars are uppercase"),
+    ("string", "lastIndexOf", "int", "method", (("string", "sub"),), "Index of last occurrence"),
+    ("string", "len", "int", "field", (), "Length of the string (bytes)"),
+    ("string", "lstrip", "string", "method", (), "Remove leading whitespace"),
+    ("string", "padLeft", "string", "method", (("int", "width"), ("char", "fill")), "Left-pad"),
+    ("string", "padRight", "string", "method", (("int", "width"), ("char", "fill")), "Right-pad"),
+    ("string", "removePrefix", "string", "method", (("string", "prefix"),), "Remove prefix if present"),
+    ("string", "removeSuffix", "string", "method", (("string", "suffix"),), "Remove suffix if present"),
+    ("string", "repeat", "string", "method", (("int", "count"),), "Repeat N times"),
+    ("string", "replace", "string", "method", (("string", "old"), ("string", "replacement")), "Replace occurrences"),
+    ("string", "reverse", "string", "method", (), "Reverse the string"),
+    ("string", "rstrip", "string", "method", (), "Remove trailing whitespace"),
+    ("string", "split", "Vector<string>", "method", (("string", "delim"),), "Split into list"),
+    ("string", "startsWith", "bool", "method", (("string", "prefix"),), "Check prefix"),
+    ("string", "substring", "string", "method", (("int", "start"), ("int", "end")), "Extract substring"),
+    ("string", "swapCase", "string", "method", (), "Swap upper/lower case"),
+    ("string", "title", "string", "method", (), "Capitalize each word"),
+    ("string", "toBool", "bool", "method", (), "Parse as bool (false for empty, \"false\", \"0\")"),
+    ("string", "toDouble", "double", "method", (), "Parse as double"),
+    ("string", "toFloat", "float", "method", (), "Parse as float"),
+    ("string", "toInt", "int", "method", (), "Parse as integer"),
+    ("string", "toLong", "long", "method", (), "Parse as long"),
+    ("string", "toLower", "string", "method", (), "Convert to lowercase"),
+    ("string", "toUpper", "string", "method", (), "Convert to uppercase"),
+    ("string", "trim", "string", "method", (), "Remove leading/trailing whitespace"),
+    ("string", "zfill", "string", "method", (("int", "width"),), "Left-pad with zeros (preserves sign)"),
+    # Generated from src/stdlib/array.btrc
+    ("Array", "contains", "bool", "method", (("T", "val"),), "contains"),
+    ("Array", "fill", "void", "method", (("T", "val"),), "fill"),
+    ("Array", "free", "void", "method", (), "free"),
+    ("Array", "get", "T", "method", (("int", "i"),), "get"),
+    ("Array", "indexOf", "int", "method", (("T", "val"),), "indexOf"),
+    ("Array", "isEmpty", "bool", "method", (), "isEmpty"),
+    ("Array", "iterGet", "T", "method", (("int", "i"),), "iterGet"),
+    ("Array", "iterLen", "int", "method", (), "iterLen"),
+    ("Array", "len", "int", "field", (), "len"),
+    ("Array", "reverse", "void", "method", (), "reverse"),
+    ("Array", "set", "void", "method", (("int", "i"), ("T", "val")), "set"),
+    ("Array", "size", "int", "method", (), "size"),
+    ("Array", "swap", "void", "method", (("int", "i"), ("int", "j")), "swap"),
+    # Generated from src/stdlib/list.btrc
+    ("List", "back", "T", "method", (), "back"),
+    ("List", "clear", "void", "method", (), "clear"),
+    ("List", "contains", "bool", "method", (("T", "val"),), "contains"),
+    ("List", "free", "void", "method", (), "free"),
+    ("List", "front", "T", "method", (), "front"),
+    ("List", "get", "T", "method", (("int", "idx"),), "get"),
+    ("List", "head", "ListNode<T>", "field", (), "head"),
+    ("List", "indexOf", "int", "method", (("T", "val"),), "indexOf"),
+    ("List", "insert", "void", "method", (("int", "idx"), ("T", "val")), "insert"),
+    ("List", "isEmpty", "bool", "method", (), "isEmpty"),
+    ("List", "iterGet", "T", "method", (("int", "n"),), "iterGet"),
+    ("List", "iterLen", "int", "method", (), "iterLen"),
+    ("List", "len", "int", "field", (), "len"),
+    ("List", "pop", "T", "method", (), "pop"),
+    ("List", "popBack", "T", "method", (), "popBack"),
+    ("List", "popFront", "T", "method", (), "popFront"),
+    ("List", "push", "void", "method", (("T", "val"),), "push"),
+    ("List", "pushBack", "void", "method", (("T", "val"),), "pushBack"),
+    ("List", "pushFront", "void", "method", (("T", "val"),), "pushFront"),
+    ("List", "remove", "void", "method", (("int", "idx"),), "remove"),
+    ("List", "reverse", "void", "method", (), "reverse"),
+    ("List", "set", "void", "method", (("int", "idx"), ("T", "val")), "set"),
+    ("List", "size", "int", "method", (), "size"),
+    ("List", "tail", "ListNode<T>", "field", (), "tail"),
+    ("List", "toVector", "Vector<T>", "method", (), "toVector"),
+    # Generated from src/stdlib/map.btrc
+    ("Map", "clear", "void", "method", (), "clear"),
+    ("Map", "contains", "bool", "method", (("K", "key"),), "contains"),
+    ("Map", "containsValue", "bool", "method", (("V", "value"),), "containsValue"),
+    ("Map", "forEach", "void", "method", (("fn", "callback"),), "Call fn(key, value) for each entry"),
+    ("Map", "free", "void", "method", (), "free"),
+    ("Map", "get", "V", "method", (("K", "key"),), "get"),
+    ("Map", "getOrDefault", "V", "method", (("K", "key"), ("V", "fallback")), "getOrDefault"),
+    ("Map", "has", "bool", "method", (("K", "key"),), "has"),
+    ("Map", "isEmpty", "bool", "method", (), "isEmpty"),
+    ("Map", "iterGet", "K", "method", (("int", "n"),), "iterGet"),
+    ("Map", "iterLen", "int", "method", (), "iterLen"),
+    ("Map", "iterValueAt", "V", "method", (("int", "n"),), "iterValueAt"),
+    ("Map", "keys", "Vector<K>", "method", (), "keys"),
+    ("Map", "len", "int", "field", (), "len"),
+    ("Map", "merge", "void", "method", (("Map<K, V>", "other"),), "merge"),
+    ("Map", "put", "void", "method", (("K", "key"), ("V", "value")), "put"),
+    ("Map", "putIfAbsent", "void", "method", (("K", "key"), ("V", "value")), "putIfAbsent"),
+    ("Map", "remove", "void", "method", (("K", "key"),), "remove"),
+    ("Map", "set", "void", "method", (("K", "key"), ("V", "value")), "set"),
+    ("Map", "size", "int", "method", (), "size"),
+    ("Map", "values", "Vector<V>", "method", (), "values"),
+    # Generated from src/stdlib/result.btrc
+    ("Result", "isErr", "bool", "method", (), "isErr"),
+    ("Result", "isOk", "bool", "method", (), "isOk"),
+    ("Result", "unwrap", "T", "method", (), "unwrap"),
+    ("Result", "unwrapErr", "E", "method", (), "unwrapErr"),
+    # Generated from src/stdlib/set.btrc
+    ("Set", "add", "void", "method", (("T", "key"),), "add"),
+    ("Set", "all", "bool", "method", (("__fn_ptr<bool, T>", "pred"),), "all"),
+    ("Set", "any", "bool", "method", (("__fn_ptr<bool, T>", "pred"),), "any"),
+    ("Set", "clear", "void", "method", (), "clear"),
+    ("Set", "contains", "bool", "method", (("T", "key"),), "contains"),
+    ("Set", "copy", "Set<T>", "method", (), "copy"),
+    ("Set", "filter", "Set<T>", "method", (("__fn_ptr<bool, T>", "pred"),), "filter"),
+    ("Set", "forEach", "void", "method", (("__fn_ptr<void, T>", "fn"),), "forEach"),
+    ("Set", "free", "void", "method", (), "free"),
+    ("Set", "has", "bool", "method", (("T", "key"),), "has"),
+    ("Set", "intersect", "Set<T>", "method", (("Set<T>", "other"),), "intersect"),
+    ("Set", "isEmpty", "bool", "method", (), "isEmpty"),
+    ("Set", "isSubsetOf", "bool", "method", (("Set<T>", "other"),), "isSubsetOf"),
+    ("Set", "isSupersetOf", "bool", "method", (("Set<T>", "other"),), "isSupersetOf"),
+    ("Set", "iterGet", "T", "method", (("int", "n"),), "iterGet"),
+    ("Set", "iterLen", "int", "method", (), "iterLen"),
+    ("Set", "len", "int", "field", (), "len"),
+    ("Set", "remove", "void", "method", (("T", "key"),), "remove"),
+    ("Set", "size", "int", "method", (), "size"),
+    ("Set", "subtract", "Set<T>", "method", (("Set<T>", "other"),), "subtract"),
+    ("Set", "symmetricDifference", "Set<T>", "method", (("Set<T>", "other"),), "symmetricDifference"),
+    ("Set", "toVector", "Vector<T>", "method", (), "toVector"),
+    ("Set", "unite", "Set<T>", "method", (("Set<T>", "other"),), "unite"),
+    # Generated from src/stdlib/vector.btrc
+    ("Vector", "all", "bool", "method", (("__fn_ptr<bool, T>", "pred"),), "all"),
+    ("Vector", "any", "bool", "method", (("__fn_ptr<bool, T>", "pred"),), "any"),
+    ("Vector", "clear", "void", "method", (), "clear"),
+    ("Vector", "contains", "bool", "method", (("T", "val"),), "contains"),
+    ("Vector", "copy", "Vector<T>", "method", (), "copy"),
+    ("Vector", "count", "int", "method", (("T", "val"),), "count"),
+    ("Vector", "distinct", "Vector<T>", "method", (), "distinct"),
+    ("Vector", "drop", "Vector<T>", "method", (("int", "n"),), "drop"),
+    ("Vector", "extend", "void", "method", (("Vector<T>", "other"),), "extend"),
+    ("Vector", "fill", "void", "method", (("T", "val"),), "fill"),
+    ("Vector", "filter", "Vector<T>", "method", (("__fn_ptr<bool, T>", "pred"),), "filter"),
+    ("Vector", "findIndex", "int", "method", (("__fn_ptr<bool, T>", "pred"),), "findIndex"),
+    ("Vector", "first", "T", "method", (), "first"),
+    ("Vector", "forEach", "void", "method", (("__fn_ptr<void, T>", "fn"),), "forEach"),
+    ("Vector", "free", "void", "method", (), "free"),
+    ("Vector", "get", "T", "method", (("int", "i"),), "get"),
+    ("Vector", "indexOf", "int", "method", (("T", "val"),), "indexOf"),
+    ("Vector", "insert", "void", "method", (("int", "idx"), ("T", "val")), "insert"),
+    ("Vector", "isEmpty", "bool", "method", (), "isEmpty"),
+    ("Vector", "iterGet", "T", "method", (("int", "i"),), "iterGet"),
+    ("Vector", "iterLen", "int", "method", (), "iterLen"),
+    ("Vector", "join", "string", "method", (("string", "sep"),), "join"),
+    ("Vector", "joinToString", "string", "method", (("string", "sep"),), "joinToString"),
+    ("Vector", "last", "T", "method", (), "last"),
+    ("Vector", "lastIndexOf", "int", "method", (("T", "val"),), "lastIndexOf"),
+    ("Vector", "len", "int", "field", (), "len"),
+    ("Vector", "map", "Vector<T>", "method", (("__fn_ptr<T, T>", "fn"),), "map"),
+    ("Vector", "max", "T", "method", (), "max"),
+    ("Vector", "min", "T", "method", (), "min"),
+    ("Vector", "pop", "T", "method", (), "pop"),
+    ("Vector", "push", "void", "method", (("T", "val"),), "push"),
+    ("Vector", "reduce", "T", "method", (("T", "init"), ("__fn_ptr<T, T, T>", "fn")), "reduce"),
+    ("Vector", "remove", "void", "method", (("int", "idx"),), "remove"),
+    ("Vector", "removeAll", "void", "method", (("T", "val"),), "removeAll"),
+    ("Vector", "removeAt", "void", "method", (("int", "idx"),), "removeAt"),
+    ("Vector", "reverse", "void", "method", (), "reverse"),
+    ("Vector", "reversed", "Vector<T>", "method", (), "reversed"),
+    ("Vector", "set", "void", "method", (("int", "i"), ("T", "val")), "set"),
+    ("Vector", "size", "int", "method", (), "size"),
+    ("Vector", "slice", "Vector<T>", "method", (("int", "start"), ("int", "end")), "slice"),
+    ("Vector", "sort", "void", "method", (), "sort"),
+    ("Vector", "sorted", "Vector<T>", "method", (), "sorted"),
+    ("Vector", "sum", "T", "method", (), "sum"),
+    ("Vector", "swap", "void", "method", (("int", "i"), ("int", "j")), "swap"),
+    ("Vector", "take", "Vector<T>", "method", (("int", "n"),), "take"),
+)
+
+# Stdlib static methods, same row shape; only built on first use
+_RAW_STDLIB: tuple[tuple[str, str, str, str, tuple[tuple[str, str], ...], str], ...] = (
+    # Console static methods, generated from stdlib .btrc files
+    ("Console", "error", "void", "method", (("string", "msg"),), "error"),
+    ("Console", "log", "void", "method", (("string", "msg"),), "log"),
+    ("Console", "write", "void", "method", (("string", "msg"),), "write"),
+    ("Console", "writeLine", "void", "method", (("string", "msg"),), "writeLine"),
+    # Path static methods, generated from stdlib .btrc files
+    ("Path", "exists", "bool", "method", (("string", "path"),), "exists"),
+    ("Path", "readAll", "string", "method", (("string", "path"),), "readAll"),
+    ("Path", "writeAll", "void", "method", (("string", "path"), ("string", "content")), "writeAll"),
+    # Math static methods, generated from stdlib .btrc files
+    ("Math", "E", "float", "method", (), "E"),
+    ("Math", "INF", "float", "method", (), "INF"),
+    ("Math", "PI", "float", "method", (), "PI"),
+    ("Math", "TAU", "float", "method", (), "TAU"),
+    ("Math", "abs", "int", "method", (("int", "x"),), "abs"),
+    ("Math", "acos", "float", "method", (("float", "x"),), "acos"),
+    ("Math", "asin", "float", "method", (("float", "x"),), "asin"),
+    ("Math", "atan", "float", "method", (("float", "x"),), "atan"),
+    ("Math", "atan2", "float", "method", (("float", "y"), ("float", "x")), "atan2"),
+    ("Math", "ceil", "float", "method", (("float", "x"),), "ceil"),
+    ("Math", "clamp", "int", "method", (("int", "x"), ("int", "lo"), ("int", "hi")), "clamp"),
+    ("Math", "cos", "float", "method", (("float", "x"),), "cos"),
+    ("Math", "exp", "float", "method", (("float", "x"),), "exp"),
+    ("Math", "fabs", "float", "method", (("float", "x"),), "fabs"),
+    ("Math", "factorial", "int", "method", (("int", "n"),), "factorial"),
+    ("Math", "fclamp", "float", "method", (("float", "val"), ("float", "lo"), ("float", "hi")), "fclamp"),
+    ("Math", "fibonacci", "int", "method", (("int", "n"),), "fibonacci"),
+    ("Math", "floor", "float", "method", (("float", "x"),), "floor"),
+    ("Math", "fmax", "float", "method", (("float", "a"), ("float", "b")), "fmax"),
+    ("Math", "fmin", "float", "method", (("float", "a"), ("float", "b")), "fmin"),
+    ("Math", "fsign", "float", "method", (("float", "x"),), "fsign"),
+    ("Math", "fsum", "float", "method", (("Vector<float>", "items"),), "fsum"),
+    ("Math", "gcd", "int", "method", (("int", "a"), ("int", "b")), "gcd"),
+    ("Math", "isEven", "bool", "method", (("int", "n"),), "isEven"),
+    ("Math", "isOdd", "bool", "method", (("int", "n"),), "isOdd"),
+    ("Math", "isPrime", "bool", "method", (("int", "n"),), "isPrime"),
+    ("Math", "lcm", "int", "method", (("int", "a"), ("int", "b")), "lcm"),
+    ("Math", "log", "float", "method", (("float", "x"),), "log"),
+    ("Math", "log10", "float", "method", (("float", "x"),), "log10"),
+    ("Math", "log2", "float", "method", (("float", "x"),), "log2"),
+    ("Math", "max", "int", "method", (("int", "a"), ("int", "b")), "max"),
+    ("Math", "min", "int", "method", (("int", "a"), ("int", "b")), "min"),
+    ("Math", "power", "float", "method", (("float", "base"), ("int", "exp")), "power"),
+    ("Math", "round", "int", "method", (("float", "x"),), "round"),
+    ("Math", "sign", "int", "method", (("int", "x"),), "sign"),
+    ("Math", "sin", "float", "method", (("float", "x"),), "sin"),
+    ("Math", "sqrt", "float", "method", (("float", "x"),), "sqrt"),
+    ("Math", "sum", "int", "method", (("Vector<int>", "items"),), "sum"),
+    ("Math", "tan", "float", "method", (("float", "x"),), "tan"),
+    ("Math", "toDegrees", "float", "method", (("float", "radians"),), "toDegrees"),
+    ("Math", "toRadians", "float", "method", (("float", "degrees"),), "toRadians"),
+    ("Math", "truncate", "int", "method", (("float", "x"),), "truncate"),
+    # Strings static methods, generated from stdlib .btrc files
+    ("Strings", "capitalize", "string", "method", (("string", "s"),), "capitalize"),
+    ("Strings", "center", "string", "method", (("string", "s"), ("int", "width"), ("char", "fill")), "center"),
+    ("Strings", "count", "int", "method", (("string", "s"), ("string", "sub")), "count"),
+    ("Strings", "find", "int", "method", (("string", "s"), ("string", "sub"), ("int", "start")), "find"),
+    ("Strings", "fromFloat", "string", "method", (("float", "f"),), "fromFloat"),
+    ("Strings", "fromInt", "string", "method", (("int", "n"),), "fromInt"),
+    ("Strings", "isAlnum", "bool", "method", (("char", "c"),), "isAlnum"),
+    ("Strings", "isAlpha", "bool", "method", (("char", "c"),), "isAlpha"),
+    ("Strings", "isAlphaStr", "bool", "method", (("string", "s"),), "isAlphaStr"),
+    ("Strings", "isBlank", "bool", "method", (("string", "s"),), "isBlank"),
+    ("Strings", "isDigit", "bool", "method", (("char", "c"),), "isDigit"),
+    ("Strings", "isDigitStr", "bool", "method", (("string", "s"),), "isDigitStr"),
+    ("Strings", "isSpace", "bool", "method", (("char", "c"),), "isSpace"),
+    ("Strings", "join", "string", "method", (("Vector<string>", "items"), ("string", "sep")), "join"),
+    ("Strings", "lstrip", "string", "method", (("string", "s"),), "lstrip"),
+    ("Strings", "padLeft", "string", "method", (("string", "s"), ("int", "width"), ("char", "fill")), "padLeft"),
+    ("Strings", "padRight", "string", "method", (("string", "s"), ("int", "width"), ("char", "fill")), "padRight"),
+    ("Strings", "repeat", "string", "method", (("string", "s"), ("int", "count")), "repeat"),
+    ("Strings", "replace", "string", "method", (("string", "s"), ("string", "old"), ("string", "replacement")), "replace"),
+    ("Strings", "rfind", "int", "method", (("string", "s"), ("string", "sub")), "rfind"),
+    ("Strings", "rstrip", "string", "method", (("string", "s"),), "rstrip"),
+    ("Strings", "swapCase", "string", "method", (("string", "s"),), "swapCase"),
+    ("Strings", "title", "string", "method", (("string", "s"),), "title"),
+    ("Strings", "toFloat", "float", "method", (("string", "s"),), "toFloat"),
+    ("Strings", "toInt", "int", "method", (("string", "s"),), "toInt"),
+)
+
+# Namespaces in _RAW / _RAW_STDLIB, in table order
+_TYPE_NAMES: tuple[str, ...] = ("string", "Array", "List", "Map", "Result", "Set", "Vector")
+_STDLIB_NAMES: tuple[str, ...] = ("Console", "Path", "Math", "Strings")
+
+# Built-in free function signatures (read-only): name -> (return_type, ((param_type, param_name), ...))
+BUILTIN_FUNCTION_SIGNATURES: MappingProxyType[str, tuple[str, tuple[tuple[str, str], ...]]] = MappingProxyType({
+    "println": ("void", (("string", "message"),)),
+    "print": ("void", (("string", "message"),)),
+    "input": ("string", (("string", "prompt"),)),
+    "toString": ("string", (("int", "value"),)),
+    "toInt": ("int", (("string", "value"),)),
+    "toFloat": ("float", (("string", "value"),)),
+    "len": ("int", (("string", "s"),)),
+    "range": ("Vector<int>", (("int", "n"),)),
+    "exit": ("void", (("int", "code"),)),
+})
@@ -4,6 +4,9 @@ Provides keyword, type, member access, static method, and snippet completions.
 """
 
 import re
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from itertools import chain
 
 from lsprotocol import types as lsp
 
@@ -14,17 +17,14 @@ from src.compiler.python.ast_nodes import (
 )
 from src.devex.lsp.builtins import (
     _MEMBER_TABLES,
-    STDLIB_STATIC_METHODS,
+    _STDLIB_NAMES,
     BuiltinMember,
     get_members_for_type,
+    get_stdlib_methods,
 )
 from src.devex.lsp.diagnostics import AnalysisResult
-from src.devex.lsp.utils import (
-    find_enclosing_class_from_source,
-    get_text_before_cursor,
-    resolve_variable_type,
-    type_repr,
-)
+from src.devex.lsp.type_resolution import get_variable_type
+from src.devex.lsp.utils import find_enclosing_class_from_source, get_line_text_before_cursor, params_repr, type_repr
 
 # ---------------------------------------------------------------------------
 # Keyword completions
@@ -99,7 +99,6 @@ _BTRC_TYPES = list(_PRIMITIVE_TYPES) + [
 _SNIPPETS = [
     (
         "class",
-        "class ... { ... }",
         "Class with constructor",
         (
             "class ${1:ClassName} {\n"
@@ -115,49 +114,41 @@ _SNIPPETS = [
     ),
     (
         "for in",
-        "for ... in range(...) { ... }",
         "For-in loop with range",
         ("for ${1:i} in range(${2:n}) {\n\t$0\n}"),
     ),
     (
         "for in collection",
-        "for ... in collection { ... }",
         "For-in loop over collection",
         ("for ${1:item} in ${2:collection} {\n\t$0\n}"),
     ),
     (
         "try",
-        "try { ... } catch(e) { ... }",
         "Try/catch block",
         ("try {\n\t$1\n} catch(${2:e}) {\n\t$0\n}"),
     ),
     (
         "if",
-        "if (...) { ... }",
         "If statement",
         ("if (${1:condition}) {\n\t$0\n}"),
     ),
     (
         "if else",
-        "if (...) { ... } else { ... }",
         "If/else statement",
         ("if (${1:condition}) {\n\t$2\n} else {\n\t$0\n}"),
     ),
     (
         "while",
-        "while (...) { ... }",
         "While loop",
         ("while (${1:condition}) {\n\t$0\n}"),
     ),
     (
         "public method",
-        "public ... method(...) { ... }",
         "Public method declaration",
         ("public ${1:void} ${2:methodName}(${3:}) {\n\t$0\n}"),
     ),
     (
         "println",
-        'println("...")',
         "Print line",
         'println("${1:message}")$0',
     ),
@@ -169,151 +160,222 @@ _SNIPPETS = [
 # ---------------------------------------------------------------------------
 
 
-def _keyword_completions() -> list[lsp.CompletionItem]:
-    items = []
-    for kw, doc in _BTRC_KEYWORDS:
-        items.append(
-            lsp.CompletionItem(
-                label=kw,
-                kind=lsp.CompletionItemKind.Keyword,
-                detail=doc,
-                insert_text=kw,
-            )
-        )
-    return items
+# The keyword/type/snippet items never change, so they are built once at import
+# and shared by every request (clients only serialize them, never mutate them).
+_KEYWORD_ITEMS: tuple[lsp.CompletionItem, ...] = tuple(
+    lsp.CompletionItem(
+        label=kw,
+        kind=lsp.CompletionItemKind.Keyword,
+        detail=doc,
+        insert_text=kw,
+    )
+    for kw, doc in _BTRC_KEYWORDS
+)
 
+_TYPE_ITEMS: tuple[lsp.CompletionItem, ...] = tuple(
+    lsp.CompletionItem(
+        label=name,
+        kind=lsp.CompletionItemKind.Class,
+        detail=doc,
+        insert_text=name,
+    )
+    for name, doc in _BTRC_TYPES
+)
 
-def _type_completions() -> list[lsp.CompletionItem]:
-    items = []
-    for name, doc in _BTRC_TYPES:
-        items.append(
-            lsp.CompletionItem(
-                label=name,
-                kind=lsp.CompletionItemKind.Class,
-                detail=doc,
-                insert_text=name,
-            )
-        )
-    return items
+_SNIPPET_ITEMS: tuple[lsp.CompletionItem, ...] = tuple(
+    lsp.CompletionItem(
+        label=label,
+        kind=lsp.CompletionItemKind.Snippet,
+        detail=doc,
+        insert_text=body,
+        insert_text_format=lsp.InsertTextFormat.Snippet,
+    )
+    for label, doc, body in _SNIPPETS
+)
 
+# Stdlib class names, offered when the document's class_table lacks them
+_STDLIB_CLASS_ITEMS: dict[str, lsp.CompletionItem] = {
+    name: lsp.CompletionItem(
+        label=name,
+        kind=lsp.CompletionItemKind.Class,
+        detail=f"stdlib class {name}",
+        insert_text=name,
+    )
+    for name in _STDLIB_NAMES
+}
+
+
+# Keyword and type items sorted by lowercased label, so the items starting
+# with a typed prefix form one contiguous slice found by bisection
+_PREFIX_ITEMS: tuple[tuple[str, lsp.CompletionItem], ...] = tuple(
+    sorted(((item.label.lower(), item) for item in (*_KEYWORD_ITEMS, *_TYPE_ITEMS)), key=lambda e: e[0])
+)
+_PREFIX_KEYS: tuple[str, ...] = tuple(key for key, _ in _PREFIX_ITEMS)
 
-def _snippet_completions() -> list[lsp.CompletionItem]:
-    items = []
-    for label, filter_text, doc, body in _SNIPPETS:
-        items.append(
-            lsp.CompletionItem(
-                label=label,
-                kind=lsp.CompletionItemKind.Snippet,
-                detail=doc,
-                insert_text=body,
-                insert_text_format=lsp.InsertTextFormat.Snippet,
-                filter_text=filter_text,
-            )
-        )
-    return items
+
+def _prefix_items(prefix: str) -> Iterator[lsp.CompletionItem]:
+    """Yield the keyword and type items whose labels start with *prefix* (lowercase)."""
+    lo = bisect_left(_PREFIX_KEYS, prefix)
+    hi = bisect_left(_PREFIX_KEYS, prefix + "\uffff", lo)
+    for i in range(lo, hi):
+        yield _PREFIX_ITEMS[i][1]
+
+
+def _class_detail(name: str, info: ClassInfo) -> str:
+    detail = f"class {name}"
+    if info.generic_params:
+        detail += f"<{', '.join(info.generic_params)}>"
+    if info.parent:
+        detail += f" extends {info.parent}"
+    return detail
 
 
 def _class_name_completions(
-    class_table: dict[str, ClassInfo],
-) -> list[lsp.CompletionItem]:
-    items = []
+    class_table: dict[str, ClassInfo], prefix: str = ""
+) -> Iterator[lsp.CompletionItem]:
+    """Yield items for user classes whose lowercased names start with *prefix*."""
     for name, info in class_table.items():
-        detail = f"class {name}"
-        if info.generic_params:
-            detail += f"<{', '.join(info.generic_params)}>"
-        if info.parent:
-            detail += f" extends {info.parent}"
-        items.append(
-            lsp.CompletionItem(
+        if name.lower().startswith(prefix):
+            yield lsp.CompletionItem(
                 label=name,
                 kind=lsp.CompletionItemKind.Class,
-                detail=detail,
+                detail=_class_detail(name, info),
                 insert_text=name,
             )
+
+
+def _stdlib_class_completions(
+    class_table: dict[str, ClassInfo], prefix: str = ""
+) -> Iterator[lsp.CompletionItem]:
+    """Yield stdlib class items not shadowed by *class_table* and matching *prefix*."""
+    for name, item in _STDLIB_CLASS_ITEMS.items():
+        if name not in class_table and name.lower().startswith(prefix):
+            yield item
+
+
+# type name -> completion items for its built-in members; filled on first use
+# and shared by later requests.
+_BUILTIN_ITEM_CACHE: dict[str, list[lsp.CompletionItem]] = {}
+
+
+def _builtin_member_item(m: BuiltinMember) -> lsp.CompletionItem:
+    if m.kind == "field":
+        return lsp.CompletionItem(
+            label=m.name,
+            kind=lsp.CompletionItemKind.Field,
+            detail=f"{m.return_type} (field)",
+            documentation=m.doc,
+            insert_text=m.name,
         )
+    params_str = ", ".join(f"{pt} {pn}" for pt, pn in m.params)
+    return lsp.CompletionItem(
+        label=m.name,
+        kind=lsp.CompletionItemKind.Method,
+        detail=f"{m.return_type} {m.name}({params_str}) -- {m.doc}",
+        insert_text=f"{m.name}($1)$0",
+        insert_text_format=lsp.InsertTextFormat.Snippet,
+    )
+
+
+def _builtin_member_items(type_name: str) -> list[lsp.CompletionItem]:
+    """Return (cached) completion items for a built-in type's members."""
+    items = _BUILTIN_ITEM_CACHE.get(type_name)
+    if items is None:
+        items = [_builtin_member_item(m) for m in get_members_for_type(type_name)]
+        _BUILTIN_ITEM_CACHE[type_name] = items
     return items
 
 
-def _builtin_member_items(members: list[BuiltinMember]) -> list[lsp.CompletionItem]:
-    """Build completion items from BuiltinMember list."""
-    items = []
-    for m in members:
-        if m.kind == "field":
-            items.append(
-                lsp.CompletionItem(
-                    label=m.name,
-                    kind=lsp.CompletionItemKind.Field,
-                    detail=f"{m.return_type} (field)",
-                    documentation=m.doc,
-                    insert_text=m.name,
-                )
-            )
-        else:
-            params_str = ", ".join(f"{pt} {pn}" for pt, pn in m.params)
-            detail = f"{m.return_type} {m.name}({params_str}) -- {m.doc}"
-            items.append(
-                lsp.CompletionItem(
-                    label=m.name,
-                    kind=lsp.CompletionItemKind.Method,
-                    detail=detail,
-                    insert_text=f"{m.name}($1)$0",
-                    insert_text_format=lsp.InsertTextFormat.Snippet,
-                )
-            )
-    return items
+# (class name, member rows) -> items.  The rows capture everything the items
+# show, so edits that leave a class's API alone reuse its items across
+# analyses.  Cleared wholesale when full; it only ever holds live APIs.
+_CLASS_ITEM_CACHE: dict[tuple, list[lsp.CompletionItem]] = {}
+_CLASS_ITEM_CACHE_MAX = 256
 
 
-def _class_member_items(class_name: str, info: ClassInfo) -> list[lsp.CompletionItem]:
-    items = []
+def _class_member_rows(info: ClassInfo) -> tuple[tuple[str, str, bool], ...]:
+    """Return (label, detail, is_method) for a user class's fields and methods."""
+    rows = []
     for fname, fdecl in info.fields.items():
         if isinstance(fdecl, FieldDecl):
             ftype = type_repr(fdecl.type)
-            items.append(
-                lsp.CompletionItem(
-                    label=fname,
-                    kind=lsp.CompletionItemKind.Field,
-                    detail=f"{fdecl.access} {ftype} {fname}",
-                    documentation=f"Field of {class_name}",
-                    insert_text=fname,
-                )
-            )
+            rows.append((fname, f"{fdecl.access} {ftype} {fname}", False))
     for mname, mdecl in info.methods.items():
         if isinstance(mdecl, MethodDecl):
-            params = ", ".join(f"{type_repr(p.type)} {p.name}" for p in mdecl.params)
+            params = params_repr(mdecl)
             ret = type_repr(mdecl.return_type)
             access = mdecl.access
             static = " (static)" if access == "class" else ""
-            items.append(
-                lsp.CompletionItem(
-                    label=mname,
-                    kind=lsp.CompletionItemKind.Method,
-                    detail=f"{access} {ret} {mname}({params}){static}",
-                    documentation=f"Method of {class_name}",
-                    insert_text=f"{mname}($1)$0",
-                    insert_text_format=lsp.InsertTextFormat.Snippet,
-                )
-            )
+            rows.append((mname, f"{access} {ret} {mname}({params}){static}", True))
+    return tuple(rows)
+
+
+def _class_member_item(class_name: str, label: str, detail: str, is_method: bool) -> lsp.CompletionItem:
+    if is_method:
+        return lsp.CompletionItem(
+            label=label,
+            kind=lsp.CompletionItemKind.Method,
+            detail=detail,
+            documentation=f"Method of {class_name}",
+            insert_text=f"{label}($1)$0",
+            insert_text_format=lsp.InsertTextFormat.Snippet,
+        )
+    return lsp.CompletionItem(
+        label=label,
+        kind=lsp.CompletionItemKind.Field,
+        detail=detail,
+        documentation=f"Field of {class_name}",
+        insert_text=label,
+    )
+
+
+def _class_member_items(result: AnalysisResult, class_name: str, info: ClassInfo) -> list[lsp.CompletionItem]:
+    """Return completion items for a user class's fields and methods.
+
+    The list is memoized per analysis and shared across analyses while the
+    class's member rows are unchanged.  Callers must copy it before adding
+    items.
+    """
+    per_analysis = result.completion_items
+    if per_analysis is None:
+        per_analysis = result.completion_items = {}
+    items = per_analysis.get(class_name)
+    if items is not None:
+        return items
+    key = (class_name, _class_member_rows(info))
+    items = _CLASS_ITEM_CACHE.get(key)
+    if items is None:
+        items = [_class_member_item(class_name, *row) for row in key[1]]
+        if len(_CLASS_ITEM_CACHE) >= _CLASS_ITEM_CACHE_MAX:
+            _CLASS_ITEM_CACHE.clear()
+        _CLASS_ITEM_CACHE[key] = items
+    per_analysis[class_name] = items
     return items
 
 
+_STATIC_ITEM_CACHE: dict[str, list[lsp.CompletionItem]] = {}
+
+
 def _static_method_items(
-    class_name: str, methods: list[BuiltinMember]
+    class_name: str, methods: Sequence[BuiltinMember]
 ) -> list[lsp.CompletionItem]:
-    """Build completion items for stdlib static methods."""
-    items = []
-    for m in methods:
-        params_str = ", ".join(f"{pt} {pn}" for pt, pn in m.params)
-        doc = f"{m.return_type} {m.name}({params_str})"
-        items.append(
-            lsp.CompletionItem(
-                label=m.name,
-                kind=lsp.CompletionItemKind.Method,
-                detail=doc,
-                documentation=f"Static method of {class_name}",
-                insert_text=f"{m.name}($1)$0",
-                insert_text_format=lsp.InsertTextFormat.Snippet,
-            )
+    """Return (cached) completion items for stdlib static methods."""
+    items = _STATIC_ITEM_CACHE.get(class_name)
+    if items is not None:
+        return items
+    documentation = f"Static method of {class_name}"
+    items = [
+        lsp.CompletionItem(
+            label=m.name,
+            kind=lsp.CompletionItemKind.Method,
+            detail=f"{m.return_type} {m.name}({', '.join(f'{pt} {pn}' for pt, pn in m.params)})",
+            documentation=documentation,
+            insert_text=f"{m.name}($1)$0",
+            insert_text_format=lsp.InsertTextFormat.Snippet,
         )
+        for m in methods
+    ]
+    _STATIC_ITEM_CACHE[class_name] = items
     return items
 
 
@@ -321,53 +383,120 @@ def _static_method_items(
 # Main completion entry point
 # ---------------------------------------------------------------------------
 
+# Receiver followed by a member-access operator at the end of the text
+_MEMBER_TRIGGER_RE = re.compile(r"(\w+)(?:\.|->|\?\.)\s*$")
+
+# Partial identifier being typed at the end of the text
+_WORD_PREFIX_RE = re.compile(r"\w*$")
+
+
+def _in_string_or_comment(text: str) -> bool:
+    """Return True if the end of *text* (one line) is inside a literal or comment.
+
+    Scans the live line rather than the analysis tokens, which lag behind
+    the buffer and never contain comments.  Code inside f-string ``{...}``
+    interpolations counts as code.  Block comments opened on an earlier line
+    are not detected.
+    """
+    quote = None
+    is_fstring = False
+    interp_depth = 0  # brace depth inside an f-string interpolation
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if quote:
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+            elif is_fstring and ch == "{":
+                if text.startswith("{{", i):
+                    i += 2
+                    continue
+                quote = None
+                interp_depth = 1
+        elif ch == '"' or ch == "'":
+            quote = ch
+            is_fstring = ch == '"' and i > 0 and text[i - 1] == "f" and not (i > 1 and text[i - 2].isalnum())
+        elif interp_depth and ch in "{}":
+            interp_depth += 1 if ch == "{" else -1
+            if not interp_depth:
+                quote, is_fstring = '"', True
+        elif text.startswith("//", i):
+            return True
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            if end < 0:
+                return True
+            i = end + 2
+            continue
+        i += 1
+    return quote is not None
+
 
 def get_completions(
     result: AnalysisResult,
     position: lsp.Position,
-) -> list[lsp.CompletionItem]:
-    """Compute completion items for the given cursor position."""
-    text_before = get_text_before_cursor(result.source, position)
+) -> lsp.CompletionList:
+    """Compute completion items for the given cursor position.
+
+    Resolved results are marked complete so the client keeps filtering them
+    locally as the user types instead of re-requesting on every keystroke.
+    General completions are narrowed server-side to the identifier prefix
+    under the cursor and marked incomplete, so the client re-queries only
+    when that prefix changes.
+    """
+    text_before = get_line_text_before_cursor(result, position)
+    if _in_string_or_comment(text_before):
+        return lsp.CompletionList(is_incomplete=False, items=[])
     class_table = result.analyzed.class_table if result.analyzed else {}
 
-    # Dot-triggered completions: member access or static methods
-    dot_match = re.search(r"(\w+)\.\s*$", text_before)
-    if dot_match:
-        obj_name = dot_match.group(1)
-        return _dot_completions(result, obj_name, position, class_table)
-
-    # Optional-chaining triggered completions: obj?.member
-    opt_match = re.search(r"(\w+)\?\.\s*$", text_before)
-    if opt_match:
-        obj_name = opt_match.group(1)
-        return _dot_completions(result, obj_name, position, class_table)
-
-    # Arrow triggered completions: obj->member
-    arrow_match = re.search(r"(\w+)->\s*$", text_before)
-    if arrow_match:
-        obj_name = arrow_match.group(1)
-        return _dot_completions(result, obj_name, position, class_table)
-
-    # General completions: keywords + types + snippets + class names
-    items: list[lsp.CompletionItem] = []
-    items.extend(_keyword_completions())
-    items.extend(_type_completions())
-    items.extend(_snippet_completions())
-    items.extend(_class_name_completions(class_table))
-
-    # Add stdlib class names that might not be in the class_table
-    for stdlib_name in STDLIB_STATIC_METHODS:
-        if stdlib_name not in class_table:
-            items.append(
-                lsp.CompletionItem(
-                    label=stdlib_name,
-                    kind=lsp.CompletionItemKind.Class,
-                    detail=f"stdlib class {stdlib_name}",
-                    insert_text=stdlib_name,
-                )
+    # Member access (obj.member, obj?.member, obj->member) or static methods
+    trigger = _MEMBER_TRIGGER_RE.search(text_before)
+    if trigger:
+        return _dot_completion_list(result, trigger.group(1), position, class_table)
+
+    prefix = _WORD_PREFIX_RE.search(text_before).group().lower()
+    if not prefix:
+        # General completions: keywords + types + snippets + class names,
+        # plus stdlib class names that might not be in the class_table
+        items = list(
+            chain(
+                _KEYWORD_ITEMS,
+                _TYPE_ITEMS,
+                _SNIPPET_ITEMS,
+                _class_name_completions(class_table),
+                _stdlib_class_completions(class_table),
             )
+        )
+        return lsp.CompletionList(is_incomplete=False, items=items)
+
+    # Only what matches the typed prefix; snippets are always offered
+    items = list(
+        chain(
+            _prefix_items(prefix),
+            _SNIPPET_ITEMS,
+            _class_name_completions(class_table, prefix),
+            _stdlib_class_completions(class_table, prefix),
+        )
+    )
+    return lsp.CompletionList(is_incomplete=True, items=items)
 
-    return items
+
+def _dot_completion_list(
+    result: AnalysisResult,
+    obj_name: str,
+    position: lsp.Position,
+    class_table: dict[str, ClassInfo],
+) -> lsp.CompletionList:
+    """Wrap dot completions in a CompletionList.
+
+    An unresolved receiver (no items) stays incomplete so the client asks
+    again once more of the file has been analyzed.
+    """
+    items = _dot_completions(result, obj_name, position, class_table)
+    return lsp.CompletionList(is_incomplete=not items, items=items)
 
 
 def _dot_completions(
@@ -381,24 +510,26 @@ def _dot_completions(
     # 1. Check if obj_name is a known class name (static method access)
     if obj_name in class_table:
         info = class_table[obj_name]
-        items = _class_member_items(obj_name, info)
-        stdlib_methods = STDLIB_STATIC_METHODS.get(obj_name)
+        items = list(_class_member_items(result, obj_name, info))
+        stdlib_methods = get_stdlib_methods(obj_name)
         if stdlib_methods:
-            existing_labels = {item.label for item in items}
-            for item in _static_method_items(obj_name, stdlib_methods):
-                if item.label not in existing_labels:
-                    items.append(item)
+            # Item labels are exactly the class's field and method names
+            items.extend(
+                item
+                for item in _static_method_items(obj_name, stdlib_methods)
+                if item.label not in info.methods and item.label not in info.fields
+            )
         return items
 
     # Check stdlib static methods for classes not in the class_table
-    stdlib_methods = STDLIB_STATIC_METHODS.get(obj_name)
+    stdlib_methods = get_stdlib_methods(obj_name)
     if stdlib_methods:
-        return _static_method_items(obj_name, stdlib_methods)
+        return list(_static_method_items(obj_name, stdlib_methods))
 
     # 2. Resolve the type of the variable
     var_type = _resolve_var_type(result, obj_name, position.line)
     if var_type is not None:
-        return _members_for_type(var_type, class_table)
+        return _members_for_type(result, var_type, class_table)
 
     return []
 
@@ -412,23 +543,23 @@ def _resolve_var_type(
     if not result.ast:
         return None
     if var_name == "self":
-        return find_enclosing_class_from_source(result.ast, result.source, cursor_line)
-    class_table = result.analyzed.class_table if result.analyzed else {}
-    return resolve_variable_type(var_name, result.ast, class_table)
+        return find_enclosing_class_from_source(result, cursor_line)
+    return get_variable_type(result, var_name)
 
 
 def _members_for_type(
+    result: AnalysisResult,
     type_base: str,
     class_table: dict[str, ClassInfo],
 ) -> list[lsp.CompletionItem]:
     """Return member completion items for a given base type."""
     # Built-in types
-    members = get_members_for_type(type_base)
-    if members:
-        return _builtin_member_items(members)
+    items = _builtin_member_items(type_base)
+    if items:
+        return items
 
     # User-defined class
     if type_base in class_table:
-        return _class_member_items(type_base, class_table[type_base])
+        return _class_member_items(result, type_base, class_table[type_base])
 
     return []
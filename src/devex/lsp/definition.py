@@ -13,7 +13,10 @@ Supports jumping to definitions for:
 
 from __future__ import annotations
 
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
+from typing import Any
 
 from lsprotocol import types as lsp
 
@@ -46,14 +49,9 @@ from src.compiler.python.ast_nodes import (
 )
 from src.compiler.python.tokens import Token, TokenType
 from src.devex.lsp.diagnostics import AnalysisResult
-from src.devex.lsp.utils import (
-    body_range,
-    find_enclosing_class,
-    find_token_at_position,
-    find_token_index,
-    resolve_chain_type,
-    resolve_variable_type,
-)
+from src.devex.lsp.indexes import get_member_owner, get_token_at_position, get_token_index
+from src.devex.lsp.type_resolution import get_variable_type, resolve_chain_type
+from src.devex.lsp.utils import MEMBER_ACCESS_OPS, body_range, find_enclosing_class
 
 # ---------------------------------------------------------------------------
 # Variable definition entry (scope-aware)
@@ -88,7 +86,16 @@ class DefinitionMap:
         self.enum_defs: dict[str, tuple[int, int]] = {}
         self.struct_defs: dict[str, tuple[int, int]] = {}
         self.typedef_defs: dict[str, tuple[int, int]] = {}
-        self.var_defs: list[VarDef] = []
+        # name -> definitions sorted by line (see _walk_scopes), for
+        # bisecting; filled on the first find_var call
+        self.var_defs: dict[str, list[VarDef]] = {}
+        # (params, body, scope_start, scope_end) of every function/method,
+        # walked lazily since most lookups never reach local variables
+        self._pending_scopes: list[tuple[list[Param], Block | None, int, int]] = []
+        self._vars_walked = False
+        # name -> top-level definitions in lookup priority order (class,
+        # function, enum, struct, typedef); one probe per identifier
+        self.symbol_defs: dict[str, list[tuple[int, int]]] = {}
 
     @classmethod
     def from_ast(cls, ast: Program) -> DefinitionMap:
@@ -100,35 +107,79 @@ class DefinitionMap:
                 _collect_class_members(dmap, decl)
             elif isinstance(decl, FunctionDecl):
                 dmap.function_defs[decl.name] = (decl.line, decl.col)
-                scope_start, scope_end = body_range(decl.body, decl.line)
-                _collect_params(dmap, decl.params, scope_start, scope_end)
-                if decl.body:
-                    _collect_vars_in_block(dmap, decl.body, scope_start, scope_end)
+                dmap.defer_scope(decl.params, decl.body, decl.line)
             elif isinstance(decl, EnumDecl):
                 dmap.enum_defs[decl.name] = (decl.line, decl.col)
             elif isinstance(decl, StructDecl):
                 dmap.struct_defs[decl.name] = (decl.line, decl.col)
             elif isinstance(decl, TypedefDecl):
                 dmap.typedef_defs[decl.alias] = (decl.line, decl.col)
+        for table in (dmap.class_defs, dmap.function_defs, dmap.enum_defs, dmap.struct_defs, dmap.typedef_defs):
+            for name, loc in table.items():
+                dmap.symbol_defs.setdefault(name, []).append(loc)
         return dmap
 
+    def defer_scope(self, params: list[Param], body: Block | None, decl_line: int):
+        """Queue a function or method body for the lazy variable walk."""
+        scope_start, scope_end = body_range(body, decl_line)
+        self._pending_scopes.append((params, body, scope_start, scope_end))
+
+    def _walk_scopes(self):
+        """Collect variable definitions from every queued body, in AST order."""
+        for params, body, scope_start, scope_end in self._pending_scopes:
+            _collect_params(self, params, scope_start, scope_end)
+            if body:
+                _collect_vars_in_block(self, body, scope_start, scope_end)
+        self._pending_scopes.clear()
+        for defs in self.var_defs.values():
+            defs.sort(key=_var_line)  # stable: same-line defs keep AST order
+        self._vars_walked = True
+
+    def add_var(self, vd: VarDef):
+        """Register a variable-like definition under its name."""
+        self.var_defs.setdefault(vd.name, []).append(vd)
+
     def find_var(self, name: str, cursor_line: int) -> tuple[int, int] | None:
         """Find the closest variable definition for *name* visible at *cursor_line*."""
+        if not self._vars_walked:
+            self._walk_scopes()
+        candidates = self.var_defs.get(name)
+        if not candidates:
+            return None
+        # Walk back from the last definition at or before cursor_line; the
+        # first in-scope hit has the greatest line.  Among several on that
+        # line the earliest-collected one wins.
         best: VarDef | None = None
-        for vd in self.var_defs:
-            if vd.name != name:
-                continue
-            if not (vd.scope_start <= cursor_line <= vd.scope_end):
-                continue
-            if vd.line > cursor_line:
-                continue
-            if best is None or vd.line > best.line:
+        i = bisect_right(candidates, cursor_line, key=_var_line) - 1
+        while i >= 0:
+            vd = candidates[i]
+            if best is not None and vd.line != best.line:
+                break
+            if vd.scope_start <= cursor_line <= vd.scope_end:
                 best = vd
+            i -= 1
         if best:
             return (best.line, best.col)
         return None
 
 
+def _var_line(vd: VarDef) -> int:
+    return vd.line
+
+
+def get_definition_map(result: AnalysisResult) -> DefinitionMap:
+    """Return the DefinitionMap for *result*'s AST, building it on first use.
+
+    Each analysis produces a new AnalysisResult, so the cached map lives
+    exactly as long as the AST it was built from.
+    """
+    dmap = result.definition_map
+    if dmap is None:
+        dmap = DefinitionMap.from_ast(result.ast)
+        result.definition_map = dmap
+    return dmap
+
+
 def _collect_class_members(dmap: DefinitionMap, cls: ClassDecl):
     """Collect all member definitions from a class declaration."""
     for member in cls.members:
@@ -136,10 +187,7 @@ def _collect_class_members(dmap: DefinitionMap, cls: ClassDecl):
             dmap.field_defs[(cls.name, member.name)] = (member.line, member.col)
         elif isinstance(member, MethodDecl):
             dmap.method_defs[(cls.name, member.name)] = (member.line, member.col)
-            scope_start, scope_end = body_range(member.body, member.line)
-            _collect_params(dmap, member.params, scope_start, scope_end)
-            if member.body:
-                _collect_vars_in_block(dmap, member.body, scope_start, scope_end)
+            dmap.defer_scope(member.params, member.body, member.line)
         elif isinstance(member, PropertyDecl):
             dmap.property_defs[(cls.name, member.name)] = (member.line, member.col)
 
@@ -150,7 +198,7 @@ def _collect_params(
     """Register function/method parameters as variable definitions."""
     for p in params:
         if p.name and p.line:
-            dmap.var_defs.append(
+            dmap.add_var(
                 VarDef(
                     name=p.name,
                     line=p.line,
@@ -164,105 +212,112 @@ def _collect_params(
 def _collect_vars_in_block(
     dmap: DefinitionMap, block: Block, scope_start: int, scope_end: int
 ):
-    """Recursively collect variable declarations within a block."""
-    for stmt in block.statements:
-        _collect_vars_in_stmt(dmap, stmt, scope_start, scope_end)
+    """Collect variable declarations within a block and all nested blocks.
+
+    Walks with an explicit stack rather than recursion.  Children are pushed
+    in reverse so statements are still visited in source (pre-)order, which
+    keeps the collection order find_var's tie-breaking relies on.
+    """
+    get_handler = _STMT_HANDLERS.get
+    stack = block.statements[::-1]
+    while stack:
+        stmt = stack.pop()
+        handler = get_handler(type(stmt))
+        if handler is None:
+            continue
+        children = handler(dmap, stmt, scope_start, scope_end)
+        for child in reversed(children):
+            stack.extend(reversed(child))
+
+
+def _add_stmt_var(dmap: DefinitionMap, name: str, stmt, scope_start: int, scope_end: int):
+    dmap.add_var(
+        VarDef(
+            name=name,
+            line=stmt.line,
+            col=stmt.col,
+            scope_start=scope_start,
+            scope_end=scope_end,
+        )
+    )
 
 
-def _collect_vars_in_stmt(dmap: DefinitionMap, stmt, scope_start: int, scope_end: int):
-    """Collect variable definitions from a single statement."""
-    if isinstance(stmt, VarDeclStmt):
-        if stmt.name and stmt.line:
-            dmap.var_defs.append(
-                VarDef(
-                    name=stmt.name,
-                    line=stmt.line,
-                    col=stmt.col,
-                    scope_start=scope_start,
-                    scope_end=scope_end,
-                )
-            )
-    elif isinstance(stmt, ForInStmt):
-        if stmt.var_name and stmt.line:
-            dmap.var_defs.append(
-                VarDef(
-                    name=stmt.var_name,
-                    line=stmt.line,
-                    col=stmt.col,
-                    scope_start=scope_start,
-                    scope_end=scope_end,
-                )
-            )
-        if stmt.var_name2 and stmt.line:
-            dmap.var_defs.append(
-                VarDef(
-                    name=stmt.var_name2,
-                    line=stmt.line,
-                    col=stmt.col,
-                    scope_start=scope_start,
-                    scope_end=scope_end,
-                )
-            )
-        if stmt.body:
-            _collect_vars_in_block(dmap, stmt.body, scope_start, scope_end)
-    elif isinstance(stmt, ParallelForStmt):
-        if stmt.var_name and stmt.line:
-            dmap.var_defs.append(
-                VarDef(
-                    name=stmt.var_name,
-                    line=stmt.line,
-                    col=stmt.col,
-                    scope_start=scope_start,
-                    scope_end=scope_end,
-                )
-            )
-        if stmt.body:
-            _collect_vars_in_block(dmap, stmt.body, scope_start, scope_end)
-    elif isinstance(stmt, CForStmt):
-        if isinstance(stmt.init, ForInitVar):
-            var_decl = stmt.init.var_decl
-            if isinstance(var_decl, VarDeclStmt) and var_decl.name and var_decl.line:
-                dmap.var_defs.append(
-                    VarDef(
-                        name=var_decl.name,
-                        line=var_decl.line,
-                        col=var_decl.col,
-                        scope_start=scope_start,
-                        scope_end=scope_end,
-                    )
-                )
-        if stmt.body:
-            _collect_vars_in_block(dmap, stmt.body, scope_start, scope_end)
-    elif isinstance(stmt, TryCatchStmt):
-        if stmt.catch_var and stmt.line:
-            dmap.var_defs.append(
-                VarDef(
-                    name=stmt.catch_var,
-                    line=stmt.line,
-                    col=stmt.col,
-                    scope_start=scope_start,
-                    scope_end=scope_end,
-                )
-            )
-        if stmt.try_block:
-            _collect_vars_in_block(dmap, stmt.try_block, scope_start, scope_end)
-        if stmt.catch_block:
-            _collect_vars_in_block(dmap, stmt.catch_block, scope_start, scope_end)
-    elif isinstance(stmt, IfStmt):
-        if stmt.then_block:
-            _collect_vars_in_block(dmap, stmt.then_block, scope_start, scope_end)
-        if isinstance(stmt.else_block, ElseBlock) and stmt.else_block.body:
-            _collect_vars_in_block(dmap, stmt.else_block.body, scope_start, scope_end)
-        elif isinstance(stmt.else_block, ElseIf) and stmt.else_block.if_stmt:
-            _collect_vars_in_stmt(dmap, stmt.else_block.if_stmt, scope_start, scope_end)
-    elif isinstance(stmt, (WhileStmt, DoWhileStmt)):
-        if stmt.body:
-            _collect_vars_in_block(dmap, stmt.body, scope_start, scope_end)
-    elif isinstance(stmt, SwitchStmt):
-        for case in stmt.cases:
-            if isinstance(case, CaseClause):
-                for s in case.body:
-                    _collect_vars_in_stmt(dmap, s, scope_start, scope_end)
+# Each collector registers the statement's own definitions and returns the
+# statement lists nested inside it, in source order, for the walk to visit.
+_NO_CHILDREN: tuple[list, ...] = ()
+
+
+def _collect_var_decl(dmap: DefinitionMap, stmt: VarDeclStmt, scope_start: int, scope_end: int):
+    if stmt.name and stmt.line:
+        _add_stmt_var(dmap, stmt.name, stmt, scope_start, scope_end)
+    return _NO_CHILDREN
+
+
+def _collect_for_in(dmap: DefinitionMap, stmt: ForInStmt, scope_start: int, scope_end: int):
+    if stmt.var_name and stmt.line:
+        _add_stmt_var(dmap, stmt.var_name, stmt, scope_start, scope_end)
+    if stmt.var_name2 and stmt.line:
+        _add_stmt_var(dmap, stmt.var_name2, stmt, scope_start, scope_end)
+    return (stmt.body.statements,) if stmt.body else _NO_CHILDREN
+
+
+def _collect_parallel_for(dmap: DefinitionMap, stmt: ParallelForStmt, scope_start: int, scope_end: int):
+    if stmt.var_name and stmt.line:
+        _add_stmt_var(dmap, stmt.var_name, stmt, scope_start, scope_end)
+    return (stmt.body.statements,) if stmt.body else _NO_CHILDREN
+
+
+def _collect_c_for(dmap: DefinitionMap, stmt: CForStmt, scope_start: int, scope_end: int):
+    if isinstance(stmt.init, ForInitVar):
+        var_decl = stmt.init.var_decl
+        if isinstance(var_decl, VarDeclStmt) and var_decl.name and var_decl.line:
+            _add_stmt_var(dmap, var_decl.name, var_decl, scope_start, scope_end)
+    return (stmt.body.statements,) if stmt.body else _NO_CHILDREN
+
+
+def _collect_try_catch(dmap: DefinitionMap, stmt: TryCatchStmt, scope_start: int, scope_end: int):
+    if stmt.catch_var and stmt.line:
+        _add_stmt_var(dmap, stmt.catch_var, stmt, scope_start, scope_end)
+    children = []
+    if stmt.try_block:
+        children.append(stmt.try_block.statements)
+    if stmt.catch_block:
+        children.append(stmt.catch_block.statements)
+    return children
+
+
+def _collect_if(dmap: DefinitionMap, stmt: IfStmt, scope_start: int, scope_end: int):
+    children = []
+    if stmt.then_block:
+        children.append(stmt.then_block.statements)
+    if isinstance(stmt.else_block, ElseBlock) and stmt.else_block.body:
+        children.append(stmt.else_block.body.statements)
+    elif isinstance(stmt.else_block, ElseIf) and stmt.else_block.if_stmt:
+        children.append((stmt.else_block.if_stmt,))
+    return children
+
+
+def _collect_loop_body(dmap: DefinitionMap, stmt: WhileStmt | DoWhileStmt, scope_start: int, scope_end: int):
+    return (stmt.body.statements,) if stmt.body else _NO_CHILDREN
+
+
+def _collect_switch(dmap: DefinitionMap, stmt: SwitchStmt, scope_start: int, scope_end: int):
+    return [case.body for case in stmt.cases if isinstance(case, CaseClause)]
+
+
+# Statement type -> collector: one dict lookup per statement instead of an
+# isinstance chain.  Statements that cannot declare variables are absent.
+_STMT_HANDLERS: dict[type, Callable[[DefinitionMap, Any, int, int], Sequence[Sequence[Any]]]] = {
+    VarDeclStmt: _collect_var_decl,
+    ForInStmt: _collect_for_in,
+    ParallelForStmt: _collect_parallel_for,
+    CForStmt: _collect_c_for,
+    TryCatchStmt: _collect_try_catch,
+    IfStmt: _collect_if,
+    WhileStmt: _collect_loop_body,
+    DoWhileStmt: _collect_loop_body,
+    SwitchStmt: _collect_switch,
+}
 
 
 # ---------------------------------------------------------------------------
@@ -283,12 +338,12 @@ def get_definition(
     if not result.tokens or not result.ast:
         return None
 
-    token = find_token_at_position(result.tokens, position)
+    token = get_token_at_position(result, position)
     if token is None or token.type != TokenType.IDENT:
         return None
 
     class_table = result.analyzed.class_table if result.analyzed else {}
-    dmap = DefinitionMap.from_ast(result.ast)
+    dmap = get_definition_map(result)
     cursor_line = token.line  # 1-based
 
     # 1. Member access: obj.member / obj->member / obj?.member
@@ -296,37 +351,12 @@ def get_definition(
     if loc:
         return loc
 
-    # 2. Class name reference
-    if token.value in dmap.class_defs:
-        def_line, def_col = dmap.class_defs[token.value]
-        if token.line != def_line or token.col != def_col:
-            return _make_location(result.uri, def_line, def_col, len(token.value))
-
-    # 3. Function name reference
-    if token.value in dmap.function_defs:
-        def_line, def_col = dmap.function_defs[token.value]
-        if token.line != def_line or token.col != def_col:
-            return _make_location(result.uri, def_line, def_col, len(token.value))
-
-    # 4. Enum name reference
-    if token.value in dmap.enum_defs:
-        def_line, def_col = dmap.enum_defs[token.value]
-        if token.line != def_line or token.col != def_col:
-            return _make_location(result.uri, def_line, def_col, len(token.value))
-
-    # 5. Struct name reference
-    if token.value in dmap.struct_defs:
-        def_line, def_col = dmap.struct_defs[token.value]
+    # 2. Class / function / enum / struct / typedef name reference
+    for def_line, def_col in dmap.symbol_defs.get(token.value, ()):
         if token.line != def_line or token.col != def_col:
             return _make_location(result.uri, def_line, def_col, len(token.value))
 
-    # 6. Typedef alias reference
-    if token.value in dmap.typedef_defs:
-        def_line, def_col = dmap.typedef_defs[token.value]
-        if token.line != def_line or token.col != def_col:
-            return _make_location(result.uri, def_line, def_col, len(token.value))
-
-    # 7. Local variable / parameter / loop variable / catch variable
+    # 3. Local variable / parameter / loop variable / catch variable
     var_loc = dmap.find_var(token.value, cursor_line)
     if var_loc:
         def_line, def_col = var_loc
@@ -360,12 +390,12 @@ def _try_member_definition(
     if not result.tokens:
         return None
 
-    token_idx = find_token_index(result.tokens, token)
+    token_idx = get_token_index(result, token)
     if token_idx is None or token_idx < 2:
         return None
 
     prev = result.tokens[token_idx - 1]
-    if prev.value not in (".", "->", "?."):
+    if prev.value not in MEMBER_ACCESS_OPS:
         return None
 
     member_name = token.value
@@ -373,10 +403,7 @@ def _try_member_definition(
     target_class = resolve_chain_type(result, result.tokens, token_idx - 2, class_table)
 
     if target_class is None:
-        for cname, cinfo in class_table.items():
-            if member_name in cinfo.methods or member_name in cinfo.fields:
-                target_class = cname
-                break
+        target_class = get_member_owner(result, member_name)
 
     if target_class is None:
         return None
@@ -414,7 +441,7 @@ def _resolve_object_class(
     if obj_token.value in class_table:
         return obj_token.value
     if obj_token.value == "self":
-        return find_enclosing_class(result.ast, obj_token.line)
+        return find_enclosing_class(result, obj_token.line)
     if result.ast:
-        return resolve_variable_type(obj_token.value, result.ast, class_table)
+        return get_variable_type(result, obj_token.value)
     return None
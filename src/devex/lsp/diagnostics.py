@@ -4,9 +4,10 @@ Runs the compiler pipeline (lexer -> parser -> analyzer) on source text
 and converts errors into LSP Diagnostic objects.
 """
 
+import hashlib
 import os
-import re
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 from urllib.parse import unquote, urlparse
 
 from lsprotocol import types as lsp
@@ -15,16 +16,18 @@ from src.compiler.python.analyzer.analyzer import Analyzer
 from src.compiler.python.analyzer.core import AnalyzedProgram
 from src.compiler.python.ast_nodes import Program
 from src.compiler.python.lexer import Lexer, LexerError
-from src.compiler.python.main import resolve_includes
+from src.compiler.python.main import _BTRC_INCLUDE_RE, resolve_includes
 from src.compiler.python.parser.core import ParseError
 from src.compiler.python.parser.parser import Parser
 from src.compiler.python.tokens import Token
 
-# Regex to parse analyzer error strings: "message at line:col"
-_ANALYZER_ERROR_RE = re.compile(r"^(.+) at (\d+):(\d+)$")
+if TYPE_CHECKING:
+    from src.devex.lsp.definition import DefinitionMap
+    from src.devex.lsp.hover import HoverScope
+    from src.devex.lsp.indexes import BraceIndex
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Cached result of analyzing a document."""
 
@@ -34,6 +37,50 @@ class AnalysisResult:
     tokens: list[Token] | None = None
     ast: Program | None = None
     analyzed: AnalyzedProgram | None = None
+    # Built on first use by definition.get_definition_map(); derived from ast,
+    # so it is not a constructor argument and not part of equality/repr.
+    definition_map: "DefinitionMap | None" = field(default=None, init=False, repr=False, compare=False)
+    # source.split("\n"), built on first use by indexes.get_source_lines()
+    source_lines: list[str] | None = field(default=None, init=False, repr=False, compare=False)
+    # start offset in source of each line, built on first use by indexes.get_offset()
+    line_offsets: list[int] | None = field(default=None, init=False, repr=False, compare=False)
+    # Brace positions and depths, built on first use by indexes.get_closing_brace_line()
+    brace_index: "BraceIndex | None" = field(default=None, init=False, repr=False, compare=False)
+    # id(token) -> index in tokens, built on first use by indexes.get_token_index()
+    token_index: dict[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+    # line -> non-EOF tokens on it in list order, built by indexes.get_token_at_position()
+    token_lines: dict[int, list[Token]] | None = field(default=None, init=False, repr=False, compare=False)
+    # Per-callable variable index, built on first use by hover.get_var_index()
+    var_index: "list[HoverScope] | None" = field(default=None, init=False, repr=False, compare=False)
+    # variable name -> resolved type (or None), filled by type_resolution.get_variable_type()
+    var_types: dict[str, str | None] | None = field(default=None, init=False, repr=False, compare=False)
+    # class name -> names of all its transitive subclasses, built by indexes.get_subclasses()
+    subclass_index: dict[str, set[str]] | None = field(default=None, init=False, repr=False, compare=False)
+    # identifier name -> indices of its IDENT tokens, built by indexes.get_ident_indices()
+    ident_index: dict[str, list[int]] | None = field(default=None, init=False, repr=False, compare=False)
+    # member name -> first class declaring it, built by indexes.get_member_owner()
+    member_index: dict[str, str] | None = field(default=None, init=False, repr=False, compare=False)
+    # class name -> member name -> (owning class, decl), filled by type_resolution.class_members()
+    class_member_maps: dict[str, dict[str, tuple]] | None = field(default=None, init=False, repr=False, compare=False)
+    # (owner type, member name) -> resolved type (or None), filled by type_resolution.get_member_type()
+    member_types: dict[tuple[str, str], str | None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # id(ClassDecl) -> last line of the class, filled by utils.find_enclosing_class()
+    class_last_lines: dict[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+    # class name -> member completion items, filled by completion._class_member_items()
+    completion_items: dict[str, list[lsp.CompletionItem]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # ("class", name) / ("method" | "field", class, member) -> markdown, filled by hover._cached_markdown()
+    hover_markdown: dict[tuple[str, ...], str] | None = field(default=None, init=False, repr=False, compare=False)
+    # source_key(source), set by compute_diagnostics(); 0 when not computed
+    source_key: int = field(default=0, init=False, repr=False, compare=False)
+
+
+def source_key(source: str) -> int:
+    """Return a compact cache key for *source*: the first 8 bytes of its SHA-256."""
+    return int.from_bytes(hashlib.sha256(source.encode()).digest()[:8], "little")
 
 
 def uri_to_path(uri: str) -> str:
@@ -66,17 +113,101 @@ def _make_diagnostic(
     )
 
 
+# uri -> (source key, include stamp, result) of the latest analysis.  Only
+# analyses whose includes all resolved are cached, so a stamp covers every
+# file the result depends on besides the document itself.
+_RESULT_CACHE: dict[str, tuple[int, tuple[tuple[str, int], ...], AnalysisResult]] = {}
+
+
+def _include_stamp(paths) -> tuple[tuple[str, int], ...] | None:
+    """Return (path, mtime_ns) for each of *paths*, or None if one is missing."""
+    try:
+        return tuple(sorted((path, os.stat(path).st_mtime_ns) for path in paths))
+    except OSError:
+        return None
+
+
+# abs document path -> (#include lines, their expansions, files they pulled
+# in, include stamp).  Reused while the directives and files are unchanged.
+_INCLUDE_CACHE: dict[str, tuple[tuple[str, ...], list[str], set[str], tuple[tuple[str, int], ...]]] = {}
+
+
+def invalidate(uri: str):
+    """Drop the cached analysis for *uri* (e.g. when the document closes)."""
+    _RESULT_CACHE.pop(uri, None)
+    _INCLUDE_CACHE.pop(os.path.abspath(uri_to_path(uri)), None)
+
+
+def _resolve_includes_cached(source: str, file_path: str, included: set[str]) -> str:
+    """resolve_includes() for a live buffer, reusing expansions across edits.
+
+    Each #include line expands independently of the rest of the buffer, so
+    the expansions are cached per document and spliced back in while the
+    directive lines and the mtimes of the files they pull in are unchanged.
+    Adds the included files (not the document itself) to *included*.
+    """
+    lines = source.split("\n")
+    positions = [i for i, line in enumerate(lines) if _BTRC_INCLUDE_RE.match(line)]
+    if not positions:
+        return source
+    abs_path = os.path.abspath(file_path)
+    directives = tuple(lines[i] for i in positions)
+
+    cached = _INCLUDE_CACHE.get(abs_path)
+    if cached and cached[0] == directives and _include_stamp(cached[2]) == cached[3]:
+        expansions, deps = cached[1], cached[2]
+    else:
+        expansions, deps = [], set()
+        for directive in directives:
+            # Expand one directive at a time, sharing the dedup set exactly
+            # as resolve_includes does across the lines of one file
+            deps.discard(abs_path)
+            expansions.append(resolve_includes(directive, file_path, deps))
+        deps.discard(abs_path)
+        stamp = _include_stamp(deps)
+        if stamp is not None:
+            _INCLUDE_CACHE[abs_path] = (directives, expansions, deps, stamp)
+
+    included.update(deps)
+    for i, expansion in zip(positions, expansions):
+        lines[i] = expansion
+    return "\n".join(lines)
+
+
 def compute_diagnostics(uri: str, source: str) -> AnalysisResult:
-    """Run the compiler pipeline and return diagnostics."""
+    """Run the compiler pipeline and return diagnostics.
+
+    Returns the previous result unchanged when neither the source nor any
+    file it includes has changed since the last analysis of *uri*.
+    """
+    key = source_key(source)
+    cached = _RESULT_CACHE.pop(uri, None)
+    if cached and cached[0] == key and _include_stamp(path for path, _ in cached[1]) == cached[1]:
+        _RESULT_CACHE[uri] = cached
+        return cached[2]
+
     result = AnalysisResult(uri=uri, source=source)
+    result.source_key = key
     file_path = uri_to_path(uri)
-    filename = os.path.basename(file_path)
 
     # Resolve #include directives (best-effort)
+    included: set[str] = set()
     try:
-        resolved_source = resolve_includes(source, file_path)
+        resolved_source = _resolve_includes_cached(source, file_path, included)
     except (SystemExit, Exception):
-        resolved_source = source
+        _run_pipeline(result, source, file_path)
+        return result
+
+    _run_pipeline(result, resolved_source, file_path)
+    stamp = _include_stamp(included)
+    if stamp is not None:
+        _RESULT_CACHE[uri] = (key, stamp, result)
+    return result
+
+
+def _run_pipeline(result: AnalysisResult, resolved_source: str, file_path: str):
+    """Lex, parse and analyze *resolved_source*, filling in *result*."""
+    filename = os.path.basename(file_path)
 
     # Lexing
     try:
@@ -85,7 +216,7 @@ def compute_diagnostics(uri: str, source: str) -> AnalysisResult:
         result.tokens = tokens
     except LexerError as e:
         result.diagnostics.append(_make_diagnostic(e.line, e.col, str(e)))
-        return result
+        return
 
     # Parsing
     try:
@@ -94,19 +225,26 @@ def compute_diagnostics(uri: str, source: str) -> AnalysisResult:
         result.ast = program
     except ParseError as e:
         result.diagnostics.append(_make_diagnostic(e.line, e.col, str(e)))
-        return result
+        return
 
-    # Semantic analysis
+    # Semantic analysis.  A fresh Analyzer per run is deliberate: its
+    # constructor only allocates empty tables, and the AnalyzedProgram keeps
+    # references to them, so an instance cannot be reset and reused.
     analyzer = Analyzer()
     analyzed = analyzer.analyze(program)
     result.analyzed = analyzed
 
-    for err_str in analyzed.errors:
-        m = _ANALYZER_ERROR_RE.match(err_str)
-        if m:
-            msg, line_s, col_s = m.group(1), m.group(2), m.group(3)
-            result.diagnostics.append(_make_diagnostic(int(line_s), int(col_s), msg))
-        else:
-            result.diagnostics.append(_make_diagnostic(1, 1, err_str))
+    result.diagnostics.extend([_analyzer_diagnostic(err_str) for err_str in analyzed.errors])
 
-    return result
+
+def _analyzer_diagnostic(err_str: str) -> lsp.Diagnostic:
+    """Convert an analyzer error string ("message at line:col") to a Diagnostic.
+
+    Splits on the last " at " instead of running a regex per error.
+    """
+    msg, sep, pos = err_str.rpartition(" at ")
+    if msg and sep:
+        line_s, sep, col_s = pos.partition(":")
+        if sep and line_s.isdecimal() and col_s.isdecimal():
+            return _make_diagnostic(int(line_s), int(col_s), msg)
+    return _make_diagnostic(1, 1, err_str)
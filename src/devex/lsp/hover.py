@@ -4,6 +4,10 @@ Shows type information when hovering over identifiers, keywords,
 class names, and method calls.
 """
 
+from bisect import bisect_right
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 
 from lsprotocol import types as lsp
 
@@ -26,6 +30,8 @@ from src.compiler.python.ast_nodes import (
     MethodDecl,
     NewExpr,
     ParallelForStmt,
+    Param,
+    Program,
     SwitchStmt,
     TryCatchStmt,
     VarDeclStmt,
@@ -34,13 +40,20 @@ from src.compiler.python.ast_nodes import (
 from src.compiler.python.tokens import Token, TokenType
 from src.devex.lsp.builtins import _MEMBER_TABLES, get_hover_markdown
 from src.devex.lsp.diagnostics import AnalysisResult
-from src.devex.lsp.utils import (
-    body_range,
-    find_token_at_position,
-    find_token_index,
-    resolve_chain_type,
-    type_repr,
-)
+from src.devex.lsp.indexes import get_member_owner, get_token_at_position, get_token_index
+from src.devex.lsp.type_resolution import class_members, resolve_chain_type
+from src.devex.lsp.utils import MEMBER_ACCESS_OPS, body_range, params_repr, type_repr
+
+
+def _cached_markdown(result: AnalysisResult, key: tuple[str, ...], build: Callable[[], str]) -> str:
+    """Return the hover markdown for *key*, building it once per analysis."""
+    cache = result.hover_markdown
+    if cache is None:
+        cache = result.hover_markdown = {}
+    content = cache.get(key)
+    if content is None:
+        content = cache[key] = build()
+    return content
 
 
 def _format_class_info(name: str, info: ClassInfo) -> str:
@@ -63,17 +76,13 @@ def _format_class_info(name: str, info: ClassInfo) -> str:
         lines.append("\n**Methods:**")
         for mname, mdecl in info.methods.items():
             if isinstance(mdecl, MethodDecl):
-                params = ", ".join(
-                    f"{type_repr(p.type)} {p.name}" for p in mdecl.params
-                )
+                params = params_repr(mdecl)
                 ret = type_repr(mdecl.return_type)
                 access = mdecl.access
                 lines.append(f"- `{access} {ret} {mname}({params})`")
 
     if info.constructor and isinstance(info.constructor, MethodDecl):
-        params = ", ".join(
-            f"{type_repr(p.type)} {p.name}" for p in info.constructor.params
-        )
+        params = params_repr(info.constructor)
         lines.append(f"\n**Constructor:** `{name}({params})`")
 
     return "\n".join(lines)
@@ -81,7 +90,7 @@ def _format_class_info(name: str, info: ClassInfo) -> str:
 
 def _format_method_info(class_name: str, method_name: str, mdecl: MethodDecl) -> str:
     """Format hover content for a method."""
-    params = ", ".join(f"{type_repr(p.type)} {p.name}" for p in mdecl.params)
+    params = params_repr(mdecl)
     ret = type_repr(mdecl.return_type)
     access = mdecl.access
     static = " (static)" if access == "class" else ""
@@ -119,21 +128,34 @@ _KEYWORD_DOCS = {
                "the object is destroyed and memory is freed. Sets the variable to NULL.",
 }
 
-# Auto-generate hover docs for types in _MEMBER_TABLES
-for _tn, _members in _MEMBER_TABLES.items():
-    if _tn in _KEYWORD_DOCS:
-        continue
-    _methods = [m.name for m in _members if m.kind == "method"]
-    _fields = [m.name for m in _members if m.kind == "field"]
-    _parts = []
-    if _fields:
-        _parts.append("Fields: " + ", ".join(_fields))
-    if _methods:
-        _preview = _methods[:6]
-        _suffix = ", ..." if len(_methods) > 6 else ""
-        _parts.append("Methods: " + ", ".join(f"{m}()" for m in _preview) + _suffix)
-    _KEYWORD_DOCS[_tn] = f"Built-in type `{_tn}`. " + ". ".join(_parts) + "."
-del _tn, _members, _methods, _fields, _parts, _preview, _suffix
+
+def _type_doc(type_name: str) -> str:
+    """Summarize a built-in type's fields and first few methods."""
+    members = _MEMBER_TABLES[type_name]
+    methods = [m.name for m in members if m.kind == "method"]
+    fields = [m.name for m in members if m.kind == "field"]
+    parts = []
+    if fields:
+        parts.append("Fields: " + ", ".join(fields))
+    if methods:
+        preview = methods[:6]
+        suffix = ", ..." if len(methods) > 6 else ""
+        parts.append("Methods: " + ", ".join(f"{m}()" for m in preview) + suffix)
+    return f"Built-in type `{type_name}`. " + ". ".join(parts) + "."
+
+
+# Keyword docs plus every built-in type name, so a plain identifier is
+# rejected with one probe.  Type docs start as "" and are generated on first
+# hover rather than at import.
+_HOVER_DOCS: dict[str, str] = dict.fromkeys(_MEMBER_TABLES, "") | _KEYWORD_DOCS
+
+
+def _keyword_doc(name: str) -> str | None:
+    """Return the hover doc for a keyword or built-in type."""
+    doc = _HOVER_DOCS.get(name)
+    if doc == "":
+        doc = _HOVER_DOCS[name] = _type_doc(name)
+    return doc
 
 
 def get_hover_info(
@@ -143,7 +165,7 @@ def get_hover_info(
     if not result.tokens:
         return None
 
-    token = find_token_at_position(result.tokens, position)
+    token = get_token_at_position(result, position)
     if token is None:
         return None
 
@@ -152,11 +174,12 @@ def get_hover_info(
 
     # Check if it's a class name
     if token.value in class_table:
-        content = _format_class_info(token.value, class_table[token.value])
+        info = class_table[token.value]
+        content = _cached_markdown(result, ("class", token.value), lambda: _format_class_info(token.value, info))
 
     # Check if it's a keyword/type with documentation
-    elif token.value in _KEYWORD_DOCS:
-        content = f"**`{token.value}`** — {_KEYWORD_DOCS[token.value]}"
+    elif (doc := _keyword_doc(token.value)) is not None:
+        content = f"**`{token.value}`** — {doc}"
 
     # Check if it's a method or field being accessed (look at preceding tokens)
     elif token.type == TokenType.IDENT:
@@ -184,12 +207,12 @@ def _try_member_hover(
     if not result.tokens:
         return None
 
-    token_idx = find_token_index(result.tokens, token)
+    token_idx = get_token_index(result, token)
     if token_idx is None or token_idx < 2:
         return None
 
     prev = result.tokens[token_idx - 1]
-    if prev.value not in (".", "->", "?."):
+    if prev.value not in MEMBER_ACCESS_OPS:
         return None
 
     member_name = token.value
@@ -197,10 +220,7 @@ def _try_member_hover(
     target_type = resolve_chain_type(result, result.tokens, token_idx - 2, class_table)
 
     if target_type is None:
-        for cname, cinfo in class_table.items():
-            if member_name in cinfo.methods or member_name in cinfo.fields:
-                target_type = cname
-                break
+        target_type = get_member_owner(result, member_name)
 
     if target_type is None:
         return None
@@ -210,21 +230,17 @@ def _try_member_hover(
     if builtin_doc:
         return f"{builtin_doc}\nBuilt-in member of `{target_type}`"
 
-    # Look up the member in the target class and its parent chain
-    cname = target_type
-    while cname and cname in class_table:
-        cinfo = class_table[cname]
-        if member_name in cinfo.methods:
-            mdecl = cinfo.methods[member_name]
-            if isinstance(mdecl, MethodDecl):
-                return _format_method_info(cname, member_name, mdecl)
-        if member_name in cinfo.fields:
-            fdecl = cinfo.fields[member_name]
-            if isinstance(fdecl, FieldDecl):
-                return _format_field_info(cname, member_name, fdecl)
-        cname = cinfo.parent
-
-    return None
+    if target_type not in class_table:
+        return None
+    member = class_members(result, target_type).get(member_name)
+    if member is None:
+        return None
+    cname, decl = member
+    if isinstance(decl, MethodDecl):
+        return _cached_markdown(
+            result, ("method", cname, member_name), lambda: _format_method_info(cname, member_name, decl)
+        )
+    return _cached_markdown(result, ("field", cname, member_name), lambda: _format_field_info(cname, member_name, decl))
 
 
 # ---------------------------------------------------------------------------
@@ -244,13 +260,75 @@ def _try_variable_hover(
     name = token.value
     cursor_line = token.line  # 1-based
 
-    for decl in result.ast.declarations:
-        info = _find_var_hover_in_decl(name, cursor_line, decl, class_table)
+    for scope in get_var_index(result):
+        if not (scope.start <= cursor_line <= scope.end):
+            continue
+        info = scope.hover(name, cursor_line, class_table)
         if info:
             return info
     return None
 
 
+# ---------------------------------------------------------------------------
+# Variable index
+# ---------------------------------------------------------------------------
+
+# A variable entry: (line, precedence key, type, label).  The type is either a
+# fixed string or the VarDeclStmt to infer it from.
+_VarEntry = tuple[int, tuple[int, ...], "str | VarDeclStmt", str]
+
+
+@dataclass
+class HoverScope:
+    """The parameters and variables declared inside one function or method.
+
+    Each variable entry carries a precedence key encoding its position in
+    the body: per block, later statements win; per statement, its own
+    declarations win over nested ones, then earlier child blocks win.  Among
+    the entries declared at or before the cursor, the smallest key is the
+    declaration that hover reports.
+    """
+
+    start: int  # 1-based line
+    end: int  # 1-based line (inclusive)
+    context: str  # "Foo.bar" or "bar"
+    params: dict[str, Param] = field(default_factory=dict)
+    # name -> entries sorted by line
+    vars: dict[str, list[_VarEntry]] = field(default_factory=dict)
+
+    def hover(self, name: str, cursor_line: int, class_table: dict[str, ClassInfo]) -> str | None:
+        param = self.params.get(name)
+        if param is not None:
+            return f"```btrc\n{type_repr(param.type)} {name}\n```\nParameter of `{self.context}`"
+        entries = self.vars.get(name)
+        if not entries:
+            return None
+        visible = bisect_right(entries, cursor_line, key=_entry_line)
+        if not visible:
+            return None
+        _, _, var_type, label = min(entries[:visible], key=_entry_key)
+        if isinstance(var_type, VarDeclStmt):
+            var_type = _infer_var_type(var_type, class_table)
+        return f"```btrc\n{var_type} {name}\n```\n{label}"
+
+
+def _entry_line(entry: _VarEntry) -> int:
+    return entry[0]
+
+
+def _entry_key(entry: _VarEntry) -> tuple[int, ...]:
+    return entry[1]
+
+
+def get_var_index(result: AnalysisResult) -> list[HoverScope]:
+    """Return the per-callable variable index for *result*, building it on first use."""
+    index = result.var_index
+    if index is None:
+        index = _build_var_index(result.ast)
+        result.var_index = index
+    return index
+
+
 def _member_scope_end(decl: ClassDecl, member_idx: int) -> int:
     """Compute the scope end for a class member."""
     members = decl.members
@@ -261,185 +339,112 @@ def _member_scope_end(decl: ClassDecl, member_idx: int) -> int:
     return getattr(members[member_idx], "line", 0) + 500
 
 
-def _find_var_hover_in_decl(
-    name: str,
-    cursor_line: int,
-    decl,
-    class_table: dict[str, ClassInfo],
-) -> str | None:
-    """Search a top-level declaration for a variable/param matching *name*."""
-    if isinstance(decl, ClassDecl):
-        for i, member in enumerate(decl.members):
-            if isinstance(member, MethodDecl):
-                scope_end = _member_scope_end(decl, i)
-                info = _check_callable(
-                    name, cursor_line, member, decl.name, class_table, scope_end
-                )
-                if info:
-                    return info
-    elif isinstance(decl, FunctionDecl):
-        return _check_callable(name, cursor_line, decl, None, class_table)
-    return None
+def _build_var_index(ast: Program) -> list[HoverScope]:
+    """Index every function and method in declaration order."""
+    scopes = []
+    for decl in ast.declarations:
+        if isinstance(decl, ClassDecl):
+            for i, member in enumerate(decl.members):
+                if isinstance(member, MethodDecl):
+                    scope_end = _member_scope_end(decl, i)
+                    scopes.append(_index_callable(member, f"{decl.name}.{member.name}", scope_end))
+        elif isinstance(decl, FunctionDecl):
+            _, scope_end = body_range(decl.body, decl.line)
+            scopes.append(_index_callable(decl, decl.name, scope_end))
+    return scopes
 
 
-def _check_callable(
-    name: str,
-    cursor_line: int,
-    node,
-    class_name: str | None,
-    class_table: dict[str, ClassInfo],
-    scope_end_override: int | None = None,
-) -> str | None:
-    """Check parameters and body of a function/method for *name*."""
-    if not isinstance(node, (FunctionDecl, MethodDecl)):
-        return None
+def _index_callable(node: FunctionDecl | MethodDecl, context: str, scope_end: int) -> HoverScope:
+    scope = HoverScope(start=node.line, end=scope_end, context=context)
+    for p in node.params:
+        scope.params.setdefault(p.name, p)
+    if node.body:
+        stack = [(stmt, (-i,)) for i, stmt in enumerate(node.body.statements)]
+        get_handler = _INDEX_HANDLERS.get
+        while stack:
+            stmt, key = stack.pop()
+            handler = get_handler(type(stmt))
+            if handler is not None:
+                handler(scope, stmt, key, stack)
+        for entries in scope.vars.values():
+            entries.sort(key=_entry_line)
+    return scope
 
-    scope_start = node.line
-    if scope_end_override is not None:
-        scope_end = scope_end_override
-    else:
-        _, scope_end = body_range(node.body, node.line)
 
-    if not (scope_start <= cursor_line <= scope_end):
-        return None
+def _add_entry(scope: HoverScope, name: str, line: int, key: tuple[int, ...], var_type, label: str):
+    scope.vars.setdefault(name, []).append((line, key, var_type, label))
 
-    for p in node.params:
-        if p.name == name:
-            type_str = type_repr(p.type)
-            ctx = (
-                f"Parameter of `{class_name}.{node.name}`"
-                if class_name
-                else f"Parameter of `{node.name}`"
-            )
-            return f"```btrc\n{type_str} {name}\n```\n{ctx}"
 
-    if node.body:
-        return _scan_block_for_var(
-            name, cursor_line, node.body, class_name, node.name, class_table
-        )
-    return None
+def _push_block(stack: list, block: Block | None, key: tuple[int, ...]):
+    if block:
+        stack.extend((stmt, (*key, -i)) for i, stmt in enumerate(block.statements))
 
 
-def _scan_block_for_var(
-    name: str,
-    cursor_line: int,
-    block: Block,
-    class_name: str | None,
-    func_name: str,
-    class_table: dict[str, ClassInfo],
-) -> str | None:
-    """Scan statements in a block for a variable declaration matching *name*."""
-    best: str | None = None
-    for stmt in block.statements:
-        result = _check_stmt_for_var(
-            name, cursor_line, stmt, class_name, func_name, class_table
-        )
-        if result:
-            best = result
-    return best
+def _index_var_decl(scope: HoverScope, stmt: VarDeclStmt, key: tuple[int, ...], stack: list):
+    _add_entry(scope, stmt.name, stmt.line, (*key, -1), stmt, "Local variable")
 
 
-def _check_stmt_for_var(
-    name: str,
-    cursor_line: int,
-    stmt,
-    class_name: str | None,
-    func_name: str,
-    class_table: dict[str, ClassInfo],
-) -> str | None:
-    """Check a single statement for a variable declaration."""
-    if isinstance(stmt, VarDeclStmt):
-        if stmt.name == name and stmt.line <= cursor_line:
-            type_str = _infer_var_type(stmt, class_table)
-            return f"```btrc\n{type_str} {name}\n```\nLocal variable"
-
-    elif isinstance(stmt, ForInStmt):
-        if stmt.line <= cursor_line:
-            if stmt.var_name == name:
-                return f"```btrc\nvar {name}\n```\nLoop variable"
-            if stmt.var_name2 == name:
-                return f"```btrc\nvar {name}\n```\nLoop variable (key)"
-        if stmt.body:
-            r = _scan_block_for_var(
-                name, cursor_line, stmt.body, class_name, func_name, class_table
-            )
-            if r:
-                return r
-
-    elif isinstance(stmt, ParallelForStmt):
-        if stmt.var_name == name and stmt.line <= cursor_line:
-            return f"```btrc\nvar {name}\n```\nParallel loop variable"
-        if stmt.body:
-            r = _scan_block_for_var(
-                name, cursor_line, stmt.body, class_name, func_name, class_table
-            )
-            if r:
-                return r
-
-    elif isinstance(stmt, CForStmt):
-        if isinstance(stmt.init, ForInitVar):
-            var_decl = stmt.init.var_decl
-            if isinstance(var_decl, VarDeclStmt):
-                if var_decl.name == name and var_decl.line <= cursor_line:
-                    type_str = _infer_var_type(var_decl, class_table)
-                    return f"```btrc\n{type_str} {name}\n```\nLoop variable"
-        if stmt.body:
-            r = _scan_block_for_var(
-                name, cursor_line, stmt.body, class_name, func_name, class_table
-            )
-            if r:
-                return r
-
-    elif isinstance(stmt, TryCatchStmt):
-        if stmt.catch_var == name and stmt.line <= cursor_line:
-            return f"```btrc\nstring {name}\n```\nCatch variable"
-        for block in (stmt.try_block, stmt.catch_block):
-            if block:
-                r = _scan_block_for_var(
-                    name, cursor_line, block, class_name, func_name, class_table
-                )
-                if r:
-                    return r
-
-    elif isinstance(stmt, IfStmt):
-        if stmt.then_block:
-            r = _scan_block_for_var(
-                name, cursor_line, stmt.then_block, class_name, func_name, class_table
-            )
-            if r:
-                return r
-        if isinstance(stmt.else_block, ElseBlock) and stmt.else_block.body:
-            r = _scan_block_for_var(
-                name, cursor_line, stmt.else_block.body, class_name, func_name, class_table
-            )
-            if r:
-                return r
-        elif isinstance(stmt.else_block, ElseIf) and stmt.else_block.if_stmt:
-            r = _check_stmt_for_var(
-                name, cursor_line, stmt.else_block.if_stmt, class_name, func_name, class_table
-            )
-            if r:
-                return r
-
-    elif isinstance(stmt, (WhileStmt, DoWhileStmt)):
-        if stmt.body:
-            r = _scan_block_for_var(
-                name, cursor_line, stmt.body, class_name, func_name, class_table
-            )
-            if r:
-                return r
-
-    elif isinstance(stmt, SwitchStmt):
-        for case in stmt.cases:
-            if isinstance(case, CaseClause):
-                for s in case.body:
-                    r = _check_stmt_for_var(
-                        name, cursor_line, s, class_name, func_name, class_table
-                    )
-                    if r:
-                        return r
+def _index_for_in(scope: HoverScope, stmt: ForInStmt, key: tuple[int, ...], stack: list):
+    if stmt.var_name:
+        _add_entry(scope, stmt.var_name, stmt.line, (*key, -2), "var", "Loop variable")
+    if stmt.var_name2:
+        _add_entry(scope, stmt.var_name2, stmt.line, (*key, -1), "var", "Loop variable (key)")
+    _push_block(stack, stmt.body, (*key, 0))
 
-    return None
+
+def _index_parallel_for(scope: HoverScope, stmt: ParallelForStmt, key: tuple[int, ...], stack: list):
+    if stmt.var_name:
+        _add_entry(scope, stmt.var_name, stmt.line, (*key, -1), "var", "Parallel loop variable")
+    _push_block(stack, stmt.body, (*key, 0))
+
+
+def _index_c_for(scope: HoverScope, stmt: CForStmt, key: tuple[int, ...], stack: list):
+    if isinstance(stmt.init, ForInitVar):
+        var_decl = stmt.init.var_decl
+        if isinstance(var_decl, VarDeclStmt):
+            _add_entry(scope, var_decl.name, var_decl.line, (*key, -1), var_decl, "Loop variable")
+    _push_block(stack, stmt.body, (*key, 0))
+
+
+def _index_try_catch(scope: HoverScope, stmt: TryCatchStmt, key: tuple[int, ...], stack: list):
+    if stmt.catch_var:
+        _add_entry(scope, stmt.catch_var, stmt.line, (*key, -1), "string", "Catch variable")
+    _push_block(stack, stmt.try_block, (*key, 0))
+    _push_block(stack, stmt.catch_block, (*key, 1))
+
+
+def _index_if(scope: HoverScope, stmt: IfStmt, key: tuple[int, ...], stack: list):
+    _push_block(stack, stmt.then_block, (*key, 0))
+    if isinstance(stmt.else_block, ElseBlock):
+        _push_block(stack, stmt.else_block.body, (*key, 1))
+    elif isinstance(stmt.else_block, ElseIf) and stmt.else_block.if_stmt:
+        stack.append((stmt.else_block.if_stmt, (*key, 1)))
+
+
+def _index_loop_body(scope: HoverScope, stmt: WhileStmt | DoWhileStmt, key: tuple[int, ...], stack: list):
+    _push_block(stack, stmt.body, (*key, 0))
+
+
+def _index_switch(scope: HoverScope, stmt: SwitchStmt, key: tuple[int, ...], stack: list):
+    # Case bodies are searched in order and the first hit wins
+    case_stmts = (s for case in stmt.cases if isinstance(case, CaseClause) for s in case.body)
+    stack.extend((s, (*key, k)) for k, s in enumerate(case_stmts))
+
+
+# Statement type -> indexer.  Each records the statement's own declarations
+# and queues its nested statements; own declarations get negative key
+# components so they outrank children, numbered from 0 in source order.
+_INDEX_HANDLERS: dict[type, Callable[[HoverScope, Any, tuple[int, ...], list], None]] = {
+    VarDeclStmt: _index_var_decl,
+    ForInStmt: _index_for_in,
+    ParallelForStmt: _index_parallel_for,
+    CForStmt: _index_c_for,
+    TryCatchStmt: _index_try_catch,
+    IfStmt: _index_if,
+    WhileStmt: _index_loop_body,
+    DoWhileStmt: _index_loop_body,
+    SwitchStmt: _index_switch,
+}
 
 
 def _infer_var_type(stmt: VarDeclStmt, class_table: dict[str, ClassInfo]) -> str:
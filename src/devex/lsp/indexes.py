@@ -0,0 +1,244 @@
+"""Per-analysis lookup indexes for the btrc LSP feature modules.
+
+Each helper builds its index from an AnalysisResult on first use and keeps
+it in one of the result's lazy cache fields, so later requests against the
+same analysis only pay for the lookup.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+
+from lsprotocol import types as lsp
+
+from src.compiler.python.tokens import Token, TokenType
+from src.devex.lsp.diagnostics import AnalysisResult
+
+# ---------------------------------------------------------------------------
+# Tokens
+# ---------------------------------------------------------------------------
+
+
+def get_token_at_position(result: AnalysisResult, position: lsp.Position) -> Token | None:
+    """Return the token covering the 0-based LSP *position*, scanning only its line.
+
+    Tokens are grouped by line once per analysis.  The token list is not
+    position-sorted (tokens from #included files come first, with their own
+    line numbers), so each line keeps list order and the first covering
+    token in list order wins.
+    """
+    lines = result.token_lines
+    if lines is None:
+        lines = {}
+        for tok in result.tokens or ():
+            if tok.type != TokenType.EOF:
+                lines.setdefault(tok.line, []).append(tok)
+        result.token_lines = lines
+    target_col = position.character + 1
+    for tok in lines.get(position.line + 1, ()):
+        if tok.col <= target_col < tok.col + len(tok.value):
+            return tok
+    return None
+
+
+def get_token_index(result: AnalysisResult, token: Token) -> int | None:
+    """Return *token*'s index in result.tokens via a map built once per analysis."""
+    index = result.token_index
+    if index is None:
+        index = {id(t): i for i, t in enumerate(result.tokens or ())}
+        result.token_index = index
+    return index.get(id(token))
+
+
+def get_ident_indices(result: AnalysisResult, name: str) -> list[int]:
+    """Return the indices in result.tokens of identifier tokens spelled *name*.
+
+    All identifiers are bucketed by name once per analysis; callers must not
+    mutate the returned list.
+    """
+    index = result.ident_index
+    if index is None:
+        index = {}
+        for i, tok in enumerate(result.tokens or ()):
+            if tok.type == TokenType.IDENT:
+                bucket = index.get(tok.value)
+                if bucket is None:
+                    index[tok.value] = [i]
+                else:
+                    bucket.append(i)
+        result.ident_index = index
+    return index.get(name, [])
+
+
+# ---------------------------------------------------------------------------
+# Classes
+# ---------------------------------------------------------------------------
+
+_NO_SUBCLASSES: frozenset[str] = frozenset()
+
+
+def get_subclasses(result: AnalysisResult, class_name: str) -> set[str] | frozenset[str]:
+    """Return the names of all classes that inherit, directly or not, from *class_name*.
+
+    The table is built once per analysis by walking each class's parent
+    chain; callers must not mutate the returned set.
+    """
+    index = result.subclass_index
+    if index is None:
+        index = {}
+        class_table = result.analyzed.class_table if result.analyzed else {}
+        for cname, cinfo in class_table.items():
+            seen: set[str] = set()
+            parent = cinfo.parent
+            while parent and parent not in seen:
+                seen.add(parent)
+                index.setdefault(parent, set()).add(cname)
+                parent = class_table[parent].parent if parent in class_table else None
+        result.subclass_index = index
+    return index.get(class_name, _NO_SUBCLASSES)
+
+
+def get_member_owner(result: AnalysisResult, member_name: str) -> str | None:
+    """Return the first class (in class-table order) with a method or field *member_name*.
+
+    Used as a best guess when the receiver type of a member access cannot be
+    resolved; the reverse index is built once per analysis.
+    """
+    index = result.member_index
+    if index is None:
+        index = {}
+        class_table = result.analyzed.class_table if result.analyzed else {}
+        for cname, cinfo in class_table.items():
+            for name in cinfo.methods:
+                index.setdefault(name, cname)
+            for name in cinfo.fields:
+                index.setdefault(name, cname)
+        result.member_index = index
+    return index.get(member_name)
+
+
+# ---------------------------------------------------------------------------
+# Source text
+# ---------------------------------------------------------------------------
+
+
+def get_source_lines(result: AnalysisResult) -> list[str]:
+    """Return the document's lines, splitting the source once per analysis."""
+    lines = result.source_lines
+    if lines is None:
+        lines = result.source.split("\n")
+        result.source_lines = lines
+    return lines
+
+
+def get_offset(result: AnalysisResult, position: lsp.Position) -> int | None:
+    """Return the source offset of *position*, or None if its line does not exist.
+
+    The character is clamped to the line's length.  Line start offsets are
+    computed once per analysis.
+    """
+    lines = get_source_lines(result)
+    if not 0 <= position.line < len(lines):
+        return None
+    offsets = result.line_offsets
+    if offsets is None:
+        offsets = list(accumulate((len(line) + 1 for line in lines[:-1]), initial=0))
+        result.line_offsets = offsets
+    return offsets[position.line] + min(position.character, len(lines[position.line]))
+
+
+# ---------------------------------------------------------------------------
+# Braces
+# ---------------------------------------------------------------------------
+
+# A brace, or a literal/comment whose braces must not count (matched whole so it is skipped).
+# An unterminated triple-quoted string or block comment, usually one being typed,
+# only covers the rest of its line, so the braces after it still count.
+_BRACE_RE = re.compile(
+    r'"""(?:(?:\\.|[^\\])*?"""|[^\n]*)'  # triple-quoted string
+    r'|"(?:\\.|[^"\\\n])*"?'  # string, up to its end quote or the end of the line
+    r"|'(?:\\.|[^'\\\n])*'?"  # char literal
+    r"|//[^\n]*"
+    r"|/\*(?:.*?\*/|[^\n]*)"
+    r"|[{}]",
+    re.DOTALL,
+)
+
+
+@dataclass(slots=True)
+class BraceIndex:
+    """Every "{" and "}" of a document in order, for closing-brace queries.
+
+    Braces inside string and char literals and comments are not counted.
+    """
+
+    lines: list[int]  # 0-based line of each brace
+    depths: list[int]  # nesting depth after each brace
+    # index of the first "{" at or after each brace; len(lines) if none
+    next_open: list[int]
+    # depth after a "}" -> indices of the "}" braces that end at that depth
+    closes: dict[int, list[int]]
+
+    @classmethod
+    def build(cls, source: str) -> BraceIndex:
+        lines: list[int] = []
+        depths: list[int] = []
+        is_open: list[bool] = []
+        closes: dict[int, list[int]] = {}
+        depth = 0
+        line = 0
+        pos = 0
+        for m in _BRACE_RE.finditer(source):
+            brace = m.group()
+            if brace == "{":
+                depth += 1
+            elif brace == "}":
+                depth -= 1
+                closes.setdefault(depth, []).append(len(lines))
+            else:
+                continue
+            start = m.start()
+            line += source.count("\n", pos, start)
+            pos = start
+            lines.append(line)
+            depths.append(depth)
+            is_open.append(brace == "{")
+        next_open = [len(lines)] * (len(lines) + 1)
+        for k in range(len(lines) - 1, -1, -1):
+            next_open[k] = k if is_open[k] else next_open[k + 1]
+        return cls(lines, depths, next_open, closes)
+
+    def closing_line(self, start_line: int) -> int | None:
+        """Find the line of the "}" matching the first "{" at or after *start_line*.
+
+        A "}" before that "{" on the same line, as in "} else {", closes an
+        earlier block and does not count.
+        """
+        first = bisect_left(self.lines, start_line)
+        opened = self.next_open[first]
+        if opened == len(self.lines):
+            return None
+        # depth just outside that "{"
+        base = self.depths[opened] - 1
+        closes = self.closes.get(base)
+        if not closes:
+            return None
+        k = bisect_right(closes, opened)
+        if k == len(closes):
+            return None
+        return self.lines[closes[k]]
+
+
+def get_closing_brace_line(result: AnalysisResult, start_line: int) -> int | None:
+    """Find the 0-based line of the brace closing the first "{" from *start_line* on.
+
+    Brace positions are indexed once per analysis, so each query is a pair
+    of binary searches.
+    """
+    index = result.brace_index
+    if index is None:
+        index = result.brace_index = BraceIndex.build(result.source)
+    return index.closing_line(start_line)
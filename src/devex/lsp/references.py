@@ -10,13 +10,18 @@ Supports finding references for:
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 from lsprotocol import types as lsp
 
 from src.compiler.python.analyzer.core import ClassInfo
-from src.compiler.python.tokens import Token, TokenType
-from src.devex.lsp.definition import DefinitionMap, _resolve_object_class
+from src.compiler.python.ast_nodes import MethodDecl
+from src.compiler.python.tokens import KEYWORDS, Token, TokenType
+from src.devex.lsp.definition import DefinitionMap, _resolve_object_class, get_definition_map
 from src.devex.lsp.diagnostics import AnalysisResult
-from src.devex.lsp.utils import find_token_at_position, find_token_index
+from src.devex.lsp.indexes import get_ident_indices, get_subclasses, get_token_at_position, get_token_index
+from src.devex.lsp.type_resolution import class_members
+from src.devex.lsp.utils import MEMBER_ACCESS_OPS
 
 # ---------------------------------------------------------------------------
 # Reference collection
@@ -24,18 +29,26 @@ from src.devex.lsp.utils import find_token_at_position, find_token_index
 
 
 def _collect_all_tokens_matching(
-    tokens: list[Token],
+    result: AnalysisResult,
     name: str,
 ) -> list[Token]:
     """Find all identifier tokens with the given name."""
-    return [tok for tok in tokens if tok.type == TokenType.IDENT and tok.value == name]
+    tokens = result.tokens
+    return [tokens[i] for i in get_ident_indices(result, name)]
+
+
+def _iter_matching_with_index(result: AnalysisResult, name: str) -> Iterator[tuple[int, Token]]:
+    """Yield (index, token) for every identifier token with the given name."""
+    tokens = result.tokens
+    for i in get_ident_indices(result, name):
+        yield i, tokens[i]
 
 
-def _btrc_to_lsp_location(uri: str, line: int, col: int, name_len: int) -> lsp.Location:
-    """Create an LSP Location from btrc 1-based line/col with end column."""
+def _btrc_to_lsp_range(line: int, col: int, name_len: int) -> lsp.Range:
+    """Create an LSP Range from btrc 1-based line/col spanning *name_len* characters."""
     start = lsp.Position(line=max(0, line - 1), character=max(0, col - 1))
     end = lsp.Position(line=max(0, line - 1), character=max(0, col - 1 + name_len))
-    return lsp.Location(uri=uri, range=lsp.Range(start=start, end=end))
+    return lsp.Range(start=start, end=end)
 
 
 # ---------------------------------------------------------------------------
@@ -58,28 +71,18 @@ def _classify_symbol(
     name = token.value
 
     # Check if it's a member access: preceded by . or -> or ?.
-    token_idx = find_token_index(tokens, token)
+    token_idx = get_token_index(result, token)
     if token_idx is not None and token_idx >= 2:
         prev = tokens[token_idx - 1]
-        if prev.value in (".", "->", "?."):
+        if prev.value in MEMBER_ACCESS_OPS:
             obj_token = tokens[token_idx - 2]
             target_class = _resolve_object_class(obj_token, result, class_table)
-            if target_class:
-                cinfo = class_table.get(target_class)
-                if cinfo:
-                    if name in cinfo.methods:
-                        return ("method", target_class, name)
-                    if name in cinfo.fields:
-                        return ("field", target_class, name)
-                    # Check parent chain
-                    parent = cinfo.parent
-                    while parent and parent in class_table:
-                        pc = class_table[parent]
-                        if name in pc.methods:
-                            return ("method", parent, name)
-                        if name in pc.fields:
-                            return ("field", parent, name)
-                        parent = pc.parent
+            if target_class in class_table:
+                # Nearest declaring class in the parent chain
+                member = class_members(result, target_class).get(name)
+                if member is not None:
+                    owner, decl = member
+                    return ("method" if isinstance(decl, MethodDecl) else "field", owner, name)
 
     # Check class name
     if name in dmap.class_defs:
@@ -100,13 +103,13 @@ def _classify_symbol(
 
 def _find_class_references(
     name: str,
-    tokens: list[Token],
+    result: AnalysisResult,
     dmap: DefinitionMap,
     include_declaration: bool,
 ) -> list[tuple[int, int]]:
     """Find all references to a class name."""
     refs = []
-    matching = _collect_all_tokens_matching(tokens, name)
+    matching = _collect_all_tokens_matching(result, name)
     def_loc = dmap.class_defs.get(name)
 
     for tok in matching:
@@ -119,13 +122,13 @@ def _find_class_references(
 
 def _find_function_references(
     name: str,
-    tokens: list[Token],
+    result: AnalysisResult,
     dmap: DefinitionMap,
     include_declaration: bool,
 ) -> list[tuple[int, int]]:
     """Find all references to a function name."""
     refs = []
-    matching = _collect_all_tokens_matching(tokens, name)
+    matching = _collect_all_tokens_matching(result, name)
     def_loc = dmap.function_defs.get(name)
 
     for tok in matching:
@@ -140,7 +143,6 @@ def _find_member_references(
     class_name: str,
     member_name: str,
     kind: str,  # 'method' or 'field'
-    tokens: list[Token],
     result: AnalysisResult,
     class_table: dict[str, ClassInfo],
     dmap: DefinitionMap,
@@ -160,20 +162,12 @@ def _find_member_references(
         refs.append(def_loc)
 
     # Collect all classes that have this member (including subclasses that inherit it)
-    valid_classes = {class_name}
-    for cname, cinfo in class_table.items():
-        parent = cinfo.parent
-        while parent:
-            if parent == class_name:
-                valid_classes.add(cname)
-                break
-            parent = class_table[parent].parent if parent in class_table else None
+    valid_classes = get_subclasses(result, class_name) | {class_name}
 
     # Find all tokens that match member_name preceded by . or -> or ?.
-    matching = _collect_all_tokens_matching(tokens, member_name)
-    for tok in matching:
-        tok_idx = find_token_index(tokens, tok)
-        if tok_idx is None or tok_idx < 2:
+    tokens = result.tokens
+    for tok_idx, tok in _iter_matching_with_index(result, member_name):
+        if tok_idx < 2:
             continue
 
         loc = (tok.line, tok.col)
@@ -181,7 +175,7 @@ def _find_member_references(
             continue
 
         prev = tokens[tok_idx - 1]
-        if prev.value not in (".", "->", "?."):
+        if prev.value not in MEMBER_ACCESS_OPS:
             continue
 
         obj_token = tokens[tok_idx - 2]
@@ -197,7 +191,7 @@ def _find_member_references(
 
 def _find_variable_references(
     name: str,
-    tokens: list[Token],
+    result: AnalysisResult,
 ) -> list[tuple[int, int]]:
     """Find all references to a variable name.
 
@@ -205,13 +199,11 @@ def _find_variable_references(
     Filter out those that follow . or -> (those are member accesses, not variable refs).
     """
     refs = []
-    matching = _collect_all_tokens_matching(tokens, name)
-
-    for tok in matching:
-        tok_idx = find_token_index(tokens, tok)
-        if tok_idx is not None and tok_idx >= 1:
+    tokens = result.tokens
+    for tok_idx, tok in _iter_matching_with_index(result, name):
+        if tok_idx >= 1:
             prev = tokens[tok_idx - 1]
-            if prev.value in (".", "->", "?."):
+            if prev.value in MEMBER_ACCESS_OPS:
                 continue  # member access, not a variable reference
         refs.append((tok.line, tok.col))
 
@@ -232,12 +224,25 @@ def get_references(
     if not result.tokens or not result.ast:
         return []
 
-    token = find_token_at_position(result.tokens, position)
+    token = get_token_at_position(result, position)
     if token is None or token.type != TokenType.IDENT:
         return []
 
+    name_len = len(token.value)
+    return [
+        lsp.Location(uri=result.uri, range=_btrc_to_lsp_range(line, col, name_len))
+        for line, col in _reference_positions(result, token, include_declaration)
+    ]
+
+
+def _reference_positions(
+    result: AnalysisResult,
+    token: Token,
+    include_declaration: bool,
+) -> list[tuple[int, int]]:
+    """Return the 1-based (line, col) of every reference to identifier *token*."""
     class_table = result.analyzed.class_table if result.analyzed else {}
-    dmap = DefinitionMap.from_ast(result.ast)
+    dmap = get_definition_map(result)
     name = token.value
 
     kind, class_name, member_name = _classify_symbol(
@@ -245,26 +250,23 @@ def get_references(
     )
 
     if kind == "class":
-        locs = _find_class_references(name, result.tokens, dmap, include_declaration)
+        locs = _find_class_references(name, result, dmap, include_declaration)
     elif kind == "function":
-        locs = _find_function_references(name, result.tokens, dmap, include_declaration)
+        locs = _find_function_references(name, result, dmap, include_declaration)
     elif kind in ("method", "field"):
         locs = _find_member_references(
             class_name,
             member_name,
             kind,
-            result.tokens,
             result,
             class_table,
             dmap,
             include_declaration,
         )
     else:
-        locs = _find_variable_references(name, result.tokens)
+        locs = _find_variable_references(name, result)
 
-    return [
-        _btrc_to_lsp_location(result.uri, line, col, len(name)) for line, col in locs
-    ]
+    return locs
 
 
 def get_rename_edits(
@@ -272,34 +274,89 @@ def get_rename_edits(
     position: lsp.Position,
     new_name: str,
 ) -> lsp.WorkspaceEdit | None:
-    """Return workspace edits to rename the symbol at position."""
+    """Return workspace edits to rename the symbol at position.
+
+    Raises ValueError when *new_name* is not an identifier rename may introduce.
+    """
     if not result.tokens or not result.ast:
         return None
 
-    token = find_token_at_position(result.tokens, position)
+    token = get_token_at_position(result, position)
     if token is None or token.type != TokenType.IDENT:
         return None
 
+    # Nothing to do for a no-op rename, and never produce broken code
+    if new_name == token.value:
+        return None
+    _check_new_name(new_name)
+
     # Get all references including the declaration
-    locations = get_references(result, position, include_declaration=True)
-    if not locations:
+    positions = _reference_positions(result, token, include_declaration=True)
+    if not positions:
         return None
 
-    old_name = token.value
-    changes: list[lsp.TextEdit] = []
-    for loc in locations:
-        edit_range = lsp.Range(
-            start=loc.range.start,
-            end=lsp.Position(
-                line=loc.range.start.line,
-                character=loc.range.start.character + len(old_name),
-            ),
-        )
-        changes.append(lsp.TextEdit(range=edit_range, new_text=new_name))
+    name_len = len(token.value)
+    changes = [
+        lsp.TextEdit(range=_btrc_to_lsp_range(line, col, name_len), new_text=new_name)
+        for line, col in positions
+    ]
 
     return lsp.WorkspaceEdit(changes={result.uri: changes})
 
 
+# Names that prepare_rename refuses: keywords and built-in types
+_RENAME_KEYWORDS = frozenset({
+    "if",
+    "else",
+    "while",
+    "for",
+    "in",
+    "return",
+    "class",
+    "public",
+    "private",
+    "void",
+    "int",
+    "float",
+    "double",
+    "string",
+    "bool",
+    "char",
+    "true",
+    "false",
+    "null",
+    "new",
+    "delete",
+    "self",
+    "break",
+    "continue",
+    "switch",
+    "case",
+    "default",
+    "try",
+    "catch",
+    "throw",
+    "do",
+    "List",
+    "Map",
+    "Set",
+})
+
+
+def _check_new_name(new_name: str) -> None:
+    """Raise ValueError unless *new_name* is a plain btrc identifier.
+
+    Mirrors the lexer: a letter or "_", then letters, digits or "_".  Keywords
+    and the built-in type names prepare_rename refuses are rejected too.
+    """
+    if not new_name or not (new_name[0].isalpha() or new_name[0] == "_"):
+        raise ValueError(f"'{new_name}' is not a valid identifier: it must start with a letter or '_'")
+    if not all(c.isalnum() or c == "_" for c in new_name):
+        raise ValueError(f"'{new_name}' is not a valid identifier: use only letters, digits and '_'")
+    if new_name in KEYWORDS or new_name in _RENAME_KEYWORDS:
+        raise ValueError(f"'{new_name}' is a reserved name")
+
+
 def prepare_rename(
     result: AnalysisResult,
     position: lsp.Position,
@@ -308,52 +365,12 @@ def prepare_rename(
     if not result.tokens:
         return None
 
-    token = find_token_at_position(result.tokens, position)
+    token = get_token_at_position(result, position)
     if token is None or token.type != TokenType.IDENT:
         return None
 
     # Don't allow renaming keywords or built-in types
-    keywords = {
-        "if",
-        "else",
-        "while",
-        "for",
-        "in",
-        "return",
-        "class",
-        "public",
-        "private",
-        "void",
-        "int",
-        "float",
-        "double",
-        "string",
-        "bool",
-        "char",
-        "true",
-        "false",
-        "null",
-        "new",
-        "delete",
-        "self",
-        "break",
-        "continue",
-        "switch",
-        "case",
-        "default",
-        "try",
-        "catch",
-        "throw",
-        "do",
-        "List",
-        "Map",
-        "Set",
-    }
-    if token.value in keywords:
+    if token.value in _RENAME_KEYWORDS:
         return None
 
-    start = lsp.Position(line=max(0, token.line - 1), character=max(0, token.col - 1))
-    end = lsp.Position(
-        line=max(0, token.line - 1), character=max(0, token.col - 1 + len(token.value))
-    )
-    return lsp.Range(start=start, end=end)
+    return _btrc_to_lsp_range(token.line, token.col, len(token.value))
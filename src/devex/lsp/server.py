@@ -6,6 +6,7 @@ signature help for .btrc files by reusing the compiler's lexer, parser,
 and analyzer.
 """
 
+import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -16,11 +17,12 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from lsprotocol import types as lsp
+from pygls.exceptions import JsonRpcInvalidParams
 from pygls.lsp.server import LanguageServer
 
 from src.devex.lsp.completion import get_completions
 from src.devex.lsp.definition import get_definition
-from src.devex.lsp.diagnostics import AnalysisResult, compute_diagnostics
+from src.devex.lsp.diagnostics import AnalysisResult, compute_diagnostics, invalidate
 from src.devex.lsp.hover import get_hover_info
 from src.devex.lsp.references import get_references, get_rename_edits, prepare_rename
 from src.devex.lsp.semantic_tokens import LEGEND, get_semantic_tokens
@@ -38,6 +40,14 @@ _analysis_cache: dict[str, AnalysisResult] = {}
 # Cache: uri -> AnalysisResult (last successful analysis with AST + class_table)
 _good_analysis_cache: dict[str, AnalysisResult] = {}
 
+# uri -> scheduled re-analysis; a burst of didChange notifications only
+# analyzes the text after the last one
+_pending_validations: dict[str, asyncio.Task] = {}
+_DEBOUNCE_SECONDS = 0.1
+
+# uri -> (analysis, the same analysis over the live buffer text), see _get_live_result()
+_live_result_cache: dict[str, tuple[AnalysisResult, AnalysisResult]] = {}
+
 
 def _validate_document(uri: str, source: str):
     """Run the compiler pipeline and publish diagnostics."""
@@ -51,14 +61,43 @@ def _validate_document(uri: str, source: str):
     )
 
 
+async def _validate_after_delay(uri: str):
+    await asyncio.sleep(_DEBOUNCE_SECONDS)
+    del _pending_validations[uri]
+    doc = server.workspace.get_text_document(uri)
+    # Nothing awaits this task, so log failures here rather than losing them
+    try:
+        _validate_document(uri, doc.source)
+    except Exception:
+        logger.exception("Validation of %s failed", uri)
+
+
+def _cancel_pending_validation(uri: str) -> bool:
+    """Cancel a scheduled re-analysis of *uri*; return whether one was pending."""
+    task = _pending_validations.pop(uri, None)
+    if task is None:
+        return False
+    task.cancel()
+    return True
+
+
+def _flush_pending_validation(uri: str):
+    """Run a scheduled re-analysis of *uri* now, so a request sees the latest text."""
+    if _cancel_pending_validation(uri):
+        doc = server.workspace.get_text_document(uri)
+        _validate_document(uri, doc.source)
+
+
 def _get_best_result(uri: str) -> AnalysisResult | None:
     """Return the best available analysis for *uri*.
 
     Prefers the current (possibly broken) analysis when it has a valid AST.
     Falls back to the last successful analysis so that features like
     go-to-definition, hover, and find-references keep working while the
-    user is typing and the file has transient parse errors.
+    user is typing and the file has transient parse errors.  A re-analysis
+    still waiting out the didChange debounce runs first.
     """
+    _flush_pending_validation(uri)
     result = _analysis_cache.get(uri)
     if result and result.ast and result.analyzed:
         return result
@@ -68,6 +107,45 @@ def _get_best_result(uri: str) -> AnalysisResult | None:
     return result  # may still have tokens even without AST
 
 
+def _get_live_result(uri: str) -> AnalysisResult | None:
+    """Return the best analysis for *uri* over the live buffer text.
+
+    Completion and signature help read the text around the cursor, which must
+    come from the buffer even when the latest analysis failed and the last
+    successful one answers instead.  That combined result is cached per
+    analysis and text, so its lazy indexes survive repeated requests.
+    """
+    _flush_pending_validation(uri)
+    doc = server.workspace.get_text_document(uri)
+    current_source = doc.source if doc else None
+
+    # Prefer the current analysis result, but fall back to the last good one
+    # when the current source has parse errors (common while typing)
+    result = _analysis_cache.get(uri)
+    if result and not result.analyzed:
+        result = _good_analysis_cache.get(uri) or result
+
+    if not result and current_source:
+        result = compute_diagnostics(uri, current_source)
+        _analysis_cache[uri] = result
+
+    if not result or not current_source or result.source == current_source:
+        return result
+    cached = _live_result_cache.get(uri)
+    if cached and cached[0] is result and cached[1].source == current_source:
+        return cached[1]
+    live = AnalysisResult(
+        uri=result.uri,
+        source=current_source,
+        diagnostics=result.diagnostics,
+        tokens=result.tokens,
+        ast=result.ast,
+        analyzed=result.analyzed,
+    )
+    _live_result_cache[uri] = (result, live)
+    return live
+
+
 @server.feature(lsp.TEXT_DOCUMENT_DID_OPEN)
 def did_open(params: lsp.DidOpenTextDocumentParams):
     _validate_document(
@@ -77,13 +155,15 @@ def did_open(params: lsp.DidOpenTextDocumentParams):
 
 
 @server.feature(lsp.TEXT_DOCUMENT_DID_CHANGE)
-def did_change(params: lsp.DidChangeTextDocumentParams):
-    doc = server.workspace.get_text_document(params.text_document.uri)
-    _validate_document(params.text_document.uri, doc.source)
+async def did_change(params: lsp.DidChangeTextDocumentParams):
+    uri = params.text_document.uri
+    _cancel_pending_validation(uri)
+    _pending_validations[uri] = asyncio.ensure_future(_validate_after_delay(uri))
 
 
 @server.feature(lsp.TEXT_DOCUMENT_DID_SAVE)
 def did_save(params: lsp.DidSaveTextDocumentParams):
+    _cancel_pending_validation(params.text_document.uri)
     doc = server.workspace.get_text_document(params.text_document.uri)
     _validate_document(params.text_document.uri, doc.source)
 
@@ -91,8 +171,11 @@ def did_save(params: lsp.DidSaveTextDocumentParams):
 @server.feature(lsp.TEXT_DOCUMENT_DID_CLOSE)
 def did_close(params: lsp.DidCloseTextDocumentParams):
     uri = params.text_document.uri
+    _cancel_pending_validation(uri)
     _analysis_cache.pop(uri, None)
     _good_analysis_cache.pop(uri, None)
+    _live_result_cache.pop(uri, None)
+    invalidate(uri)
     server.text_document_publish_diagnostics(
         lsp.PublishDiagnosticsParams(uri=uri, diagnostics=[])
     )
@@ -123,49 +206,14 @@ def goto_definition(params: lsp.TextDocumentPositionParams):
 
 
 @server.feature(
-    lsp.TEXT_DOCUMENT_COMPLETION, lsp.CompletionOptions(trigger_characters=[".", ">"])
+    lsp.TEXT_DOCUMENT_COMPLETION,
+    lsp.CompletionOptions(trigger_characters=[".", ">"], resolve_provider=False),
 )
 def completion(params: lsp.CompletionParams):
-    uri = params.text_document.uri
-
-    # Get current document source for extracting text around cursor
-    doc = server.workspace.get_text_document(uri)
-    current_source = doc.source if doc else None
-
-    # Prefer the current analysis result, but fall back to the last good one
-    # when the current source has parse errors (common while typing)
-    result = _analysis_cache.get(uri)
-    if result and not result.analyzed:
-        good = _good_analysis_cache.get(uri)
-        if good:
-            # Use the good analysis but with the current source text
-            # so text-before-cursor extraction works on the live buffer
-            result = AnalysisResult(
-                uri=uri,
-                source=current_source or good.source,
-                diagnostics=good.diagnostics,
-                tokens=good.tokens,
-                ast=good.ast,
-                analyzed=good.analyzed,
-            )
-
-    if not result and current_source:
-        result = compute_diagnostics(uri, current_source)
-        _analysis_cache[uri] = result
-
+    result = _get_live_result(params.text_document.uri)
     if result:
-        # Always use current source for cursor context if available
-        if current_source and result.source != current_source:
-            result = AnalysisResult(
-                uri=result.uri,
-                source=current_source,
-                diagnostics=result.diagnostics,
-                tokens=result.tokens,
-                ast=result.ast,
-                analyzed=result.analyzed,
-            )
         return get_completions(result, params.position)
-    return []
+    return lsp.CompletionList(is_incomplete=True, items=[])
 
 
 @server.feature(
@@ -173,42 +221,8 @@ def completion(params: lsp.CompletionParams):
     lsp.SignatureHelpOptions(trigger_characters=["(", ","]),
 )
 def signature_help(params: lsp.SignatureHelpParams):
-    uri = params.text_document.uri
-
-    # Get current document source for cursor context
-    doc = server.workspace.get_text_document(uri)
-    current_source = doc.source if doc else None
-
-    # Prefer the current analysis result, but fall back to the last good one
-    # when the current source has parse errors (common while typing arguments)
-    result = _analysis_cache.get(uri)
-    if result and not result.analyzed:
-        good = _good_analysis_cache.get(uri)
-        if good:
-            result = AnalysisResult(
-                uri=uri,
-                source=current_source or good.source,
-                diagnostics=good.diagnostics,
-                tokens=good.tokens,
-                ast=good.ast,
-                analyzed=good.analyzed,
-            )
-
-    if not result and current_source:
-        result = compute_diagnostics(uri, current_source)
-        _analysis_cache[uri] = result
-
+    result = _get_live_result(params.text_document.uri)
     if result:
-        # Always use current source for cursor context if available
-        if current_source and result.source != current_source:
-            result = AnalysisResult(
-                uri=result.uri,
-                source=current_source,
-                diagnostics=result.diagnostics,
-                tokens=result.tokens,
-                ast=result.ast,
-                analyzed=result.analyzed,
-            )
         return get_signature_help(result, params.position)
     return None
 
@@ -228,7 +242,10 @@ def find_references(params: lsp.ReferenceParams):
 def rename(params: lsp.RenameParams):
     result = _get_best_result(params.text_document.uri)
     if result:
-        return get_rename_edits(result, params.position, params.new_name)
+        try:
+            return get_rename_edits(result, params.position, params.new_name)
+        except ValueError as exc:
+            raise JsonRpcInvalidParams(str(exc)) from exc
     return None
 
 
@@ -21,109 +21,85 @@ from src.compiler.python.ast_nodes import (
     MethodDecl,
 )
 from src.devex.lsp.builtins import (
-    BUILTIN_FUNCTION_SIGNATURES,
+    get_builtin_function,
     get_signature_params,
     get_stdlib_signature,
 )
 from src.devex.lsp.diagnostics import AnalysisResult
-from src.devex.lsp.utils import (
-    find_enclosing_class_from_source,
-    resolve_variable_type,
-    type_repr,
-)
+from src.devex.lsp.indexes import get_offset
+from src.devex.lsp.type_resolution import get_variable_type
+from src.devex.lsp.utils import find_enclosing_class_from_source, type_repr
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
-def _count_active_parameter(source: str, position: lsp.Position) -> int:
-    """Count commas at the current nesting level before the cursor."""
-    lines = source.split("\n")
-    if position.line < 0 or position.line >= len(lines):
-        return 0
+# The callee before a "(": "name", "new Name", or "obj.method" (also ->, ?.)
+_CALL_NAME_RE = re.compile(r"(?P<new>new\s+)?(?P<name>\w+)(?:(?:\.|->|\?\.)(?P<member>\w+))?\s*$")
 
-    full_text_before = (
-        "\n".join(lines[: position.line])
-        + "\n"
-        + lines[position.line][: position.character]
-    )
 
-    depth = 0
-    commas = 0
-    in_string = False
-    string_char = None
-
-    i = len(full_text_before) - 1
-    while i >= 0:
-        ch = full_text_before[i]
-        if in_string:
-            if ch == string_char and (i == 0 or full_text_before[i - 1] != "\\"):
-                in_string = False
-            i -= 1
-            continue
-        if ch in ('"', "'"):
-            in_string = True
-            string_char = ch
-            i -= 1
-            continue
-        if ch == ")":
-            depth += 1
-        elif ch == "(":
-            if depth == 0:
-                return commas
-            depth -= 1
-        elif ch == "," and depth == 0:
-            commas += 1
-        i -= 1
-
-    return commas
-
-
-def _find_call_context(source: str, position: lsp.Position) -> str | None:
-    """Find the function/method name for the call surrounding the cursor."""
-    lines = source.split("\n")
-    if position.line < 0 or position.line >= len(lines):
-        return None
+# The only characters _scan_open_call reacts to
+_SCAN_CHAR_RE = re.compile(r"[\"'(),]")
+_SCAN_WINDOW = 64
 
-    full_text_before = (
-        "\n".join(lines[: position.line])
-        + "\n"
-        + lines[position.line][: position.character]
-    )
 
-    depth = 0
-    in_string = False
-    string_char = None
-
-    i = len(full_text_before) - 1
-    while i >= 0:
-        ch = full_text_before[i]
-        if in_string:
-            if ch == string_char and (i == 0 or full_text_before[i - 1] != "\\"):
-                in_string = False
-            i -= 1
-            continue
-        if ch in ('"', "'"):
-            in_string = True
-            string_char = ch
-            i -= 1
-            continue
-        if ch == ")":
-            depth += 1
-        elif ch == "(":
-            if depth == 0:
-                text_before_paren = full_text_before[:i].rstrip()
-                m = re.search(
-                    r"((?:new\s+)?[\w]+(?:(?:\.|->|\?\.)[\w]+)?)\s*$", text_before_paren
-                )
-                if m:
-                    return m.group(1).strip()
-                return None
-            depth -= 1
-        i -= 1
+def _scan_open_call(source: str, end: int) -> tuple[int | None, int]:
+    """Scan backwards from *end* for the unclosed "(" of the surrounding call.
 
-    return None
+    Returns the index of that parenthesis (None if there is none) and the
+    number of commas at the call's nesting level between it and *end*,
+    skipping over string and char literals.  Quotes, parentheses and commas
+    are located with a regex over windows of doubling size, so the text in
+    between is never visited in Python.
+    """
+    depth = 0
+    commas = 0
+    hi = end
+    window = _SCAN_WINDOW
+    while hi > 0:
+        lo = max(0, hi - window)
+        window *= 2
+        # Positions at or past limit were consumed by skipping a literal
+        limit = hi
+        for m in reversed(list(_SCAN_CHAR_RE.finditer(source, lo, hi))):
+            i = m.start()
+            if i >= limit:
+                continue
+            ch = source[i]
+            if ch == ")":
+                depth += 1
+            elif ch == "(":
+                if depth == 0:
+                    return i, commas
+                depth -= 1
+            elif ch == ",":
+                if depth == 0:
+                    commas += 1
+            else:
+                # Skip back over the literal to its unescaped opening quote
+                start = source.rfind(ch, 0, i)
+                while start > 0 and source[start - 1] == "\\":
+                    start = source.rfind(ch, 0, start)
+                if start < 0:
+                    return None, commas
+                limit = start
+        hi = min(lo, limit)
+
+    return None, commas
+
+
+def _call_name_before(source: str, paren: int) -> re.Match | None:
+    """Match the callee written before the "(" at *paren* against _CALL_NAME_RE."""
+    # A match can only contain word characters, whitespace and ".->?", so
+    # search just that run instead of the whole document before the cursor
+    start = paren
+    while start > 0:
+        ch = source[start - 1]
+        if not (ch.isalnum() or ch.isspace() or ch in "_.->?"):
+            break
+        start -= 1
+    return _CALL_NAME_RE.search(source, start, paren)
 
 
 def _make_param_info(ptype: str, pname: str) -> lsp.ParameterInformation:
@@ -209,34 +185,33 @@ def get_signature_help(
     if not result.source:
         return None
 
-    call_context = _find_call_context(result.source, position)
-    if not call_context:
+    cursor = get_offset(result, position)
+    if cursor is None:
         return None
-
-    active_param = _count_active_parameter(result.source, position)
+    paren, active_param = _scan_open_call(result.source, cursor)
+    if paren is None:
+        return None
+    callee = _call_name_before(result.source, paren)
+    if callee is None:
+        return None
+    is_new, func_name, method_name = callee.group("new", "name", "member")
 
     class_table = result.analyzed.class_table if result.analyzed else {}
     function_table = result.analyzed.function_table if result.analyzed else {}
 
-    call_context_clean = call_context
-
     # Handle "new ClassName" -> treat as constructor
-    new_match = re.match(r"^new\s+(\w+)$", call_context_clean)
-    if new_match:
-        class_name = new_match.group(1)
-        return _resolve_constructor(class_name, class_table, active_param)
+    if is_new:
+        if method_name:
+            return None  # "new a.b(" names no constructor
+        return _resolve_constructor(func_name, class_table, active_param)
 
     # Handle "obj.method", "obj?.method", "obj->method"
-    member_match = re.match(r"^(\w+)(?:\.|->|\?\.)(\w+)$", call_context_clean)
-    if member_match:
-        obj_name = member_match.group(1)
-        method_name = member_match.group(2)
+    if method_name:
         return _resolve_member_call(
-            result, obj_name, method_name, position, class_table, active_param
+            result, func_name, method_name, position, class_table, active_param
         )
 
     # Handle plain function or constructor call
-    func_name = call_context_clean.strip()
 
     if func_name in class_table:
         return _resolve_constructor(func_name, class_table, active_param)
@@ -244,10 +219,10 @@ def get_signature_help(
     if func_name in function_table:
         return _signature_from_function_decl(function_table[func_name], active_param)
 
-    if func_name in BUILTIN_FUNCTION_SIGNATURES:
-        ret, params = BUILTIN_FUNCTION_SIGNATURES[func_name]
+    builtin = get_builtin_function(func_name)
+    if builtin is not None:
         return _signature_from_param_list(
-            func_name, ret, params, active_param, context="Built-in function"
+            func_name, builtin.return_type, builtin.params, active_param, context="Built-in function"
         )
 
     return None
@@ -325,9 +300,8 @@ def _resolve_var_type(
     if not result.ast:
         return None
     if var_name == "self":
-        return find_enclosing_class_from_source(result.ast, result.source, cursor_line)
-    class_table = result.analyzed.class_table if result.analyzed else {}
-    return resolve_variable_type(var_name, result.ast, class_table)
+        return find_enclosing_class_from_source(result, cursor_line)
+    return get_variable_type(result, var_name)
 
 
 def _resolve_method_on_type(
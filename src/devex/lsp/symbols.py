@@ -5,6 +5,9 @@ Walks the AST to produce a DocumentSymbol hierarchy for the Outline view.
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from typing import Any
+
 from lsprotocol import types as lsp
 
 from src.compiler.python.ast_nodes import (
@@ -18,7 +21,8 @@ from src.compiler.python.ast_nodes import (
     TypedefDecl,
 )
 from src.devex.lsp.diagnostics import AnalysisResult
-from src.devex.lsp.utils import find_closing_brace_line, type_repr
+from src.devex.lsp.indexes import get_closing_brace_line, get_source_lines
+from src.devex.lsp.utils import params_repr, type_repr
 
 
 def _pos(line: int, col: int) -> lsp.Position:
@@ -26,12 +30,18 @@ def _pos(line: int, col: int) -> lsp.Position:
     return lsp.Position(line=max(0, line - 1), character=max(0, col - 1))
 
 
-def _range_from_node(node, source_lines: list[str]) -> lsp.Range:
-    """Compute a range for an AST node."""
+def _node_ranges(node, result: AnalysisResult) -> tuple[lsp.Range, lsp.Range]:
+    """Return (range, selection_range) for an AST node; both share one start position."""
     start = _pos(node.line, node.col)
+    return _range_from_node(node, result, start), _selection_range(node, start)
+
+
+def _range_from_node(node, result: AnalysisResult, start: lsp.Position) -> lsp.Range:
+    """Compute a range for an AST node starting at *start*."""
+    source_lines = get_source_lines(result)
 
     if isinstance(node, (ClassDecl, FunctionDecl, MethodDecl)):
-        end_line = find_closing_brace_line(source_lines, node.line - 1)
+        end_line = get_closing_brace_line(result, node.line - 1)
         if end_line is not None:
             end_col = len(source_lines[end_line]) if end_line < len(source_lines) else 0
             return lsp.Range(
@@ -43,9 +53,8 @@ def _range_from_node(node, source_lines: list[str]) -> lsp.Range:
     return lsp.Range(start=start, end=lsp.Position(line=line_idx, character=end_col))
 
 
-def _selection_range(node) -> lsp.Range:
+def _selection_range(node, start: lsp.Position) -> lsp.Range:
     """Selection range: just the name, approximated as the node's start position."""
-    start = _pos(node.line, node.col)
     # Approximate end as start + length of name
     name = getattr(node, "name", "")
     end = lsp.Position(line=start.line, character=start.character + len(name))
@@ -54,125 +63,144 @@ def _selection_range(node) -> lsp.Range:
 
 def _method_detail(method: MethodDecl) -> str:
     """Build a detail string like 'int method(string name, int age)'."""
-    params = ", ".join(f"{type_repr(p.type)} {p.name}" for p in method.params)
+    params = params_repr(method)
     ret = type_repr(method.return_type)
     return f"{ret} {method.name}({params})"
 
 
+def _field_symbol(member: FieldDecl, cls: ClassDecl, result: AnalysisResult) -> lsp.DocumentSymbol:
+    full_range, selection_range = _node_ranges(member, result)
+    return lsp.DocumentSymbol(
+        name=member.name,
+        kind=lsp.SymbolKind.Field,
+        range=full_range,
+        selection_range=selection_range,
+        detail=type_repr(member.type),
+    )
+
+
+def _method_symbol(member: MethodDecl, cls: ClassDecl, result: AnalysisResult) -> lsp.DocumentSymbol:
+    # Constructor vs regular method
+    is_constructor = member.name == cls.name
+    kind = lsp.SymbolKind.Constructor if is_constructor else lsp.SymbolKind.Method
+    full_range, selection_range = _node_ranges(member, result)
+    return lsp.DocumentSymbol(
+        name=member.name,
+        kind=kind,
+        range=full_range,
+        selection_range=selection_range,
+        detail=_method_detail(member),
+    )
+
+
+# Member node type -> builder of its child symbol inside a class
+_MEMBER_SYMBOLS: dict[type, Callable[[Any, ClassDecl, AnalysisResult], lsp.DocumentSymbol]] = {
+    FieldDecl: _field_symbol,
+    MethodDecl: _method_symbol,
+}
+
+
+def _class_symbol(decl: ClassDecl, result: AnalysisResult) -> lsp.DocumentSymbol:
+    get_builder = _MEMBER_SYMBOLS.get
+    children = [
+        builder(member, decl, result)
+        for member in decl.members
+        if (builder := get_builder(type(member))) is not None
+    ]
+
+    # Generic params in detail
+    detail = ""
+    if decl.generic_params:
+        detail = f"<{', '.join(decl.generic_params)}>"
+    if decl.parent:
+        detail += f" extends {decl.parent}"
+
+    full_range, selection_range = _node_ranges(decl, result)
+    return lsp.DocumentSymbol(
+        name=decl.name,
+        kind=lsp.SymbolKind.Class,
+        range=full_range,
+        selection_range=selection_range,
+        detail=detail.strip(),
+        children=children,
+    )
+
+
+def _function_symbol(decl: FunctionDecl, result: AnalysisResult) -> lsp.DocumentSymbol:
+    params = params_repr(decl)
+    ret = type_repr(decl.return_type)
+    full_range, selection_range = _node_ranges(decl, result)
+    return lsp.DocumentSymbol(
+        name=decl.name,
+        kind=lsp.SymbolKind.Function,
+        range=full_range,
+        selection_range=selection_range,
+        detail=f"{ret}({params})",
+    )
+
+
+def _enum_symbol(decl: EnumDecl, result: AnalysisResult) -> lsp.DocumentSymbol:
+    # Enum values have no positions of their own; they share the enum's
+    enum_range, selection_range = _node_ranges(decl, result)
+    children = [
+        lsp.DocumentSymbol(
+            name=ev.name,
+            kind=lsp.SymbolKind.EnumMember,
+            range=enum_range,
+            selection_range=selection_range,
+            detail=str(ev.value) if ev.value is not None else "",
+        )
+        for ev in decl.values
+        if isinstance(ev, EnumValue)
+    ]
+    return lsp.DocumentSymbol(
+        name=decl.name,
+        kind=lsp.SymbolKind.Enum,
+        range=enum_range,
+        selection_range=selection_range,
+        children=children,
+    )
+
+
+def _struct_symbol(decl: StructDecl, result: AnalysisResult) -> lsp.DocumentSymbol:
+    full_range, selection_range = _node_ranges(decl, result)
+    return lsp.DocumentSymbol(
+        name=decl.name,
+        kind=lsp.SymbolKind.Struct,
+        range=full_range,
+        selection_range=selection_range,
+    )
+
+
+def _typedef_symbol(decl: TypedefDecl, result: AnalysisResult) -> lsp.DocumentSymbol:
+    full_range, selection_range = _node_ranges(decl, result)
+    return lsp.DocumentSymbol(
+        name=decl.alias,
+        kind=lsp.SymbolKind.TypeParameter,
+        range=full_range,
+        selection_range=selection_range,
+        detail=type_repr(decl.original),
+    )
+
+
+# Top-level declaration node type -> builder of its symbol
+_DECL_SYMBOLS: dict[type, Callable[[Any, AnalysisResult], lsp.DocumentSymbol]] = {
+    ClassDecl: _class_symbol,
+    FunctionDecl: _function_symbol,
+    EnumDecl: _enum_symbol,
+    StructDecl: _struct_symbol,
+    TypedefDecl: _typedef_symbol,
+}
+
+
 def get_document_symbols(result: AnalysisResult) -> list[lsp.DocumentSymbol]:
     """Extract document symbols from the parsed AST."""
     if not result.ast:
         return []
 
-    source_lines = result.source.split("\n")
-    symbols: list[lsp.DocumentSymbol] = []
-
-    for decl in result.ast.declarations:
-        if isinstance(decl, ClassDecl):
-            children: list[lsp.DocumentSymbol] = []
-
-            for member in decl.members:
-                if isinstance(member, FieldDecl):
-                    children.append(
-                        lsp.DocumentSymbol(
-                            name=member.name,
-                            kind=lsp.SymbolKind.Field,
-                            range=_range_from_node(member, source_lines),
-                            selection_range=_selection_range(member),
-                            detail=type_repr(member.type),
-                        )
-                    )
-                elif isinstance(member, MethodDecl):
-                    # Constructor vs regular method
-                    is_constructor = member.name == decl.name
-                    kind = (
-                        lsp.SymbolKind.Constructor
-                        if is_constructor
-                        else lsp.SymbolKind.Method
-                    )
-                    children.append(
-                        lsp.DocumentSymbol(
-                            name=member.name,
-                            kind=kind,
-                            range=_range_from_node(member, source_lines),
-                            selection_range=_selection_range(member),
-                            detail=_method_detail(member),
-                        )
-                    )
-
-            # Generic params in detail
-            detail = ""
-            if decl.generic_params:
-                detail = f"<{', '.join(decl.generic_params)}>"
-            if decl.parent:
-                detail += f" extends {decl.parent}"
-
-            symbols.append(
-                lsp.DocumentSymbol(
-                    name=decl.name,
-                    kind=lsp.SymbolKind.Class,
-                    range=_range_from_node(decl, source_lines),
-                    selection_range=_selection_range(decl),
-                    detail=detail.strip(),
-                    children=children,
-                )
-            )
-
-        elif isinstance(decl, FunctionDecl):
-            params = ", ".join(f"{type_repr(p.type)} {p.name}" for p in decl.params)
-            ret = type_repr(decl.return_type)
-            symbols.append(
-                lsp.DocumentSymbol(
-                    name=decl.name,
-                    kind=lsp.SymbolKind.Function,
-                    range=_range_from_node(decl, source_lines),
-                    selection_range=_selection_range(decl),
-                    detail=f"{ret}({params})",
-                )
-            )
-
-        elif isinstance(decl, EnumDecl):
-            children = []
-            for ev in decl.values:
-                if isinstance(ev, EnumValue):
-                    children.append(
-                        lsp.DocumentSymbol(
-                            name=ev.name,
-                            kind=lsp.SymbolKind.EnumMember,
-                            range=_range_from_node(decl, source_lines),
-                            selection_range=_selection_range(decl),
-                            detail=str(ev.value) if ev.value is not None else "",
-                        )
-                    )
-            symbols.append(
-                lsp.DocumentSymbol(
-                    name=decl.name,
-                    kind=lsp.SymbolKind.Enum,
-                    range=_range_from_node(decl, source_lines),
-                    selection_range=_selection_range(decl),
-                    children=children,
-                )
-            )
-
-        elif isinstance(decl, StructDecl):
-            symbols.append(
-                lsp.DocumentSymbol(
-                    name=decl.name,
-                    kind=lsp.SymbolKind.Struct,
-                    range=_range_from_node(decl, source_lines),
-                    selection_range=_selection_range(decl),
-                )
-            )
-
-        elif isinstance(decl, TypedefDecl):
-            symbols.append(
-                lsp.DocumentSymbol(
-                    name=decl.alias,
-                    kind=lsp.SymbolKind.TypeParameter,
-                    range=_range_from_node(decl, source_lines),
-                    selection_range=_selection_range(decl),
-                    detail=type_repr(decl.original),
-                )
-            )
-
-    return symbols
+    get_builder = _DECL_SYMBOLS.get
+    return [
+        builder(decl, result)
+        for decl in result.ast.declarations
+        if (builder := get_builder(type(decl))) is not None
+    ]
@@ -0,0 +1,66 @@
+"""Tests for the LSP's built-in member tables."""
+
+from src.devex.lsp.builtins import (
+    get_builtin_function,
+    get_hover_markdown,
+    get_member,
+    get_signature_params,
+    get_stdlib_methods,
+    get_stdlib_signature,
+)
+from src.devex.lsp.type_resolution import resolve_member_type
+
+
+class TestMemberLookups:
+    def test_builtin_type_member(self):
+        m = get_member("string", "len")
+        assert m is not None
+        assert m.kind == "field"
+        assert m.return_type == "int"
+
+    def test_builtin_signature_params(self):
+        assert get_signature_params("List", "push") == (("T", "val"),)
+        assert get_signature_params("string", "len") is None
+
+    def test_builtin_hover(self):
+        assert get_hover_markdown("string", "len").startswith("```btrc\nint len\n```")
+
+    def test_unknown_type(self):
+        assert get_member("Nope", "len") is None
+        assert get_hover_markdown("Nope", "len") is None
+        assert get_signature_params("Nope", "len") is None
+
+
+class TestStdlibKeptApart:
+    """Stdlib static methods are only served by the get_stdlib_* accessors."""
+
+    def test_stdlib_signature(self):
+        assert get_stdlib_signature("Math", "sqrt") == (("float", "x"),)
+        assert get_stdlib_signature("Math", "nope") is None
+        assert get_stdlib_signature("List", "push") is None
+
+    def test_stdlib_methods(self):
+        names = {m.name for m in get_stdlib_methods("Math")}
+        assert "sqrt" in names
+
+    def test_member_lookups_ignore_stdlib(self):
+        assert get_member("Math", "sqrt") is None
+        assert get_hover_markdown("Math", "sqrt") is None
+        assert get_signature_params("Math", "sqrt") is None
+
+    def test_member_type_ignores_stdlib(self):
+        assert resolve_member_type("Math", "sqrt", {}) is None
+        assert resolve_member_type("string", "len", {}) == "int"
+
+
+class TestFreeFunctionsKeptApart:
+    """Free functions are only served by get_builtin_function."""
+
+    def test_builtin_function(self):
+        assert get_builtin_function("print").kind == "function"
+        assert get_builtin_function("nope") is None
+
+    def test_member_lookups_ignore_free_functions(self):
+        assert get_member("<free>", "print") is None
+        assert get_hover_markdown("<free>", "print") is None
+        assert get_signature_params("<free>", "print") is None
@@ -0,0 +1,81 @@
+"""Tests for the LSP's code completion."""
+
+from lsprotocol import types as lsp
+
+from src.devex.lsp.completion import get_completions
+from src.devex.lsp.diagnostics import compute_diagnostics
+
+URI = "file:///tmp/test_completion.btrc"
+SRC = (
+    "class Widget {\n"  # 0
+    "    public int size;\n"
+    "}\n"
+    "int main() {\n"
+    "    Widget w = new Widget();\n"  # 4
+    "    int n = w.size; // see {w.size}\n"
+    '    string s = "w.size while";\n'
+    '    string f = f"{w.size} wh";\n'  # 7
+    "    while (n > 0) { n = n - 1; }\n"
+    "    return 0;\n"
+    "}\n"
+)
+
+
+def _complete(line: int, character: int) -> lsp.CompletionList:
+    result = compute_diagnostics(URI, SRC)
+    assert not result.diagnostics
+    return get_completions(result, lsp.Position(line=line, character=character))
+
+
+def _labels(completions: lsp.CompletionList) -> list[str]:
+    return [item.label for item in completions.items]
+
+
+class TestGeneralCompletions:
+    def test_empty_prefix_offers_everything_and_is_complete(self):
+        completions = _complete(9, 4)  # "    |return 0;"
+        labels = _labels(completions)
+        assert completions.is_incomplete is False
+        for label in ("while", "return", "int", "List", "Widget", "Math"):
+            assert label in labels
+
+    def test_prefix_narrows_and_is_incomplete(self):
+        completions = _complete(8, 6)  # "    wh|ile"
+        labels = _labels(completions)
+        assert completions.is_incomplete is True
+        assert "while" in labels
+        assert "return" not in labels and "int" not in labels and "Widget" not in labels
+
+    def test_prefix_matches_class_names_case_insensitively(self):
+        items = _complete(4, 6).items  # "    Wi|dget"
+        labels = [i.label for i in items if i.kind != lsp.CompletionItemKind.Snippet]
+        assert labels == ["Widget"]
+
+    def test_snippets_offered_for_any_prefix(self):
+        empty = {i.label for i in _complete(9, 4).items if i.kind == lsp.CompletionItemKind.Snippet}
+        narrowed = {i.label for i in _complete(4, 6).items if i.kind == lsp.CompletionItemKind.Snippet}
+        assert empty and empty == narrowed
+
+
+class TestMemberCompletions:
+    def test_resolved_members_are_complete(self):
+        completions = _complete(5, 14)  # "w.|size"
+        assert completions.is_incomplete is False
+        assert _labels(completions) == ["size"]
+
+
+class TestSuppressedInLiteralsAndComments:
+    def test_line_comment(self):
+        completions = _complete(5, 31)  # "// see {w.|size}"
+        assert completions.items == []
+        assert completions.is_incomplete is False
+
+    def test_string_literal(self):
+        assert _complete(6, 17).items == []  # '"w.|size while"'
+
+    def test_fstring_text(self):
+        assert _complete(7, 25).items == []  # 'f"{w.size} wh|"'
+
+    def test_fstring_interpolation_is_code(self):
+        labels = _labels(_complete(7, 19))  # 'f"{w|.size}'
+        assert "Widget" in labels
@@ -0,0 +1,84 @@
+"""Tests for the LSP's per-analysis brace index."""
+
+from src.devex.lsp.diagnostics import compute_diagnostics
+from src.devex.lsp.indexes import BraceIndex
+from src.devex.lsp.utils import find_enclosing_class_from_source
+
+URI = "file:///tmp/test_indexes.btrc"
+
+
+class TestBracesInLiterals:
+    def test_string_braces_in_class_body(self):
+        src = (
+            "class Point {\n"  # 0
+            "    public int x;\n"
+            '    public string open() { return "{" + "}}"; }\n'
+            '    public string show() { return f"({self.x})"; }\n'
+            "}\n"  # 4
+            "int main() {\n"
+            "    return 0;\n"
+            "}\n"
+        )
+        index = BraceIndex.build(src)
+        assert index.closing_line(0) == 4
+        assert index.closing_line(5) == 7
+        result = compute_diagnostics(URI, src)
+        assert find_enclosing_class_from_source(result, 3) == "Point"
+        assert find_enclosing_class_from_source(result, 6) is None
+
+    def test_char_literal_braces(self):
+        src = "void f() {\n    char c = '}';\n}\n"
+        assert BraceIndex.build(src).closing_line(0) == 2
+
+    def test_line_comment_braces(self):
+        src = "class A {\n    // closes early }\n    public int x;\n}\n"
+        assert BraceIndex.build(src).closing_line(0) == 3
+
+    def test_block_comment_braces(self):
+        src = "class A {\n    /* { spans\n       lines } */\n    public int x;\n}\n"
+        assert BraceIndex.build(src).closing_line(0) == 4
+
+
+class TestCloseBeforeOpenOnOneLine:
+    def test_else_branch(self):
+        src = (
+            "void f(bool b) {\n"  # 0
+            "    if (b) {\n"
+            "        return;\n"
+            "    } else {\n"  # 3
+            "        return;\n"
+            "    }\n"  # 5
+            "}\n"
+        )
+        index = BraceIndex.build(src)
+        assert index.closing_line(1) == 3
+        assert index.closing_line(3) == 5
+        assert index.closing_line(0) == 6
+
+    def test_close_then_class_on_one_line(self):
+        src = "class A {\n    public int x;\n} class B {\n    public int y;\n}\n"
+        assert BraceIndex.build(src).closing_line(2) == 4
+
+
+class TestUnterminatedLiterals:
+    def test_unterminated_block_comment_covers_its_line(self):
+        src = (
+            "class A {\n"  # 0
+            "    public int x;\n"
+            "}\n"  # 2
+            "/* still typing {\n"
+            "class B {\n"  # 4
+            "    public int y;\n"
+            "}\n"  # 6
+        )
+        index = BraceIndex.build(src)
+        assert index.closing_line(0) == 2
+        assert index.closing_line(4) == 6
+
+    def test_unterminated_triple_quoted_string_covers_its_line(self):
+        src = 'string s = """ {\nclass B {\n    public int y;\n}\n'
+        assert BraceIndex.build(src).closing_line(1) == 3
+
+    def test_unterminated_string_covers_its_line(self):
+        src = 'class A {\n    string s = "{;\n}\n'
+        assert BraceIndex.build(src).closing_line(0) == 2
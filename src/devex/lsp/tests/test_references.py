@@ -0,0 +1,38 @@
+"""Tests for the LSP's rename support."""
+
+import pytest
+from lsprotocol import types as lsp
+
+from src.devex.lsp.diagnostics import compute_diagnostics
+from src.devex.lsp.references import get_rename_edits
+
+URI = "file:///tmp/test_references.btrc"
+SRC = "int main() {\n    int count = 1;\n    return count;\n}\n"
+COUNT = lsp.Position(line=1, character=9)
+
+
+def _rename(new_name: str) -> lsp.WorkspaceEdit | None:
+    return get_rename_edits(compute_diagnostics(URI, SRC), COUNT, new_name)
+
+
+class TestRenameNewName:
+    def test_valid_name_edits_every_reference(self):
+        edit = _rename("total")
+        assert [e.new_text for e in edit.changes[URI]] == ["total", "total"]
+
+    def test_underscore_and_unicode_letters_allowed(self):
+        assert _rename("_n2") is not None
+        assert _rename("größe") is not None
+
+    def test_same_name_is_a_no_op(self):
+        assert _rename("count") is None
+
+    @pytest.mark.parametrize("name", ["", "2x", "²x", "a-b", "a b", "x²$"])
+    def test_invalid_identifier_rejected(self, name):
+        with pytest.raises(ValueError, match="not a valid identifier"):
+            _rename(name)
+
+    @pytest.mark.parametrize("name", ["while", "class", "int", "self", "List", "Map", "Set"])
+    def test_reserved_name_rejected(self, name):
+        with pytest.raises(ValueError, match="reserved name"):
+            _rename(name)
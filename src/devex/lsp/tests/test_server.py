@@ -0,0 +1,125 @@
+"""Tests for the btrc language server's request handling."""
+
+import asyncio
+
+import pytest
+from lsprotocol import types as lsp
+from pygls.exceptions import JsonRpcInvalidParams
+
+from src.devex.lsp import server as srv
+from src.devex.lsp.diagnostics import compute_diagnostics
+from src.devex.lsp.semantic_tokens import get_semantic_tokens
+
+URI = "file:///tmp/test_server.btrc"
+
+
+def _open(text: str) -> None:
+    """Initialize the server's workspace and open URI with *text*."""
+    list(srv.server.protocol.lsp_initialize(lsp.InitializeParams(capabilities=lsp.ClientCapabilities())))
+    doc = lsp.TextDocumentItem(uri=URI, language_id="btrc", version=1, text=text)
+    srv.server.workspace.put_text_document(doc)
+    srv.did_open(lsp.DidOpenTextDocumentParams(text_document=doc))
+
+
+async def _change(text: str) -> None:
+    """Replace URI's text the way pygls does before calling did_change."""
+    ident = lsp.VersionedTextDocumentIdentifier(uri=URI, version=2)
+    change = lsp.TextDocumentContentChangeWholeDocument(text=text)
+    srv.server.workspace.update_text_document(ident, change)
+    await srv.did_change(lsp.DidChangeTextDocumentParams(text_document=ident, content_changes=[change]))
+
+
+class TestDebouncedChanges:
+    def test_request_after_change_sees_new_text(self):
+        new_text = "class Foo {\n    public int x;\n}\nint y = 1;\n"
+
+        async def change_then_request():
+            await _change(new_text)
+            assert URI in srv._pending_validations
+            params = lsp.SemanticTokensParams(text_document=lsp.TextDocumentIdentifier(uri=URI))
+            return srv.semantic_tokens_full(params)
+
+        _open("int x = 1;\n")
+        try:
+            tokens = asyncio.run(change_then_request())
+            expected = get_semantic_tokens(compute_diagnostics(URI, new_text))
+            assert tokens.data == expected.data
+            assert URI not in srv._pending_validations
+        finally:
+            srv.did_close(lsp.DidCloseTextDocumentParams(text_document=lsp.TextDocumentIdentifier(uri=URI)))
+
+    def test_completion_after_change_sees_new_text(self):
+        new_text = (
+            "class Gadget {\n"
+            "    public int size;\n"
+            "}\n"
+            "int main() {\n"
+            "    Gadget g = new Gadget();\n"
+            "    int n = g.size;\n"
+            "    return 0;\n"
+            "}\n"
+        )
+
+        async def change_then_complete():
+            await _change(new_text)
+            assert URI in srv._pending_validations
+            params = lsp.CompletionParams(
+                text_document=lsp.TextDocumentIdentifier(uri=URI),
+                position=lsp.Position(line=5, character=14),  # "g.|size"
+            )
+            return srv.completion(params)
+
+        _open("int x = 1;\n")
+        try:
+            completions = asyncio.run(change_then_complete())
+            assert [item.label for item in completions.items] == ["size"]
+        finally:
+            srv.did_close(lsp.DidCloseTextDocumentParams(text_document=lsp.TextDocumentIdentifier(uri=URI)))
+
+    def test_failed_validation_is_logged(self, monkeypatch, caplog):
+        def fail(uri, source):
+            raise RuntimeError("boom")
+
+        async def change_and_wait():
+            await _change("int y = 2;\n")
+            await srv._pending_validations[URI]
+
+        _open("int x = 1;\n")
+        try:
+            monkeypatch.setattr(srv, "compute_diagnostics", fail)
+            asyncio.run(change_and_wait())
+            assert "Validation of " + URI + " failed" in caplog.text
+        finally:
+            monkeypatch.undo()
+            srv.did_close(lsp.DidCloseTextDocumentParams(text_document=lsp.TextDocumentIdentifier(uri=URI)))
+
+
+class TestLiveResult:
+    def test_broken_buffer_reuses_one_result_per_text(self):
+        _open("int main() {\n    int count = 1;\n    return count;\n}\n")
+        try:
+            ident = lsp.VersionedTextDocumentIdentifier(uri=URI, version=2)
+            change = lsp.TextDocumentContentChangeWholeDocument(text="int main() {\n    int count = 1;\n    cou\n")
+            srv.server.workspace.update_text_document(ident, change)
+            srv.did_save(lsp.DidSaveTextDocumentParams(text_document=lsp.TextDocumentIdentifier(uri=URI)))
+            live = srv._get_live_result(URI)
+            assert live.analyzed is not None
+            assert live.source.endswith("cou\n")
+            assert srv._get_live_result(URI) is live
+        finally:
+            srv.did_close(lsp.DidCloseTextDocumentParams(text_document=lsp.TextDocumentIdentifier(uri=URI)))
+
+
+class TestRename:
+    def test_invalid_name_is_a_request_error(self):
+        _open("int main() {\n    int count = 1;\n    return count;\n}\n")
+        try:
+            params = lsp.RenameParams(
+                text_document=lsp.TextDocumentIdentifier(uri=URI),
+                position=lsp.Position(line=1, character=9),
+                new_name="2x",
+            )
+            with pytest.raises(JsonRpcInvalidParams, match="not a valid identifier"):
+                srv.rename(params)
+        finally:
+            srv.did_close(lsp.DidCloseTextDocumentParams(text_document=lsp.TextDocumentIdentifier(uri=URI)))
@@ -0,0 +1,246 @@
+"""Variable, member and chained-access type resolution for the btrc LSP."""
+
+from __future__ import annotations
+
+from src.compiler.python.analyzer.core import ClassInfo
+from src.compiler.python.ast_nodes import (
+    CallExpr,
+    ClassDecl,
+    ElseBlock,
+    ElseIf,
+    FieldDecl,
+    FunctionDecl,
+    Identifier,
+    MethodDecl,
+    NewExpr,
+    Program,
+    VarDeclStmt,
+)
+from src.compiler.python.tokens import Token
+from src.devex.lsp.builtins import _MEMBER_TABLES, get_member
+from src.devex.lsp.diagnostics import AnalysisResult
+from src.devex.lsp.utils import MEMBER_ACCESS_OPS, find_enclosing_class
+
+# ---------------------------------------------------------------------------
+# Class members
+# ---------------------------------------------------------------------------
+
+
+def class_members(
+    result: AnalysisResult,
+    class_name: str,
+) -> dict[str, tuple[str, MethodDecl | FieldDecl]]:
+    """Map each member name of *class_name* to its (owning class, declaration).
+
+    Walks the class and its parent chain once; per class, methods win over
+    fields and nearer classes win over ancestors.  Memoized per analysis.
+    """
+    maps = result.class_member_maps
+    if maps is None:
+        maps = result.class_member_maps = {}
+    members = maps.get(class_name)
+    if members is not None:
+        return members
+    class_table = result.analyzed.class_table if result.analyzed else {}
+    members = {}
+    seen: set[str] = set()
+    cname = class_name
+    while cname and cname in class_table and cname not in seen:
+        seen.add(cname)
+        cinfo = class_table[cname]
+        for name, mdecl in cinfo.methods.items():
+            if isinstance(mdecl, MethodDecl):
+                members.setdefault(name, (cname, mdecl))
+        for name, fdecl in cinfo.fields.items():
+            if isinstance(fdecl, FieldDecl):
+                members.setdefault(name, (cname, fdecl))
+        cname = cinfo.parent
+    maps[class_name] = members
+    return members
+
+
+# ---------------------------------------------------------------------------
+# Variable type resolution
+# ---------------------------------------------------------------------------
+
+# Primitive types + auto-discovered types from _MEMBER_TABLES
+_PRIMITIVE_TYPES = frozenset({
+    "int", "float", "double", "long", "short",
+    "char", "bool", "void", "unsigned",
+})
+BUILTIN_TYPES = _PRIMITIVE_TYPES | frozenset(_MEMBER_TABLES.keys())
+
+
+def resolve_variable_type(
+    name: str,
+    ast: Program,
+    class_table: dict[str, ClassInfo],
+) -> str | None:
+    """Determine the class/type name for a variable by scanning the AST.
+
+    Looks at VarDeclStmt nodes to find declarations like:
+        var x = ClassName(...)          -> ClassName
+        var x = new ClassName(...)      -> ClassName
+        ClassName x = ...               -> ClassName
+    """
+    # Declared types are accepted if they name a class or a built-in type
+    known_types = BUILTIN_TYPES.union(class_table)
+    for decl in ast.declarations:
+        result = _scan_for_var_type(name, decl, class_table, known_types)
+        if result:
+            return result
+    return None
+
+
+def get_variable_type(result: AnalysisResult, name: str) -> str | None:
+    """resolve_variable_type() for *result*'s AST, memoized per analysis.
+
+    The lookup ignores the cursor position, so one answer per name serves
+    every request against the same analysis.
+    """
+    cache = result.var_types
+    if cache is None:
+        cache = result.var_types = {}
+    if name in cache:
+        return cache[name]
+    var_type = None
+    if result.ast:
+        class_table = result.analyzed.class_table if result.analyzed else {}
+        var_type = resolve_variable_type(name, result.ast, class_table)
+    cache[name] = var_type
+    return var_type
+
+
+def _scan_for_var_type(
+    var_name: str,
+    node,
+    class_table: dict[str, ClassInfo],
+    known_types: frozenset[str],
+) -> str | None:
+    """Recursively scan AST nodes for a VarDeclStmt that declares var_name."""
+    if isinstance(node, VarDeclStmt):
+        if node.name == var_name:
+            if node.type and node.type.base in known_types:
+                return node.type.base
+            if isinstance(node.initializer, CallExpr):
+                callee = node.initializer.callee
+                if isinstance(callee, Identifier) and callee.name in class_table:
+                    return callee.name
+            if isinstance(node.initializer, NewExpr):
+                if node.initializer.type and node.initializer.type.base in known_types:
+                    return node.initializer.type.base
+        return None
+
+    if isinstance(node, ClassDecl):
+        for member in node.members:
+            result = _scan_for_var_type(var_name, member, class_table, known_types)
+            if result:
+                return result
+    elif isinstance(node, (FunctionDecl, MethodDecl)):
+        for p in node.params:
+            if p.name == var_name and p.type:
+                if p.type.base in known_types:
+                    return p.type.base
+        if node.body:
+            for stmt in node.body.statements:
+                result = _scan_for_var_type(var_name, stmt, class_table, known_types)
+                if result:
+                    return result
+    elif hasattr(node, "then_block") or hasattr(node, "body"):
+        for attr_name in (
+            "then_block",
+            "else_block",
+            "body",
+            "try_block",
+            "catch_block",
+        ):
+            child = getattr(node, attr_name, None)
+            if child is None:
+                continue
+            # Unwrap ASDL wrapper types for else_block
+            if isinstance(child, ElseBlock) and child.body:
+                child = child.body
+            elif isinstance(child, ElseIf) and child.if_stmt:
+                result = _scan_for_var_type(var_name, child.if_stmt, class_table, known_types)
+                if result:
+                    return result
+                continue
+            if hasattr(child, "statements"):
+                for stmt in child.statements:
+                    result = _scan_for_var_type(var_name, stmt, class_table, known_types)
+                    if result:
+                        return result
+
+    return None
+
+
+def resolve_chain_type(
+    result: AnalysisResult,
+    tokens: list[Token],
+    end_idx: int,
+    class_table: dict[str, ClassInfo],
+) -> str | None:
+    """Walk backwards through a chained access (a.b.c) and resolve the base type."""
+    idx = end_idx
+    while idx >= 2 and tokens[idx - 1].value in MEMBER_ACCESS_OPS:
+        idx -= 2
+
+    root = tokens[idx].value
+    current_type: str | None = None
+
+    if root in class_table:
+        current_type = root
+    elif root == "self" and result.ast:
+        current_type = find_enclosing_class(result, tokens[idx].line)
+    elif result.ast:
+        current_type = get_variable_type(result, root)
+
+    # Fold the members after the root (every other token up to end_idx)
+    for member_idx in range(idx + 2, end_idx + 1, 2):
+        if current_type is None:
+            return None
+        current_type = get_member_type(result, current_type, tokens[member_idx].value)
+
+    return current_type
+
+
+def get_member_type(result: AnalysisResult, owner_type: str, member_name: str) -> str | None:
+    """Return resolve_member_type() against *result*'s class table, memoized per analysis."""
+    cache = result.member_types
+    if cache is None:
+        cache = result.member_types = {}
+    key = (owner_type, member_name)
+    if key not in cache:
+        class_table = result.analyzed.class_table if result.analyzed else {}
+        cache[key] = resolve_member_type(owner_type, member_name, class_table)
+    return cache[key]
+
+
+def resolve_member_type(
+    owner_type: str,
+    member_name: str,
+    class_table: dict[str, ClassInfo],
+) -> str | None:
+    """Resolve the base type of a member access on a given type."""
+    cname = owner_type
+    while cname and cname in class_table:
+        cinfo = class_table[cname]
+        if member_name in cinfo.fields:
+            fdecl = cinfo.fields[member_name]
+            if isinstance(fdecl, FieldDecl) and fdecl.type:
+                return fdecl.type.base
+        if member_name in cinfo.methods:
+            mdecl = cinfo.methods[member_name]
+            if isinstance(mdecl, MethodDecl) and mdecl.return_type:
+                return mdecl.return_type.base
+        cname = cinfo.parent
+    return _builtin_member_type(owner_type, member_name)
+
+
+def _builtin_member_type(owner_type: str, member_name: str) -> str | None:
+    """Resolve a member of a built-in type (string, List, Map, Set, Array, etc.)."""
+    m = get_member(owner_type, member_name)
+    if m:
+        # generic returns resolve to their base type, like TypeExpr.base above
+        return m.parsed_return[0] if m.parsed_return else m.return_type
+    return None
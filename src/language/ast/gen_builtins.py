@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
-"""Generate src/devex/lsp/builtins.py from stdlib .btrc source files.
+"""Generate src/devex/lsp/builtins_data.py from stdlib .btrc source files.
 
 Parses each stdlib .btrc file using the compiler's lexer and parser,
 walks the AST to extract class declarations (fields, methods, properties),
-and generates the builtins module used by the LSP for completion, hover,
-and signature help.
+and generates the member rows that src/devex/lsp/builtins.py turns into
+the tables used by the LSP for completion, hover, and signature help.
 
 String instance methods are language intrinsics (not defined in any .btrc
 file — they're lowered to C helpers in the IR gen) and are defined inline
@@ -15,7 +15,6 @@ Usage: python src/language/ast/gen_builtins.py
 
 import os
 import sys
-import textwrap
 
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 sys.path.insert(0, ROOT)
@@ -31,7 +30,7 @@ from src.compiler.python.lexer import Lexer
 from src.compiler.python.parser.parser import Parser
 
 STDLIB_DIR = os.path.join(ROOT, "src", "stdlib")
-OUTPUT = os.path.join(ROOT, "src", "devex", "lsp", "builtins.py")
+OUTPUT = os.path.join(ROOT, "src", "devex", "lsp", "builtins_data.py")
 
 # ---------------------------------------------------------------------------
 # Auto-classify stdlib classes by scanning src/stdlib/*.btrc
@@ -318,68 +317,57 @@ def extract_members(
 
 
 def fmt_params(params: list[tuple]) -> str:
-    """Format a parameter list as Python source."""
+    """Format a parameter list as a Python tuple-of-tuples literal."""
     if not params:
-        return "[]"
+        return "()"
     items = ", ".join(f'("{pt}", "{pn}")' for pt, pn in params)
-    return f"[{items}]"
+    return f"({items},)" if len(params) == 1 else f"({items})"
 
 
-def generate_collection_members(
-    var_name: str,
+def fmt_row(namespace: str, name: str, ret: str, kind: str, params: list[tuple], doc: str) -> str:
+    """Format one _RAW row: (namespace, name, return_type, kind, params, doc)."""
+    doc_escaped = doc.replace('"', '\\"')
+    return f'    ("{namespace}", "{name}", "{ret}", "{kind}", {fmt_params(params)}, "{doc_escaped}"),'
+
+
+def fmt_rows(rows: list[tuple]) -> list[str]:
+    """Format rows sorted by member name.
+
+    Every namespace's rows are emitted in name order, so the member tables are
+    already sorted at import and no consumer needs to sort per request.
+    """
+    return [fmt_row(*row) for row in sorted(rows, key=lambda row: row[1])]
+
+
+def generate_collection_rows(
+    type_name: str,
     fields: list[tuple],
     methods: list[tuple],
     intrinsics: list[tuple],
-) -> str:
-    """Generate a Python list of BuiltinMember for a collection type.
+) -> list[str]:
+    """Generate _RAW rows for a collection type.
 
     Combines stdlib-parsed members with IR-gen intrinsic methods.
     """
-    lines = [f"{var_name}: list[BuiltinMember] = ["]
+    rows = []
     for name, type_str in fields:
-        lines.append(
-            f'    BuiltinMember("{name}", "{type_str}", "field", doc="{name}"),',
-        )
+        rows.append((type_name, name, type_str, "field", [], name))
     for name, ret, params, _is_static in methods:
-        lines.append(
-            f'    BuiltinMember("{name}", "{ret}", "method", '
-            f'{fmt_params(params)}, "{name}"),',
-        )
+        rows.append((type_name, name, ret, "method", params, name))
     # IR-gen intrinsic methods (forEach, filter, etc.)
     for name, ret, _kind, params, doc in intrinsics:
-        doc_escaped = doc.replace('"', '\\"')
-        lines.append(
-            f'    BuiltinMember("{name}", "{ret}", "method", '
-            f'{fmt_params(params)}, "{doc_escaped}"),',
-        )
-    lines.append("]")
-    return "\n".join(lines)
-
-
-def generate_intrinsic_members(var_name: str, entries: list[tuple]) -> str:
-    """Generate a Python list of BuiltinMember from intrinsic tuples."""
-    lines = [f"{var_name}: list[BuiltinMember] = ["]
-    for entry in entries:
-        name, ret, kind, params, doc = entry
-        doc_escaped = doc.replace('"', '\\"')
-        lines.append(
-            f'    BuiltinMember("{name}", "{ret}", "{kind}", '
-            f'{fmt_params(params)}, "{doc_escaped}"),',
-        )
-    lines.append("]")
-    return "\n".join(lines)
+        rows.append((type_name, name, ret, "method", params, doc))
+    return fmt_rows(rows)
 
 
-def generate_static_methods(class_name: str, methods: list[tuple]) -> str:
-    """Generate entries for STDLIB_STATIC_METHODS."""
-    lines = [f'    "{class_name}": [']
-    for name, ret, params, _is_static in methods:
-        lines.append(
-            f'        BuiltinMember("{name}", "{ret}", "method", '
-            f'{fmt_params(params)}, "{name}"),',
-        )
-    lines.append("    ],")
-    return "\n".join(lines)
+def generate_intrinsic_rows(type_name: str, entries: list[tuple]) -> list[str]:
+    """Generate _RAW rows from intrinsic tuples."""
+    return fmt_rows([(type_name, name, ret, kind, params, doc) for name, ret, kind, params, doc in entries])
+
+
+def generate_static_rows(class_name: str, methods: list[tuple]) -> list[str]:
+    """Generate _RAW rows for a stdlib class's static methods."""
+    return fmt_rows([(class_name, name, ret, "method", params, name) for name, ret, params, _is_static in methods])
 
 
 def main():
@@ -388,158 +376,60 @@ def main():
 
     # --- Generate output ---
     out = []
-    out.append('"""Single source of truth for built-in type members in the btrc language.')
+    out.append('"""Built-in type member rows for the btrc LSP (see builtins.py).')
     out.append("")
     out.append("Auto-generated from stdlib .btrc files by src/language/ast/gen_builtins.py.")
     out.append("DO NOT EDIT BY HAND — edit the stdlib source or the generator instead.")
-    out.append("")
-    out.append("Used by completion, hover, and signature help providers to avoid")
-    out.append("maintaining separate (and inevitably divergent) copies of the same data.")
     out.append('"""')
     out.append("")
-    out.append("from __future__ import annotations")
-    out.append("")
-    out.append("from dataclasses import dataclass, field")
-    out.append("from typing import Optional")
-    out.append("")
-    out.append("")
-
-    # BuiltinMember dataclass
-    out.append("@dataclass")
-    out.append("class BuiltinMember:")
-    out.append('    """One member (field or method) of a built-in type."""')
-    out.append("")
-    out.append("    name: str")
-    out.append("    return_type: str")
-    out.append('    kind: str  # "field" or "method"')
-    out.append(
-        '    params: list[tuple[str, str]] = field(default_factory=list)  # [(type, name)]'
-    )
-    out.append('    doc: str = ""')
-    out.append("")
+    out.append("from types import MappingProxyType")
     out.append("")
-
     # Separator
     out.append("# " + "-" * 75)
-    out.append("# Built-in type member tables")
+    out.append("# Raw member data")
     out.append("# " + "-" * 75)
     out.append("")
 
-    # String intrinsics
-    out.append("# String methods are language intrinsics (not defined in any .btrc file)")
-    out.append(generate_intrinsic_members("STRING_MEMBERS", INTRINSIC_STRING_MEMBERS))
-    out.append("")
-
-    # Collection types from stdlib + IR-gen intrinsics
+    # All members as one flat tuple literal: it is marshalled as a single
+    # constant, so import does no per-entry work until the tables are built.
+    out.append("# (namespace, name, return_type, kind, params, doc)")
+    out.append("_RAW: tuple[tuple[str, str, str, str, tuple[tuple[str, str], ...], str], ...] = (")
+    out.append("    # String methods are language intrinsics (not defined in any .btrc file)")
+    out.extend(generate_intrinsic_rows("string", INTRINSIC_STRING_MEMBERS))
     for type_name, (fields, methods) in collection_data.items():
-        var_name = f"{type_name.upper()}_MEMBERS"
-        out.append(f"# Generated from src/stdlib/{type_name.lower()}.btrc")
+        out.append(f"    # Generated from src/stdlib/{type_name.lower()}.btrc")
         intrinsics = INTRINSIC_COLLECTION_MEMBERS.get(type_name, [])
-        out.append(
-            generate_collection_members(var_name, fields, methods, intrinsics)
-        )
-        out.append("")
-
-    # Member table lookup
-    out.append("_MEMBER_TABLES: dict[str, list[BuiltinMember]] = {")
-    out.append('    "string": STRING_MEMBERS,')
-    for type_name in collection_data:
-        out.append(f'    "{type_name}": {type_name.upper()}_MEMBERS,')
-    out.append("}")
-    out.append("")
+        out.extend(generate_collection_rows(type_name, fields, methods, intrinsics))
+    out.append(")")
     out.append("")
-
-    # Separator
-    out.append("# " + "-" * 75)
-    out.append("# Stdlib static method tables")
-    out.append("# " + "-" * 75)
-    out.append("")
-
-    # Static methods from stdlib
-    out.append("# Generated from stdlib .btrc files")
-    out.append("STDLIB_STATIC_METHODS: dict[str, list[BuiltinMember]] = {")
+    out.append("# Stdlib static methods, same row shape; only built on first use")
+    out.append("_RAW_STDLIB: tuple[tuple[str, str, str, str, tuple[tuple[str, str], ...], str], ...] = (")
     for class_name, methods in static_data.items():
-        out.append(generate_static_methods(class_name, methods))
-    out.append("}")
+        out.append(f"    # {class_name} static methods, generated from stdlib .btrc files")
+        out.extend(generate_static_rows(class_name, methods))
+    out.append(")")
+    out.append("")
+    type_names = ", ".join(f'"{t}"' for t in ["string", *collection_data])
+    stdlib_names = ", ".join(f'"{c}"' for c in static_data)
+    out.append("# Namespaces in _RAW / _RAW_STDLIB, in table order")
+    out.append(f"_TYPE_NAMES: tuple[str, ...] = ({type_names})")
+    out.append(f"_STDLIB_NAMES: tuple[str, ...] = ({stdlib_names})")
     out.append("")
 
     # Built-in function signatures
     out.append(
-        "# Built-in free function signatures: "
-        "name -> (return_type, [(param_type, param_name)])"
+        "# Built-in free function signatures (read-only): "
+        "name -> (return_type, ((param_type, param_name), ...))"
     )
     out.append(
-        "BUILTIN_FUNCTION_SIGNATURES: dict[str, tuple[str, list[tuple[str, str]]]] = {"
+        "BUILTIN_FUNCTION_SIGNATURES: MappingProxyType[str, tuple[str, tuple[tuple[str, str], ...]]] = "
+        "MappingProxyType({"
     )
     for fname, (ret, params) in INTRINSIC_FUNCTIONS.items():
         out.append(f'    "{fname}": ("{ret}", {fmt_params(params)}),')
-    out.append("}")
-    out.append("")
+    out.append("})")
     out.append("")
 
-    # Separator
-    out.append("# " + "-" * 75)
-    out.append("# Accessor functions")
-    out.append("# " + "-" * 75)
-    out.append("")
-    out.append("")
-
-    # Accessor functions (these are generic code, not data)
-    out.append(
-        textwrap.dedent("""\
-        def get_members_for_type(type_name: str) -> list[BuiltinMember]:
-            \"\"\"Return the list of built-in members for a type, or empty list.\"\"\"
-            return _MEMBER_TABLES.get(type_name, [])
-
-
-        def get_member(type_name: str, member_name: str) -> Optional[BuiltinMember]:
-            \"\"\"Look up a specific member on a built-in type.\"\"\"
-            for m in _MEMBER_TABLES.get(type_name, []):
-                if m.name == member_name:
-                    return m
-            return None
-
-
-        def get_hover_markdown(type_name: str, member_name: str) -> Optional[str]:
-            \"\"\"Generate a markdown hover string for a built-in type member.\"\"\"
-            m = get_member(type_name, member_name)
-            if m is None:
-                return None
-            if m.kind == "field":
-                return f"```btrc\\n{m.return_type} {m.name}\\n```\\n{m.doc}"
-            params_str = ", ".join(f"{pt} {pn}" for pt, pn in m.params)
-            return f"```btrc\\n{m.return_type} {m.name}({params_str})\\n```\\n{m.doc}"
-
-
-        def get_signature_params(
-            type_name: str, method_name: str
-        ) -> Optional[list[tuple[str, str]]]:
-            \"\"\"Return the parameter list for a built-in type method, or None.\"\"\"
-            m = get_member(type_name, method_name)
-            if m is None or m.kind == "field":
-                return None
-            return m.params
-
-
-        def get_stdlib_methods(class_name: str) -> Optional[list[BuiltinMember]]:
-            \"\"\"Return the list of static methods for a stdlib class, or None.\"\"\"
-            return STDLIB_STATIC_METHODS.get(class_name)
-
-
-        def get_stdlib_signature(
-            class_name: str, method_name: str
-        ) -> Optional[list[tuple[str, str]]]:
-            \"\"\"Return the parameter list for a stdlib static method, or None.\"\"\"
-            methods = STDLIB_STATIC_METHODS.get(class_name)
-            if methods is None:
-                return None
-            for m in methods:
-                if m.name == method_name:
-                    return m.params
-            return None
-    """)
-    )
-
     # Write output
     content = "\n".join(out)
     with open(OUTPUT, "w") as f:
@@ -9,6 +9,7 @@ import os
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
@@ -23,75 +24,81 @@ from src.compiler.python.parser.parser import Parser
 BTRC_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
-def generate_expected():
-    passed = 0
-    failed = 0
+def _generate_one(btrc_path: str) -> tuple[str, str]:
+    """Compile and run one test, writing its golden file; return (status, message)."""
+    btrc_file = os.path.basename(btrc_path)
+    name = btrc_file.replace(".btrc", "")
+    relpath = os.path.relpath(btrc_path, BTRC_TEST_DIR)
+    expected_dir = os.path.join(os.path.dirname(btrc_path), "expected")
+
+    try:
+        with open(btrc_path) as f:
+            source = f.read()
+        source = resolve_includes(source, btrc_path)
+        stdlib_source = get_stdlib_source(source)
+        if stdlib_source:
+            source = stdlib_source + "\n" + source
+
+        tokens = Lexer(source, btrc_file).tokenize()
+        program = Parser(tokens).parse()
+        analyzed = Analyzer().analyze(program)
+        if analyzed.errors:
+            return "SKIP", f"  SKIP {relpath}: analyzer errors"
+        ir_module = generate_ir(analyzed)
+        ir_module = optimize(ir_module)
+        c_source = CEmitter().emit(ir_module)
+
+        with tempfile.NamedTemporaryFile(suffix=".c", delete=False, mode="w") as f:
+            f.write(c_source)
+            c_path = f.name
+        bin_path = c_path.replace(".c", "")
+
+        try:
+            gcc_flags = ["gcc", c_path, "-o", bin_path, "-lm"]
+            if "pthread.h" in c_source:
+                gcc_flags.append("-lpthread")
+            result = subprocess.run(
+                gcc_flags,
+                capture_output=True, text=True, timeout=30,
+            )
+            if result.returncode != 0:
+                return "SKIP", f"  SKIP {relpath}: gcc failed"
+
+            result = subprocess.run(
+                [bin_path], capture_output=True, text=True, timeout=10,
+            )
+            stdout = result.stdout
+
+            os.makedirs(expected_dir, exist_ok=True)
+            out_path = os.path.join(expected_dir, f"{name}.stdout")
+            with open(out_path, "w") as f:
+                f.write(stdout)
+            return "OK", f"  OK   {relpath}"
+        finally:
+            for p in [c_path, bin_path]:
+                if os.path.exists(p):
+                    os.unlink(p)
+
+    except Exception as e:
+        return "FAIL", f"  FAIL {relpath}: {e}"
+
 
+def generate_expected():
+    btrc_paths = []
     for root, _dirs, files in os.walk(BTRC_TEST_DIR):
         btrc_files = sorted(f for f in files if f.startswith("test_") and f.endswith(".btrc") and "_helper" not in f)
-        if not btrc_files:
-            continue
-
-        expected_dir = os.path.join(root, "expected")
-
-        for btrc_file in btrc_files:
-            btrc_path = os.path.join(root, btrc_file)
-            name = btrc_file.replace(".btrc", "")
-            relpath = os.path.relpath(btrc_path, BTRC_TEST_DIR)
-
-            try:
-                with open(btrc_path) as f:
-                    source = f.read()
-                source = resolve_includes(source, btrc_path)
-                stdlib_source = get_stdlib_source(source)
-                if stdlib_source:
-                    source = stdlib_source + "\n" + source
-
-                tokens = Lexer(source, btrc_file).tokenize()
-                program = Parser(tokens).parse()
-                analyzed = Analyzer().analyze(program)
-                if analyzed.errors:
-                    print(f"  SKIP {relpath}: analyzer errors")
-                    continue
-                ir_module = generate_ir(analyzed)
-                ir_module = optimize(ir_module)
-                c_source = CEmitter().emit(ir_module)
-
-                with tempfile.NamedTemporaryFile(suffix=".c", delete=False, mode="w") as f:
-                    f.write(c_source)
-                    c_path = f.name
-                bin_path = c_path.replace(".c", "")
-
-                try:
-                    gcc_flags = ["gcc", c_path, "-o", bin_path, "-lm"]
-                    if "pthread.h" in c_source:
-                        gcc_flags.append("-lpthread")
-                    result = subprocess.run(
-                        gcc_flags,
-                        capture_output=True, text=True, timeout=30,
-                    )
-                    if result.returncode != 0:
-                        print(f"  SKIP {relpath}: gcc failed")
-                        continue
-
-                    result = subprocess.run(
-                        [bin_path], capture_output=True, text=True, timeout=10,
-                    )
-                    stdout = result.stdout
-
-                    os.makedirs(expected_dir, exist_ok=True)
-                    out_path = os.path.join(expected_dir, f"{name}.stdout")
-                    with open(out_path, "w") as f:
-                        f.write(stdout)
-                    print(f"  OK   {relpath}")
-                    passed += 1
-                finally:
-                    for p in [c_path, bin_path]:
-                        if os.path.exists(p):
-                            os.unlink(p)
-
-            except Exception as e:
-                print(f"  FAIL {relpath}: {e}")
+        btrc_paths.extend(os.path.join(root, f) for f in btrc_files)
+
+    # Each test is compiled, built with gcc and run in its own worker process;
+    # results come back in submission order, so the report reads as before.
+    passed = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for status, message in executor.map(_generate_one, btrc_paths, chunksize=4):
+            print(message)
+            if status == "OK":
+                passed += 1
+            elif status == "FAIL":
                 failed += 1
 
     print(f"\nGenerated {passed} golden files ({failed} failed)")